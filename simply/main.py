@@ -2,7 +2,11 @@
 
 from argparse import ArgumentParser
 
+import pandas as pd
+
 from simply import scenario, market, market_2pac, market_fair
+from simply.actor import Order
+from simply.batch import clear_batch
 from simply.config import Config
 from simply.util import summerize_actor_trading
 
@@ -53,26 +57,42 @@ if __name__ == "__main__":
 
     # generate requested market
     if "pac" in cfg.market_type:
-        m = market_2pac.TwoSidedPayAsClear(0)
+        market_type, market_kwargs = market_2pac.TwoSidedPayAsClear, {}
     elif cfg.market_type in ["fair", "merit"]:
-        m = market_fair.BestMarket(0, sc.power_network)
+        market_type, market_kwargs = market_fair.BestMarket, {"network": sc.power_network}
     else:
         # default
-        m = market.Market(0)
-
-    for t in cfg.list_ts:
-        m.t = t
-        for a in sc.actors:
-            # TODO concurrent bidding of actors
-            order = a.generate_order()
-            m.accept_order(order, callback=a.receive_market_results)
+        market_type, market_kwargs = market.Market, {}
 
-        m.clear(reset=cfg.reset_market)
+    if cfg.processes and cfg.reset_market:
+        # timesteps are independent: generate all orders and clear all timesteps at once
+        actors = {a.id: a for a in sc.actors}
+        orders = pd.DataFrame([a.generate_order() for t in cfg.list_ts for a in sc.actors],
+                              columns=Order._fields)
+        matches = clear_batch(orders, market_type, cfg.processes, **market_kwargs)
+        for match in matches.itertuples():
+            actors[match.bid_actor].receive_market_results(match.time, 1, match.energy,
+                                                           match.price)
+            actors[match.ask_actor].receive_market_results(match.time, -1, match.energy,
+                                                           match.price)
         if cfg.show_prints:
-            print("Matches of bid/ask ids: {}".format(m.matches))
-            print(
-                "\nCheck individual traded energy blocks (splitted) and price at market level"
-            )
+            print("Matches of bid/ask ids: {}".format(matches))
+    else:
+        m = market_type(0, **market_kwargs)
+        for t in cfg.list_ts:
+            m.t = t
+            for a in sc.actors:
+                # TODO concurrent bidding of actors
+                order = a.generate_order()
+                m.accept_order(order, callback=a.receive_market_results)
+
+            m.clear(reset=cfg.reset_market)
+            if cfg.show_prints:
+                print("Matches of bid/ask ids: {}".format(m.matches))
+                print(
+                    "\nCheck individual traded energy blocks (splitted) and price at market "
+                    "level"
+                )
 
     if cfg.show_prints:
         print("\nTraded energy volume and price at actor level")
@@ -62,8 +62,7 @@ class Actor:
             self.pred["schedule"] = self.pred["pv"] - self.pred["load"]
         self.orders = []
         self.traded = {}
-        self.args = {"id": actor_id, "df": df.to_json(), "csv": csv, "ls": ls, "ps": ps,
-                     "pm": pm}
+        self.args = {"id": actor_id, "df": df, "csv": csv, "ls": ls, "ps": ps, "pm": pm}
 
     def plot(self, columns):
         """
@@ -118,7 +117,7 @@ class Actor:
             }
             return args_no_df
         else:
-            return self.args
+            return dict(self.args, df=self.args["df"].to_json())
 
     def save_csv(self, dirpath):
         """
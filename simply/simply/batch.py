@@ -0,0 +1,65 @@
+"""
+Batch clearing: clear the orders of many timesteps at once.
+
+The orders of all timesteps are given as one table, each timestep is cleared in its own market
+(as if the market was reset after each timestep). Timesteps can be distributed over several
+processes. The matches of all timesteps are returned as one table.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import simply.config as cfg
+from simply.actor import Order
+from simply.market import Market, MATCH_FIELDS
+
+
+def _init_worker(parser):
+    # markets read their settings from the config parser
+    cfg.parser = parser
+
+
+def _clear_timesteps(market_type, market_kwargs, timesteps):
+    """
+    Clear timesteps one after the other.
+
+    :param market_type: Market class
+    :param market_kwargs: keyword arguments of the markets
+    :param timesteps: list of (time, DataFrame with the orders of this timestep)
+    :return: list of matches
+    """
+    matches = []
+    for time, orders in timesteps:
+        # results are returned instead of being saved by each market
+        market = market_type(time, save_csv=False, **market_kwargs)
+        market.accept_orders(orders)
+        matches += market.match() + market.match_market_maker()
+    return matches
+
+
+def clear_batch(orders, market_type=Market, processes=1, **market_kwargs):
+    """
+    Clear the orders of several timesteps, each timestep independently of the others.
+
+    :param orders: DataFrame with the Order fields as columns and the order IDs as index
+    :param market_type: (optional) Market class to clear each timestep with, default Market
+    :param processes: (optional) number of processes to distribute timesteps over, default 1
+      (clear in this process)
+    :param market_kwargs: keyword arguments of the markets, e.g. network
+    :return: DataFrame with the matches of all timesteps, the match items as columns
+    """
+    timesteps = list(orders[list(Order._fields)].groupby("time", sort=True))
+    if processes > 1 and len(timesteps) > 1:
+        # one chunk of consecutive timesteps per process
+        chunks = [list(chunk) for chunk in np.array_split(
+            np.arange(len(timesteps)), min(processes, len(timesteps)))]
+        with ProcessPoolExecutor(max_workers=len(chunks), initializer=_init_worker,
+                                 initargs=(cfg.parser,)) as executor:
+            results = executor.map(
+                _clear_timesteps, [market_type] * len(chunks), [market_kwargs] * len(chunks),
+                [[timesteps[i] for i in chunk] for chunk in chunks])
+            matches = [match for result in results for match in result]
+    else:
+        matches = _clear_timesteps(market_type, market_kwargs, timesteps)
+    return pd.DataFrame(matches, columns=MATCH_FIELDS)
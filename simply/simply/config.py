@@ -21,7 +21,9 @@ class Config:
     save_csv - save orders and mathced results to csv files [True]
     path - path of scenario directory to load and/or store [./scenarios/default]
     data_format - how to save actor data. "csv": save data in separate csv file and all actors
-    in one config file, otherwise save config and data per actor in a single file ["cfg"]
+    in one config file, "npy": save data of all actors in one binary array (read without parsing
+    text when loaded) and all actors in one config file, otherwise save config and data per actor
+    in a single file ["cfg"]
     reset_market: if set, discard unmatched orders after each interval [True]
     update_scenario: if set, always save scenario in given path (even if loaded) [False]
     market_type: selects matching strategy. Supported:
@@ -29,6 +31,8 @@ class Config:
         pac/2pac (two-sided pay-as-clear)
         fair/merit (custom BEST market)
     weight_factor: conversion factor from grid fees to power network node weight [0.1]
+    processes: if set, clear all timesteps at once, distributed over this number of processes
+        (only if reset_market is set) [0]
     [actor]
     horizon - number of timesteps to look ahead for prediction [24]
     """
@@ -77,3 +81,5 @@ class Config:
         self.market_type = parser.get("default", "market_type", fallback="default").lower()
         # weight factor: network charges to power network weight
         self.weight_factor = parser.getfloat("default", "weight_factor", fallback=0.1)
+        # number of processes to clear all timesteps at once with (0: one timestep after the other)
+        self.processes = parser.getint("default", "processes", fallback=0)
@@ -1,12 +1,17 @@
+import numpy as np
 import pandas as pd
 from pathlib import Path
 import csv
 
 import simply.config as cfg
 from simply.actor import Order
+from simply.order_store import OrderFrame
 
 LARGE_ORDER_THRESHOLD = 2**32
 MARKET_MAKER_THRESHOLD = 2**63-1
+# items of each match
+MATCH_FIELDS = ("time", "bid_id", "ask_id", "bid_actor", "ask_actor", "bid_cluster",
+                "ask_cluster", "energy", "price")
 
 
 class Market:
@@ -15,9 +20,17 @@ class Market:
     finalizes post-matching.
 
     This class provides a basic matching strategy which may be overridden.
+
+    Orders are kept in columnar order stores (see OrderStore), the orders, large_bids,
+    large_asks, bids_mm and asks_mm attributes expose them as DataFrames.
     """
+    orders = OrderFrame()
+    large_bids = OrderFrame()
+    large_asks = OrderFrame()
+    bids_mm = OrderFrame()
+    asks_mm = OrderFrame()
 
-    def __init__(self, time, network=None, grid_fee_matrix=None):
+    def __init__(self, time, network=None, grid_fee_matrix=None, save_csv=None):
         self.orders = pd.DataFrame(columns=Order._fields)
         self.large_bids = pd.DataFrame(columns=Order._fields)
         self.large_asks = pd.DataFrame(columns=Order._fields)
@@ -29,7 +42,9 @@ class Market:
         self.energy_unit = cfg.parser.getfloat("market", "energy_unit", fallback=0.1)
         self.actor_callback = {}
         self.network = network
-        self.save_csv = cfg.parser.getboolean("default", "save_csv", fallback=False)
+        if save_csv is None:
+            save_csv = cfg.parser.getboolean("default", "save_csv", fallback=False)
+        self.save_csv = save_csv
         self.csv_path = Path(cfg.parser.get("default", "path", fallback="./scenarios/default"))
         if grid_fee_matrix is not None:
             self.grid_fee_matrix = grid_fee_matrix
@@ -37,45 +52,35 @@ class Market:
             self.grid_fee_matrix = network.grid_fee_matrix
         self.EPS = 1e-10
         if self.save_csv:
-            match_header = ("time", "bid_id", "ask_id", "bid_actor", "ask_actor", "bid_cluster",
-                            "ask_cluster", "energy", "price")
-            self.create_csv('matches.csv', match_header)
+            self.create_csv('matches.csv', MATCH_FIELDS)
             self.create_csv('orders.csv', Order._fields)
 
     def get_bids(self):
         # Get all open bids in market. Returns dataframe.
-        return self.orders[self.orders["type"] == -1]
+        return self._orders_store.get_bids_frame()
 
     def get_asks(self):
         # Get all open asks in market. Returns dataframe.
-        return self.orders[self.orders["type"] == 1]
+        return self._orders_store.get_asks_frame()
 
     def print(self):
         # Debug: print bids and asks to terminal.
         print(self.get_bids())
         print(self.get_asks())
 
-    def filter_market_maker(self, order, ignore_index=True, index=None):
+    def filter_market_maker(self, order, order_id=None):
         # filter out market makers (infinite bus) and really large orders
         if order.energy >= MARKET_MAKER_THRESHOLD:
             if order.type == 1:
-                self.asks_mm = pd.concat(
-                    [self.asks_mm, pd.DataFrame([order], dtype=object, index=index)],
-                    ignore_index=ignore_index)
+                self._asks_mm_store.append(order, order_id)
             elif order.type == -1:
-                self.bids_mm = pd.concat(
-                    [self.bids_mm, pd.DataFrame([order], dtype=object, index=index)],
-                    ignore_index=ignore_index)
+                self._bids_mm_store.append(order, order_id)
         else:
             print("WARNING! large order filtered")
             if order.type == 1:
-                self.large_asks = pd.concat(
-                    [self.large_asks, pd.DataFrame([order], dtype=object, index=index)],
-                    ignore_index=ignore_index)
+                self._large_asks_store.append(order, order_id)
             elif order.type == -1:
-                self.large_bids = pd.concat(
-                    [self.large_bids, pd.DataFrame([order], dtype=object, index=index)],
-                    ignore_index=ignore_index)
+                self._large_bids_store.append(order, order_id)
 
     def accept_order(self, order, order_id=None, callback=None):
         """
@@ -115,26 +120,59 @@ class Market:
         #   - otherwise ignore index -> consecutive numbers are intact
         # otherwise adopt the ID, while checking it is not already used
         if order_id is None:
-            if len(self.orders) != 0 and len(self.orders) - 1 != self.orders.index.max():
+            if not self._orders_store.has_consecutive_ids:
                 raise IndexError("Previous order IDs were defined externally and reset when "
                                  "inserting orders without predefined order_id.")
-            if order.energy >= LARGE_ORDER_THRESHOLD:
-                self.filter_market_maker(order, ignore_index=True)
-            else:
-                self.orders = pd.concat(
-                    [self.orders, pd.DataFrame([order], dtype=object)],
-                    ignore_index=True)
+        elif order_id in self._orders_store:
+            raise ValueError("Order ID ({}) already exists".format(order_id))
+        if order.energy >= LARGE_ORDER_THRESHOLD:
+            self.filter_market_maker(order, order_id)
         else:
-            new_order = pd.DataFrame([order], dtype=object, index=[order_id])
-            if order_id in self.orders.index:
-                raise ValueError("Order ID ({}) already exists".format(order_id))
-            if order.energy >= LARGE_ORDER_THRESHOLD:
-                self.filter_market_maker(order, ignore_index=False, index=[order_id])
-            else:
-                self.orders = pd.concat([self.orders, new_order], ignore_index=False)
+            self._orders_store.append(order, order_id)
         self.actor_callback[order.actor_id] = callback
         self.append_to_csv([order], 'orders.csv')
 
+    def accept_orders(self, orders):
+        """
+        Handle new orders at once.
+
+        Same as accept_order for each order, but without callbacks and with all checks and
+        conversions done on whole columns.
+
+        :param orders: DataFrame with the Order fields as columns and the order IDs as index
+        :return:
+        """
+        if (orders["time"] != self.t).any():
+            raise ValueError("Wrong order time ({}), market is at time {}".format(
+                orders["time"][orders["time"] != self.t].iloc[0], self.t))
+        if not orders["type"].isin([-1, 1]).all():
+            raise ValueError("Wrong order type ({})".format(
+                orders["type"][~orders["type"].isin([-1, 1])].iloc[0]))
+        if orders.index.has_duplicates or any(i in self._orders_store for i in orders.index):
+            raise ValueError("Order IDs are not unique")
+        orders = orders[list(Order._fields)].astype(object)
+
+        # look up cluster
+        if self.network is not None:
+            no_cluster = orders["cluster"].isna()
+            orders.loc[no_cluster, "cluster"] = pd.Series([
+                self.network.node_to_cluster.get(actor_id)
+                for actor_id in orders["actor_id"][no_cluster]
+            ], index=orders.index[no_cluster], dtype=object)
+
+        # make certain energy has step size of energy_unit
+        energy = ((orders["energy"].astype(float) + self.EPS) // self.energy_unit) \
+            * self.energy_unit
+        orders["energy"] = energy
+        # make certain enough energy is traded
+        orders = orders[energy >= self.energy_unit]
+        is_large = orders["energy"] >= LARGE_ORDER_THRESHOLD
+        for order_id, order in zip(orders.index[is_large], orders[is_large].itertuples(
+                index=False, name="Order")):
+            self.filter_market_maker(Order(*order), order_id)
+        self._orders_store.extend(orders[~is_large])
+        self.append_to_csv(orders, 'orders.csv')
+
     def clear(self, reset=True):
         """
         Clear market. Match orders, call callbacks of matched orders, reset/tidy up dataframes.
@@ -184,35 +222,24 @@ class Market:
         :param show: show or print plots (mainly for debugging)
         :return: list of dictionaries with matches
         """
-        asks, bids = self.get_asks(), self.get_bids()
+        asks, bids = self._orders_store.get_asks(), self._orders_store.get_bids()
         # order by price (while previously original ordering is reversed for equal prices)
         # i.e. higher probability of matching for higher ask prices or lower bid prices
-        bids = bids.iloc[::-1].sort_values(["price"], ascending=False)
-        asks = asks.iloc[::-1].sort_values(["price"], ascending=True)
-        matches = []
-        for ask_id, ask in asks.iterrows():
-            for bid_id, bid in bids.iterrows():
-                if ask.actor_id == bid.actor_id:
-                    continue
-                if ask.energy >= self.energy_unit and bid.energy >= self.energy_unit \
-                        and ask.price <= bid.price:
-                    # match ask and bid
-                    energy = min(ask.energy, bid.energy)
-                    ask.energy -= energy
-                    bid.energy -= energy
-                    self.orders.loc[ask_id] = ask
-                    self.orders.loc[bid_id] = bid
-                    matches.append({
-                        "time": self.t,
-                        "bid_id": bid_id,
-                        "ask_id": ask_id,
-                        "bid_actor": bid.actor_id,
-                        "ask_actor": ask.actor_id,
-                        "bid_cluster": bid.cluster,
-                        "ask_cluster": ask.cluster,
-                        "energy": energy,
-                        "price": bid.price
-                    })
+        ask_order = np.lexsort((-asks["seq"], asks["price"]))
+        bid_order = np.lexsort((-bids["seq"], -bids["price"]))
+        # orders below the energy unit are never matched
+        ask_order = ask_order[asks["energy"][ask_order] >= self.energy_unit]
+        bid_order = bid_order[bids["energy"][bid_order] >= self.energy_unit]
+
+        ask_index, bid_index, energy = self._merge_orders(asks, bids, ask_order, bid_order)
+        if np.any(asks["actor_id"][ask_index] == bids["actor_id"][bid_index]):
+            # actors can not trade with themselves: match one order after the other instead
+            ask_index, bid_index, energy = self._match_orders(asks, bids, ask_order, bid_order)
+        # update remaining energy of the matched orders
+        np.subtract.at(asks["energy"], ask_index, energy)
+        np.subtract.at(bids["energy"], bid_index, energy)
+        matches = self._create_matches(
+            bids, asks, bid_index, ask_index, energy, bids["price"][bid_index])
 
         if show:
             print(matches)
@@ -220,51 +247,105 @@ class Market:
         self.append_to_csv(matches, 'matches.csv')
         return matches
 
+    def _merge_orders(self, asks, bids, ask_order, bid_order):
+        """
+        Match asks and bids by merging their cumulative energies.
+
+        Each ask takes the energy of the bids in the given order until its energy is used up,
+        which stops at the first bid with a lower price than the ask.
+        :return: arrays of ask positions, bid positions and energy of the matches
+        """
+        if len(ask_order) == 0 or len(bid_order) == 0:
+            return np.array([], dtype=int), np.array([], dtype=int), np.array([])
+        ask_energy = np.cumsum(asks["energy"][ask_order])
+        bid_energy = np.cumsum(bids["energy"][bid_order])
+        # each match covers the energy between two consecutive cumulative energies
+        ends = np.union1d(ask_energy, bid_energy)
+        ends = ends[ends <= min(ask_energy[-1], bid_energy[-1])]
+        energy = np.diff(ends, prepend=0)
+        ask_index = ask_order[np.searchsorted(ask_energy, ends)]
+        bid_index = bid_order[np.searchsorted(bid_energy, ends)]
+        # asks rise and bids fall in price: matching stops at the first ask above its bid
+        number_of_matches = np.count_nonzero(asks["price"][ask_index] <= bids["price"][bid_index])
+        # skip matches created by rounding errors of the cumulative energies
+        matched = energy[:number_of_matches] >= self.energy_unit - self.EPS
+        return (ask_index[:number_of_matches][matched], bid_index[:number_of_matches][matched],
+                energy[:number_of_matches][matched])
+
+    def _match_orders(self, asks, bids, ask_order, bid_order):
+        """
+        Match every ask with the bids in the given order, skipping bids of the same actor.
+
+        :return: arrays of ask positions, bid positions and energy of the matches
+        """
+        ask_energy = asks["energy"][ask_order].tolist()
+        bid_energy = bids["energy"][bid_order].tolist()
+        ask_price, bid_price = asks["price"][ask_order], bids["price"][bid_order]
+        ask_actor, bid_actor = asks["actor_id"][ask_order], bids["actor_id"][bid_order]
+        # remaining energy below the energy unit only due to rounding errors is still matched
+        min_energy = self.energy_unit - self.EPS
+        ask_index, bid_index, energy = [], [], []
+        for i in range(len(ask_order)):
+            for j in range(len(bid_order)):
+                if ask_energy[i] < min_energy or ask_price[i] > bid_price[j]:
+                    break
+                if ask_actor[i] == bid_actor[j] or bid_energy[j] < min_energy:
+                    continue
+                matched_energy = min(ask_energy[i], bid_energy[j])
+                ask_energy[i] -= matched_energy
+                bid_energy[j] -= matched_energy
+                ask_index.append(ask_order[i])
+                bid_index.append(bid_order[j])
+                energy.append(matched_energy)
+        return (np.array(ask_index, dtype=int), np.array(bid_index, dtype=int),
+                np.array(energy, dtype=float))
+
+    def _create_matches(self, bids, asks, bid_index, ask_index, energy, price):
+        # create the match dicts of the orders at the given positions of bids and asks
+        return [{
+            "time": self.t,
+            "bid_id": bid_id,
+            "ask_id": ask_id,
+            "bid_actor": bid_actor,
+            "ask_actor": ask_actor,
+            "bid_cluster": bid_cluster,
+            "ask_cluster": ask_cluster,
+            "energy": match_energy,
+            "price": match_price
+        } for bid_id, ask_id, bid_actor, ask_actor, bid_cluster, ask_cluster, match_energy,
+            match_price in zip(
+                bids["id"][bid_index], asks["id"][ask_index], bids["actor_id"][bid_index],
+                asks["actor_id"][ask_index], bids["cluster"][bid_index],
+                asks["cluster"][ask_index], energy.tolist(), price.tolist())]
+
     def match_market_maker(self):
         # match with market maker
         # find unmatched orders
         matches = []
-        orders = self.orders[(self.orders["energy"] + self.EPS) > self.energy_unit]
+        asks, bids = self._orders_store.get_asks(), self._orders_store.get_bids()
         # match asks only with bid market maker with highest price
-        asks = orders[orders.type == 1]
-        if not self.bids_mm.empty:
+        bids_mm = self._bids_mm_store.get_bids()
+        if len(bids_mm["id"]):
             # select bidding market maker by order ID, that has highest price
-            bid_mm_id = self.bids_mm['price'].astype(float).idxmax()
-            bid_mm = self.bids_mm.loc[bid_mm_id]
-            asks = asks[asks["price"] <= bid_mm.price]
-            for ask_id, ask in asks.iterrows():
-                matches.append({
-                    "time": self.t,
-                    "bid_id": bid_mm_id,
-                    "ask_id": ask_id,
-                    "bid_actor": bid_mm.actor_id,
-                    "ask_actor": ask.actor_id,
-                    "bid_cluster": bid_mm.cluster,
-                    "ask_cluster": ask.cluster,
-                    "energy": ask.energy,
-                    "price": bid_mm.price
-                })
+            bid_mm_index = np.argmax(bids_mm["price"])
+            ask_index = np.flatnonzero(((asks["energy"] + self.EPS) > self.energy_unit)
+                                       & (asks["price"] <= bids_mm["price"][bid_mm_index]))
+            bid_mm_index = np.full(len(ask_index), bid_mm_index)
+            matches += self._create_matches(
+                bids_mm, asks, bid_mm_index, ask_index, asks["energy"][ask_index],
+                bids_mm["price"][bid_mm_index])
 
         # match bids only with ask market maker with lowest price
-        bids = orders[orders.type == -1]
-        if not self.asks_mm.empty:
+        asks_mm = self._asks_mm_store.get_asks()
+        if len(asks_mm["id"]):
             # select asking market maker by order ID, that has lowest price
-            ask_mm_id = self.asks_mm['price'].astype(float).idxmin()
-            ask_mm = self.asks_mm.loc[ask_mm_id]
-            # indices of matched bids equal order IDs respectively
-            bids = bids[bids["price"] >= ask_mm.price]
-            for bid_id, bid in bids.iterrows():
-                matches.append({
-                    "time": self.t,
-                    "bid_id": bid_id,
-                    "ask_id": ask_mm_id,
-                    "bid_actor": bid.actor_id,
-                    "ask_actor": ask_mm.actor_id,
-                    "bid_cluster": bid.cluster,
-                    "ask_cluster": ask_mm.cluster,
-                    "energy": bid.energy,
-                    "price": ask_mm.price
-                })
+            ask_mm_index = np.argmin(asks_mm["price"])
+            bid_index = np.flatnonzero(((bids["energy"] + self.EPS) > self.energy_unit)
+                                       & (bids["price"] >= asks_mm["price"][ask_mm_index]))
+            ask_mm_index = np.full(len(bid_index), ask_mm_index)
+            matches += self._create_matches(
+                bids, asks_mm, bid_index, ask_mm_index, bids["energy"][bid_index],
+                asks_mm["price"][ask_mm_index])
         self.append_to_csv(matches, 'matches.csv')
         return matches
 
@@ -1,8 +1,47 @@
+from collections import defaultdict
+from itertools import count
+
+import numpy as np
 import pandas as pd
 
 from simply.market import Market
 
 
+def _exclude_units(excluded, start, end):
+    # add units start..end-1 to the sorted list of disjoint (start, end) intervals
+    intervals = sorted(excluded + [(start, end)])
+    excluded[:] = intervals[:1]
+    for interval_start, interval_end in intervals[1:]:
+        if interval_start <= excluded[-1][1]:
+            excluded[-1] = (excluded[-1][0], max(excluded[-1][1], interval_end))
+        else:
+            excluded.append((interval_start, interval_end))
+
+
+def _available_units(excluded, offset_start, offset_end):
+    """
+    Get the units of an order that are not excluded.
+
+    :param excluded: sorted list of disjoint (start, end) intervals of excluded units
+    :param offset_start: number of available units to skip
+    :param offset_end: number of available units to skip and take
+    :return: list of (start, end) intervals of the units that were taken
+    """
+    units = []
+    unit, offset = 0, 0
+    for excluded_start, excluded_end in excluded + [(np.inf, np.inf)]:
+        # available units unit..excluded_start-1 have offsets offset..
+        available = excluded_start - unit
+        start, end = max(offset_start - offset, 0), min(offset_end - offset, available)
+        if start < end:
+            units.append((int(unit + start), int(unit + end)))
+        offset += available
+        if offset >= offset_end:
+            return units
+        unit = excluded_end
+    return units
+
+
 class BestMarket(Market):
     """
     Custom fair market mechanism.
@@ -14,158 +53,186 @@ class BestMarket(Market):
     If a match becomes disputed (order matched more than once), the higher offer is taken,
     while the other one is removed as a possible match and that cluster is re-evaluated.
     This converges to an optimal solution.
+
+    Orders are matched in units of the market's energy unit, but kept as intervals of units
+    instead of one row per unit, so the matching does not grow with the traded energy.
     """
 
     def match(self, show=False):
-        asks, bids = self.get_asks(), self.get_bids()
-        if (asks.empty and bids.empty) \
-                or (asks.empty and self.asks_mm.empty) \
-                or (bids.empty and self.bids_mm.empty):
+        asks, bids = self._orders_store.get_asks(), self._orders_store.get_bids()
+        if (len(asks["id"]) == 0 and len(bids["id"]) == 0) \
+                or (len(asks["id"]) == 0 and self.asks_mm.empty) \
+                or (len(bids["id"]) == 0 and self.bids_mm.empty):
             # no asks or bids at all: no matches
             return []
 
-        # filter out orders without cluster (can still be matched with market maker)
-        asks = asks[~asks.cluster.isna()]
-        bids = bids[~bids.cluster.isna()]
-
-        # split asks and bids into smallest energy unit, save original index, add cluster idx
-        asks = pd.DataFrame(asks)
-        asks["order_id"] = asks.index
-        asks = pd.DataFrame(asks.values.repeat(
-            asks.energy * (1 / self.energy_unit), axis=0), columns=asks.columns)
-        asks.energy = self.energy_unit
-        bids = pd.DataFrame(bids)
-        bids["order_id"] = bids.index
-        bids = pd.DataFrame(bids.values.repeat(
-            bids.energy * (1 / self.energy_unit), axis=0), columns=bids.columns)
-        bids.energy = self.energy_unit
+        # split asks and bids into smallest energy units
+        # orders without cluster are left out (can still be matched with market maker)
+        ask_units = (asks["energy"] * (1 / self.energy_unit)).astype(int)
+        ask_units[pd.isna(asks["cluster"])] = 0
+        bid_units = (bids["energy"] * (1 / self.energy_unit)).astype(int)
+        bid_units[pd.isna(bids["cluster"])] = 0
+        asks_by_price = {}
+        bids_by_price = {}
+        for cluster_idx in set(bids["cluster"][bid_units > 0]):
+            # order local bids by price (earlier orders first for equal prices)
+            local_bids = np.flatnonzero((bids["cluster"] == cluster_idx) & (bid_units > 0))
+            local_bids = local_bids[np.lexsort((bids["seq"][local_bids],
+                                                -bids["price"][local_bids]))]
+            bids_by_price[cluster_idx] = (local_bids, np.cumsum(bid_units[local_bids]))
 
         # keep track which clusters have to be (re)matched
         # start with all clusters
         clusters_to_match = set(range(len(self.grid_fee_matrix)))
-        # keep track of matches
-        matches = []
-        # keep track which asks to exclude in each zone (initially empty)
-        exclude = {cluster_idx: set() for cluster_idx in clusters_to_match}
+        # keep track of matches: ask -> list of unit intervals (ordered by unit), each with
+        # a position key, which orders all matches in the sequence they were made
+        matches = defaultdict(list)
+        positions = count()
+        # keep track which ask units to exclude in each zone (initially empty)
+        exclude = {cluster_idx: defaultdict(list) for cluster_idx in clusters_to_match}
 
         while clusters_to_match:
             # simulate local market within cluster
             cluster_idx = clusters_to_match.pop()
-
-            # get local bids
-            _bids = bids[bids.cluster == cluster_idx]
-            if len(_bids) == 0:
+            if cluster_idx not in bids_by_price:
                 # no bids within this cluster: can't match here
                 continue
-
-            # get all asks that are not in exclude list for this cluster (copy asks, retain index)
-            _asks = asks.drop(exclude[cluster_idx], axis=0, inplace=False)
-            # annotate asking price by weight:
-            # get cluster ID for all asks, preserve ordering
-            ask_cluster_ids = list(_asks.cluster)
-            # get weights from any node in cluster to different ask actors
-            weights = self.grid_fee_matrix[cluster_idx]
-            # get weights in same order as ask node IDs
-            ask_weights = [weights[i] for i in ask_cluster_ids]
-            # set adjusted price with network weight
-            _asks["adjusted_price"] = pd.Series(_asks.price + ask_weights, index=_asks.index)
-
-            # order local bids and asks by price
-            _bids = _bids.sort_values(["price"], ascending=False)
-            _asks = _asks.sort_values(["adjusted_price", "price"], ascending=[True, False])
-
-            # match local bids and asks
-            bid_iter = _bids.iterrows()
-            bid_id, bid = next(bid_iter)
-            _matches = []
-            for ask_id, ask in _asks.iterrows():
-                # compare with next bid
-                if bid is not None:
-                    # still bids in queue
-                    if ask.adjusted_price <= bid.price:
-                        # bid and ask match: append to local solution
-                        _matches.append({
-                            "time": self.t,
-                            "bid_id": bid_id,
-                            "ask_id": ask_id,
-                            "bid_actor": bid.actor_id,
-                            "ask_actor": ask.actor_id,
-                            "bid_cluster": bid.cluster,
-                            "ask_cluster": ask.cluster,
-                            "energy": self.energy_unit,
-                            "price": ask.adjusted_price
-                        })
-                    # get next bid
-                    try:
-                        bid_id, bid = next(bid_iter)
-                    except (StopIteration, IndexError):
-                        bid = None
-                # get next ask
+            if cluster_idx not in asks_by_price:
+                # annotate asking price by weight (fixed for the cluster, so sort only once)
+                weights = self.grid_fee_matrix[cluster_idx]
+                local_asks = np.flatnonzero(ask_units > 0)
+                adjusted_price = asks["price"][local_asks] + np.array(
+                    [weights[i] for i in asks["cluster"][local_asks]], dtype=float)
+                order = np.lexsort((-asks["price"][local_asks], adjusted_price))
+                asks_by_price[cluster_idx] = (local_asks[order], adjusted_price[order])
+            local_matches, price = self._match_cluster(
+                asks_by_price[cluster_idx], bids_by_price[cluster_idx], ask_units,
+                bids["price"], exclude[cluster_idx])
 
             # remove old matches from same cluster
-            matches = [m for m in matches if m["bid_cluster"] != cluster_idx]
-
-            for _match in _matches:
-                # adjust price to local market clearing price (highest asking price)
-                _match["price"] = _matches[-1]["price"]
+            for ask_idx, ask_matches in matches.items():
+                ask_matches[:] = [m for m in ask_matches if m["bid_cluster"] != cluster_idx]
 
+            for ask_idx, start, end, bid_idx in local_matches:
+                ask_cluster = asks["cluster"][ask_idx]
+                ask_matches = []
+                unit = start
                 # try to merge into global matches
                 # remove double matches
                 # asks are removed where market clearing price is lower
-                for match_idx, match in enumerate(matches):
-                    if match["ask_id"] == _match["ask_id"]:
-                        # same ask: compare prices
-                        if _match["price"] > match["price"]:
-                            # new match is better:
-                            # exclude old match
-                            exclude[match["ask_cluster"]].add(match["ask_id"])
-                            # replace old match
-                            matches[match_idx] = _match
-                            # redo other cluster
-                            clusters_to_match.add(match["ask_cluster"])
-                        else:
-                            # old match is better: exclude new match
-                            exclude[cluster_idx].add(_match["ask_id"])
-                            # redo current cluster
-                            clusters_to_match.add(cluster_idx)
-                        break
-                else:
-                    # new match does not conflict: insert as-is
-                    matches.append(_match)
-
-        # group matches: ask -> bid -> match
-        _matches = {}
-        for match in matches:
-            # get original order id of ask/bid and adjust order energy
-            ask_id = match["ask_id"]
-            ask_order_id = asks.loc[ask_id].order_id
-            self.orders.loc[ask_order_id, "energy"] -= match["energy"]
-            bid_id = match["bid_id"]
-            bid_order_id = bids.loc[bid_id].order_id
-            self.orders.loc[bid_order_id, "energy"] -= match["energy"]
-
-            if ask_order_id not in _matches:
-                # ask not seen before: create empty dict
-                _matches[ask_order_id] = dict()
-            ask_matches = _matches[ask_order_id]
-            try:
-                m = ask_matches[bid_order_id]
-                # bid has already been matched with this ask: price has to be identical
-                assert m["price"] == match["price"]
-                m["energy"] += match["energy"]
-            except KeyError:
-                # new bid was matched
-                m = match
-                m["ask_id"] = ask_order_id
-                m["bid_id"] = bid_order_id
-            # update dictionary
-            ask_matches[bid_order_id] = m
-
-        # retrieve matches from nested dict
-        matches = [m for ask_matches in _matches.values() for m in ask_matches.values()]
+                for match in matches[ask_idx]:
+                    if match["end"] <= start or match["start"] >= end:
+                        ask_matches.append(match)
+                        continue
+                    # matched units not matched before: insert as-is
+                    if unit < match["start"]:
+                        ask_matches.append(self._unit_match(
+                            (next(positions),), ask_idx, bid_idx, cluster_idx, price,
+                            unit, match["start"]))
+                    overlap_start, overlap_end = max(match["start"], start), min(match["end"], end)
+                    unit = overlap_end
+                    if price > match["price"]:
+                        # new match is better:
+                        # exclude old match
+                        _exclude_units(exclude[ask_cluster][ask_idx], overlap_start, overlap_end)
+                        # replace old match
+                        ask_matches += [
+                            dict(match, position=match["position"] + (0,),
+                                 end=overlap_start),
+                            self._unit_match(
+                                match["position"] + (1,), ask_idx, bid_idx, cluster_idx, price,
+                                overlap_start, overlap_end),
+                            dict(match, position=match["position"] + (2,),
+                                 start=overlap_end)]
+                        # redo other cluster
+                        clusters_to_match.add(ask_cluster)
+                    else:
+                        # old match is better: exclude new match
+                        _exclude_units(exclude[cluster_idx][ask_idx], overlap_start, overlap_end)
+                        ask_matches.append(match)
+                        # redo current cluster
+                        clusters_to_match.add(cluster_idx)
+                if unit < end:
+                    ask_matches.append(self._unit_match(
+                        (next(positions),), ask_idx, bid_idx, cluster_idx, price, unit, end))
+                matches[ask_idx] = sorted(
+                    (m for m in ask_matches if m["start"] < m["end"]), key=lambda m: m["start"])
+
+        # group matches: ask -> bid -> number of units
+        matched_units = {}
+        for match in sorted((m for ask_matches in matches.values() for m in ask_matches),
+                            key=lambda m: m["position"]):
+            ask_matches = matched_units.setdefault(match["ask_idx"], {})
+            units, price = ask_matches.get(match["bid_idx"], (0, match["price"]))
+            # bid has already been matched with this ask: price has to be identical
+            assert price == match["price"]
+            ask_matches[match["bid_idx"]] = (units + match["end"] - match["start"], price)
+        ask_index = np.array([ask_idx for ask_idx, ask_matches in matched_units.items()
+                              for _ in ask_matches], dtype=int)
+        bid_index = np.array([bid_idx for ask_matches in matched_units.values()
+                              for bid_idx in ask_matches], dtype=int)
+        units, price = np.array([m for ask_matches in matched_units.values()
+                                 for m in ask_matches.values()], dtype=float).reshape(-1, 2).T
+        energy = units * self.energy_unit
+        # adjust order energy
+        np.subtract.at(asks["energy"], ask_index, energy)
+        np.subtract.at(bids["energy"], bid_index, energy)
+        matches = self._create_matches(bids, asks, bid_index, ask_index, energy, price)
 
         if show:
             print(matches)
 
         self.append_to_csv(matches, 'matches.csv')
         return matches
+
+    @staticmethod
+    def _match_cluster(asks_by_price, bids_by_price, ask_units, bid_prices, exclude):
+        """
+        Match the local bids of a cluster with all asks that are not excluded in the cluster.
+
+        :param asks_by_price: asks and their adjusted prices, ordered by adjusted price
+        :param bids_by_price: local bids ordered by price and their cumulative units
+        :param ask_units: number of units of each ask
+        :param bid_prices: prices of the bids
+        :param exclude: ask -> list of (start, end) intervals of ask units excluded in cluster
+        :return: list of (ask, start unit, end unit, bid) matches and local clearing price
+        """
+        local_asks, adjusted_price = asks_by_price
+        local_bids, bid_cum_units = bids_by_price
+        available_units = ask_units[local_asks]
+        for rank in np.flatnonzero(np.isin(local_asks, list(exclude))):
+            available_units[rank] -= sum(end - start for start, end in exclude[local_asks[rank]])
+        is_available = available_units > 0
+        local_asks, adjusted_price = local_asks[is_available], adjusted_price[is_available]
+        if len(local_asks) == 0:
+            return [], None
+        ask_cum_units = np.cumsum(available_units[is_available])
+        # each unit of the ordered asks is matched with the unit of the bids at the same
+        # position, as long as the adjusted price of the ask is not above the bid price
+        ends = np.union1d(ask_cum_units, bid_cum_units)
+        ends = ends[ends <= min(ask_cum_units[-1], bid_cum_units[-1])]
+        starts = np.concatenate([[0], ends[:-1]])
+        ask_rank = np.searchsorted(ask_cum_units, ends)
+        bid_rank = np.searchsorted(bid_cum_units, ends)
+        number_of_matches = np.count_nonzero(
+            adjusted_price[ask_rank] <= bid_prices[local_bids[bid_rank]])
+        if number_of_matches == 0:
+            return [], None
+
+        local_matches = []
+        ask_offset = ask_cum_units - available_units[is_available]
+        for start, end, rank, bid_idx in zip(
+                starts[:number_of_matches], ends[:number_of_matches],
+                ask_rank[:number_of_matches], local_bids[bid_rank[:number_of_matches]]):
+            ask_idx = local_asks[rank]
+            for unit_start, unit_end in _available_units(
+                    exclude.get(ask_idx, []), start - ask_offset[rank], end - ask_offset[rank]):
+                local_matches.append((ask_idx, unit_start, unit_end, bid_idx))
+        # local market clearing price (highest asking price)
+        return local_matches, adjusted_price[ask_rank[number_of_matches - 1]]
+
+    @staticmethod
+    def _unit_match(position, ask_idx, bid_idx, bid_cluster, price, start, end):
+        # match of ask units start..end-1 with a bid of the given cluster
+        return {"position": position, "ask_idx": ask_idx, "bid_idx": bid_idx,
+                "bid_cluster": bid_cluster, "price": price, "start": start, "end": end}
@@ -0,0 +1,234 @@
+import numpy as np
+import pandas as pd
+
+from simply.actor import Order
+
+# dtype of each order field in the store
+ORDER_DTYPES = {
+    "type": np.int8,
+    "time": object,
+    "actor_id": object,
+    "cluster": object,
+    "energy": np.float64,
+    "price": np.float64,
+}
+INITIAL_CAPACITY = 64
+
+
+def _has_consecutive_ids(frame):
+    return frame.index.equals(pd.RangeIndex(len(frame)))
+
+
+class OrderColumns:
+    """
+    Growable set of preallocated NumPy arrays, one per order field plus the order ID and the
+    insertion sequence number of the order.
+
+    The capacity of the arrays is doubled when they are full, so appending is amortised O(1).
+    """
+
+    def __init__(self, capacity=INITIAL_CAPACITY):
+        self.size = 0
+        self.arrays = {
+            "id": np.empty(capacity, dtype=object),
+            "seq": np.empty(capacity, dtype=np.int64),
+            **{field: np.empty(capacity, dtype=dtype) for field, dtype in ORDER_DTYPES.items()}
+        }
+
+    def __len__(self):
+        return self.size
+
+    def reserve(self, number_of_orders):
+        # make room for the given number of additional orders
+        capacity = len(self.arrays["seq"])
+        if self.size + number_of_orders <= capacity:
+            return
+        new_capacity = 2 * capacity
+        while self.size + number_of_orders > new_capacity:
+            new_capacity *= 2
+        for name, array in self.arrays.items():
+            grown = np.empty(new_capacity, dtype=array.dtype)
+            grown[:capacity] = array
+            self.arrays[name] = grown
+
+    def append(self, order, order_id, seq):
+        self.reserve(1)
+        self.arrays["id"][self.size] = order_id
+        self.arrays["seq"][self.size] = seq
+        for field, value in zip(Order._fields, order):
+            self.arrays[field][self.size] = value
+        self.size += 1
+
+    def extend(self, columns, order_ids, seqs):
+        # append orders given as {field: array}
+        self.reserve(len(seqs))
+        end = self.size + len(seqs)
+        self.arrays["id"][self.size:end] = order_ids
+        self.arrays["seq"][self.size:end] = seqs
+        for field in Order._fields:
+            self.arrays[field][self.size:end] = columns[field]
+        self.size = end
+
+    def views(self):
+        # views of the filled part of the arrays (no copies)
+        return {name: array[:self.size] for name, array in self.arrays.items()}
+
+
+class OrderStore:
+    """
+    Columnar store of market orders.
+
+    Bids and asks are kept in separate OrderColumns, so get_bids and get_asks return views of the
+    arrays without copying them. The orders are only converted to a DataFrame (with the order IDs
+    as index) when the frame attribute is read. From then on, the DataFrame holds the orders: it
+    may be modified and is loaded back into the arrays when the next order is appended or the
+    arrays are requested.
+    """
+
+    def __init__(self, frame=None):
+        self._bids = OrderColumns()
+        self._asks = OrderColumns()
+        self._ids = set()
+        # True while every order ID equals the position of the order in the store
+        self._consecutive_ids = True
+        self._frame = frame
+
+    def __len__(self):
+        if self._frame is not None:
+            return len(self._frame)
+        return len(self._bids) + len(self._asks)
+
+    def __contains__(self, order_id):
+        if self._frame is not None:
+            return order_id in self._frame.index
+        return order_id in self._ids
+
+    @property
+    def has_consecutive_ids(self):
+        """True if the order IDs are the consecutive numbers 0, 1, 2, ..."""
+        if self._frame is not None:
+            return _has_consecutive_ids(self._frame)
+        return self._consecutive_ids
+
+    def _load_frame(self):
+        # move the orders of the DataFrame (which may have been modified) back into the arrays
+        frame, self._frame = self._frame, None
+        if frame is None:
+            return
+        consecutive_ids = _has_consecutive_ids(frame)
+        self._bids = OrderColumns(max(INITIAL_CAPACITY, len(frame)))
+        self._asks = OrderColumns(max(INITIAL_CAPACITY, len(frame)))
+        self._ids = set()
+        self._consecutive_ids = True
+        for order_id, order in zip(frame.index, frame[list(Order._fields)].itertuples(
+                index=False, name="Order")):
+            self.append(Order(*order), order_id)
+        self._consecutive_ids = consecutive_ids
+
+    def append(self, order, order_id=None):
+        """
+        Append an order to the store.
+
+        :param order: Order with type -1 (bid) or 1 (ask)
+        :param order_id: (optional) ID of the order, by default the position of the order
+        :return: ID of the order
+        """
+        self._load_frame()
+        position = len(self)
+        if order_id is None:
+            order_id = position
+        if order.type == -1:
+            columns = self._bids
+        elif order.type == 1:
+            columns = self._asks
+        else:
+            raise ValueError("Wrong order type ({})".format(order.type))
+        columns.append(order, order_id, position)
+        self._ids.add(order_id)
+        self._consecutive_ids = self._consecutive_ids and order_id == position
+        return order_id
+
+    def extend(self, frame):
+        """
+        Append the orders of a DataFrame to the store.
+
+        :param frame: DataFrame with the Order fields as columns and the order IDs as index
+        """
+        self._load_frame()
+        position = len(self)
+        types = frame["type"].to_numpy()
+        if not np.isin(types, (-1, 1)).all():
+            raise ValueError("Wrong order type ({})".format(types[~np.isin(types, (-1, 1))][0]))
+        order_ids = frame.index.to_numpy(dtype=object)
+        seqs = np.arange(position, position + len(frame))
+        for order_type, columns in ((-1, self._bids), (1, self._asks)):
+            is_type = types == order_type
+            columns.extend({field: frame[field].to_numpy()[is_type] for field in Order._fields},
+                           order_ids[is_type], seqs[is_type])
+        self._ids.update(order_ids)
+        self._consecutive_ids = self._consecutive_ids and frame.index.equals(
+            pd.RangeIndex(position, position + len(frame)))
+
+    def get_bids(self):
+        """Return the bids as {field: array} (including "id"), the arrays are views."""
+        self._load_frame()
+        return self._bids.views()
+
+    def get_asks(self):
+        """Return the asks as {field: array} (including "id"), the arrays are views."""
+        self._load_frame()
+        return self._asks.views()
+
+    def _get_frame(self, order_type, columns):
+        if self._frame is not None:
+            return self._frame[self._frame["type"] == order_type]
+        views = columns.views()
+        return pd.DataFrame({field: views[field].astype(object) for field in Order._fields},
+                            index=pd.Index(list(views["id"])), columns=Order._fields, dtype=object)
+
+    def get_bids_frame(self):
+        """Return the bids as a DataFrame without building or loading the frame of the store."""
+        return self._get_frame(-1, self._bids)
+
+    def get_asks_frame(self):
+        """Return the asks as a DataFrame without building or loading the frame of the store."""
+        return self._get_frame(1, self._asks)
+
+    @property
+    def frame(self):
+        """Return the orders as a DataFrame with object columns, in order of insertion."""
+        if self._frame is None:
+            bids, asks = self._bids.views(), self._asks.views()
+            order = np.argsort(np.concatenate([bids["seq"], asks["seq"]]), kind="stable")
+            columns = {field: np.concatenate([bids[field], asks[field]])[order].astype(object)
+                       for field in Order._fields}
+            if self._consecutive_ids:
+                index = pd.RangeIndex(len(order))
+            else:
+                index = pd.Index(list(np.concatenate([bids["id"], asks["id"]])[order]))
+            self._frame = pd.DataFrame(columns, index=index, columns=Order._fields, dtype=object)
+        return self._frame
+
+    @frame.setter
+    def frame(self, frame):
+        self._frame = frame
+
+
+class OrderFrame:
+    """
+    Market attribute that keeps orders in an OrderStore and exposes them as a DataFrame.
+
+    Reading the attribute returns the (cached) DataFrame of the store, assigning a DataFrame
+    replaces the orders of the store. The store itself is available as `_<name>_store`.
+    """
+
+    def __set_name__(self, owner, name):
+        self.store_name = "_{}_store".format(name)
+
+    def __get__(self, market, owner=None):
+        if market is None:
+            return self
+        return getattr(market, self.store_name).frame
+
+    def __set__(self, market, frame):
+        setattr(market, self.store_name, OrderStore(frame))
@@ -1,8 +1,14 @@
+import hashlib
 import json
 import random
+from pathlib import Path
+
 import networkx as nx
+import numpy as np
 from networkx.readwrite import json_graph
 import matplotlib.pyplot as plt
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components, shortest_path
 
 import simply.config as cfg
 
@@ -12,16 +18,19 @@ class PowerNetwork:
     Representation of energy grid and associated grid fees.
     """
 
-    def __init__(self, name, network, weight_factor=None):
+    def __init__(self, name, network, weight_factor=None, cache_path=None):
         """
         New network model. Sets edge weights to leaf nodes to 0 (cluster).
-        Calculates shortest paths, as network is unlikely to change again.
+        Calculates the grid fees between clusters, as network is unlikely to change again.
 
         :param name: name of network :type name: string :param network:
         graph representation :type network: networkx
         graph :param weight_factor: scale graph edge weights to power
         transmission cost. Can be set in config:
         network->weight_factor. Default 1 :type weight_factor: float
+        :param cache_path: directory to cache clusters and grid fee matrix of networks in.
+        Can be set in config: network->cache_path. Default None (no cache) :type cache_path:
+        string
         """
 
         self.name = name
@@ -44,9 +53,11 @@ class PowerNetwork:
 
         if weight_factor is None:
             weight_factor = cfg.parser.getfloat("network", "weight_factor", fallback=1)
+        if cache_path is None:
+            cache_path = cfg.parser.get("network", "cache_path", fallback=None)
+        self.cache_path = None if cache_path is None else Path(cache_path)
 
         self.network = network
-        self.update_shortest_paths()
         self.generate_grid_fee_matrix(weight_factor)
 
     def update_shortest_paths(self):
@@ -54,59 +65,53 @@ class PowerNetwork:
 
     def generate_grid_fee_matrix(self, weight_factor=1):
         # clustering of nodes by weight. Within cluster, edges have weight 0
-
-        # Reset cluster list, lookup and fee matrix
-        self.clusters = []
+        nodes = list(self.network.nodes)
+        node_idx = {node: i for i, node in enumerate(nodes)}
+        edges = list(self.network.edges(data="weight", default=0))
+        cache_file = None
+        if self.cache_path is not None:
+            # nodes and edges (in order) identify the network and the resulting clusters
+            network_hash = hashlib.sha256(
+                repr((nodes, edges, weight_factor)).encode()).hexdigest()
+            cache_file = self.cache_path / "{}.npz".format(network_hash)
+
+        if cache_file is not None and cache_file.exists():
+            with np.load(cache_file) as cached:
+                cluster_labels, grid_fee_matrix = cached["clusters"], cached["grid_fee_matrix"]
+        else:
+            u = np.array([node_idx[edge[0]] for edge in edges], dtype=int)
+            v = np.array([node_idx[edge[1]] for edge in edges], dtype=int)
+            weights = np.array([edge[2] for edge in edges], dtype=float)
+
+            # contract edges without weight into clusters (numbered in order of their nodes)
+            is_zero = weights == 0
+            num_clusters, cluster_labels = connected_components(csr_matrix(
+                (np.ones(np.count_nonzero(is_zero)), (u[is_zero], v[is_zero])),
+                shape=(len(nodes), len(nodes))), directed=False)
+            # edges between clusters, keep the one with lowest weight between any two clusters
+            c1, c2 = cluster_labels[u[~is_zero]], cluster_labels[v[~is_zero]]
+            c1, c2 = np.minimum(c1, c2), np.maximum(c1, c2)
+            order = np.lexsort((weights[~is_zero], c2, c1))
+            c1, c2, weights = c1[order], c2[order], weights[~is_zero][order]
+            is_lowest = np.ones(len(c1), dtype=bool)
+            is_lowest[1:] = (c1[1:] != c1[:-1]) | (c2[1:] != c2[:-1])
+            is_lowest &= c1 != c2
+            cluster_graph = csr_matrix(
+                (weights[is_lowest], (c1[is_lowest], c2[is_lowest])),
+                shape=(num_clusters, num_clusters))
+            # accumulated weights on shortest paths between all clusters
+            grid_fee_matrix = shortest_path(cluster_graph, directed=False) * weight_factor
+            if cache_file is not None:
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+                np.savez(cache_file, clusters=cluster_labels, grid_fee_matrix=grid_fee_matrix)
+
+        self.clusters = [set() for _ in range(len(grid_fee_matrix))]
         self.node_to_cluster = {}
-        self.grid_fee_matrix = []
-
-        # BFS: start with any node
-        nodes = [list(self.network.nodes)[0]]
-        while nodes:
-            # get first node from list. Guaranteed to not be part of prior cluster
-            u = nodes.pop(0)
-            # start new cluster with this node
-            cluster = len(self.clusters)
-            self.clusters.append({u})
-            self.node_to_cluster[u] = cluster
-            # check neighbors using BFS
-            cluster_nodes = [u]
-            while cluster_nodes:
-                # get next neighbor node
-                node = cluster_nodes.pop(0)
-                for edge in self.network.edges(node, data=True):
-                    # get target of this connection (neighbor of neighbor)
-                    v = edge[1]
-                    if v in self.node_to_cluster:
-                        # already visited
-                        continue
-                    if edge[2].get("weight", 0) == 0:
-                        # weight zero: part of cluster
-                        # add to cluster set
-                        self.clusters[-1].add(v)
-                        self.node_to_cluster[v] = cluster
-                        # add to list of neighbors to check later
-                        cluster_nodes.append(v)
-                    else:
-                        # not part of cluster
-                        # add to list of nodes that form new clusters
-                        nodes.append(v)
-
-        # Calculate accumulated weights on path between clusters and actor nodes
-        # Get any one node from each cluster
-        root_nodes = {i: list(c)[0] for i, c in enumerate(self.clusters)}
-        # init weight matrix with zeros
-        num_root_nodes = len(root_nodes)
-        self.grid_fee_matrix = [[0] * num_root_nodes for _ in range(num_root_nodes)]
-        # fill weight matrix
-        # matrix symmetric: only need to compute half of values, diagonal is 0
-        for i, n1 in root_nodes.items():
-            for j, n2 in root_nodes.items():
-                if i > j:
-                    # get weight between n1 and n2
-                    w = self.get_path_weight(n1, n2) * weight_factor
-                    self.grid_fee_matrix[i][j] = w
-                    self.grid_fee_matrix[j][i] = w
+        for node, cluster in zip(nodes, cluster_labels.tolist()):
+            self.clusters[cluster].add(node)
+            self.node_to_cluster[node] = cluster
+        # matrix with (scaled) weights between clusters, infinite if not connected
+        self.grid_fee_matrix = grid_fee_matrix
 
     def to_image(self):
         fig = self.plot(False)
@@ -1,5 +1,6 @@
 import json
 from networkx.readwrite import json_graph
+import numpy as np
 import pandas as pd
 import random
 
@@ -66,6 +67,16 @@ class Scenario:
                 a_dict[actor_variable.id] = actor_variable.to_dict(external_data=True)
                 actor_variable.save_csv(dirpath)
             dirpath.joinpath('actors.json').write_text(json.dumps(a_dict, indent=2))
+        elif data_format == "npy":
+            # Save data of all actors in one binary array (actor, time, column) and all actors
+            # in one config file, which holds the index of the actor in the array
+            self.save_profiles(dirpath)
+            a_dict = {}
+            for i, actor_variable in enumerate(self.actors):
+                a_dict[actor_variable.id] = {
+                    key: value for key, value in actor_variable.args.items() if key != "df"}
+                a_dict[actor_variable.id]["profile"] = i
+            dirpath.joinpath('actors.json').write_text(json.dumps(a_dict, indent=2))
         else:
             # Save config and data per actor in a single file
             for actor_variable in self.actors:
@@ -76,6 +87,43 @@ class Scenario:
         # save map_actors
         dirpath.joinpath('map_actors.json').write_text(json.dumps(self.map_actors, indent=2))
 
+    def save_profiles(self, dirpath):
+        """
+        Save the data of all actors in one binary array, with the time index and the column
+        names in separate arrays.
+
+        dirpath: Path object
+        """
+        dfs = [actor_variable.args["df"] for actor_variable in self.actors]
+        columns = list(dfs[0].columns) if dfs else []
+        index = dfs[0].index if dfs else pd.RangeIndex(0)
+        for df in dfs:
+            if list(df.columns) != columns or not df.index.equals(index):
+                raise ValueError("Binary scenario format requires the same columns and time "
+                                 "index for all actors")
+        profiles = np.stack([df.to_numpy(dtype=float) for df in dfs]) if dfs \
+            else np.empty((0, 0, 0))
+        np.save(dirpath.joinpath('actor_profiles.npy'), profiles)
+        np.save(dirpath.joinpath('actor_profiles_index.npy'), index.to_numpy())
+        np.save(dirpath.joinpath('actor_profiles_columns.npy'), np.array(columns, dtype=str))
+
+
+def load_profiles(dirpath):
+    """
+    Load the data of all actors saved by Scenario.save_profiles().
+
+    The array is memory-mapped, so no text is parsed and each actor reads only its own slice.
+    The returned DataFrames are read-only views of the file; Actor copies the scaled data
+    into memory when it is created.
+
+    dirpath: Path object
+    :return: function that returns the DataFrame of an actor, given its index in the array
+    """
+    profiles = np.load(dirpath.joinpath('actor_profiles.npy'), mmap_mode="r")
+    index = pd.Index(np.load(dirpath.joinpath('actor_profiles_index.npy')))
+    columns = np.load(dirpath.joinpath('actor_profiles_columns.npy')).tolist()
+    return lambda i: pd.DataFrame(profiles[i], index=index, columns=columns, copy=False)
+
 
 def from_dict(scenario_dict):
     pn_name, pn_dict = scenario_dict["power_network"].popitem()
@@ -125,6 +173,12 @@ def load(dirpath, data_format):
             ai = [aj["id"], pd.read_csv(dirpath / aj["csv"]), aj["csv"], aj["ls"], aj["ps"],
                   aj["pm"]]
             actors.append(actor.Actor(*ai))
+    elif data_format == "npy":
+        actors_j = json.loads(dirpath.joinpath("actors.json").read_text())
+        get_profile = load_profiles(dirpath)
+        for aj in actors_j.values():
+            ai = [aj["id"], get_profile(aj["profile"]), aj["csv"], aj["ls"], aj["ps"], aj["pm"]]
+            actors.append(actor.Actor(*ai))
     else:
         actor_files = dirpath.glob(f"actor_*.{data_format}")
         for f in sorted(actor_files):
@@ -147,8 +201,7 @@ def create_random(num_nodes, num_actors, weight_factor):
     # Add actor nodes at random position (leaf node) in the network
     # One network node can contain several actors (using random.choices method)
     map_actors = pn.add_actors_random(actors)
-    # Update shortest paths and the grid fee matrix
-    pn.update_shortest_paths()
+    # Update the grid fee matrix
     pn.generate_grid_fee_matrix(weight_factor)
 
     return Scenario(pn, actors, map_actors)
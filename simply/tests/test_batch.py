@@ -0,0 +1,64 @@
+import random
+
+import pandas as pd
+import pytest
+
+from simply.actor import Order
+from simply.batch import clear_batch
+from simply.market import Market, MARKET_MAKER_THRESHOLD
+from simply.market_fair import BestMarket
+
+
+def random_orders(timesteps, orders_per_timestep, seed=0):
+    rng = random.Random(seed)
+    return pd.DataFrame([
+        Order(rng.choice([-1, 1]), t, rng.randrange(10), rng.randrange(2),
+              rng.randint(1, 30) / 10, rng.randint(1, 5))
+        for t in range(timesteps) for _ in range(orders_per_timestep)])
+
+
+class TestBatch:
+
+    @pytest.mark.parametrize("market_type, market_kwargs", [
+        (Market, {}), (BestMarket, {"grid_fee_matrix": [[0, 1], [1, 0]]})])
+    def test_clear_batch(self, market_type, market_kwargs):
+        """Tests that clearing all timesteps at once gives the same matches as clearing one
+        market per timestep."""
+        orders = random_orders(5, 20)
+        expected = []
+        for t in range(5):
+            m = market_type(t, **market_kwargs)
+            for order_id, order in zip(orders.index, orders.itertuples(index=False)):
+                if order.time == t:
+                    m.accept_order(Order(*order), order_id)
+            expected += m.match() + m.match_market_maker()
+
+        matches = clear_batch(orders, market_type, **market_kwargs)
+        assert len(expected) > 0
+        assert matches.to_dict("records") == expected
+        # distribute timesteps over processes
+        matches = clear_batch(orders, market_type, processes=2, **market_kwargs)
+        assert matches.to_dict("records") == expected
+
+    def test_accept_orders(self):
+        """Tests that orders are accepted as with accept_order."""
+        orders = pd.DataFrame([Order(-1, 0, 0, None, 1.05, 1), Order(1, 0, 1, None, 0.05, 1),
+                               Order(1, 0, 2, None, MARKET_MAKER_THRESHOLD, 1)],
+                              index=["a", "b", "c"])
+        m = Market(0)
+        m.accept_orders(orders)
+        assert list(m.orders.index) == ["a"]
+        assert m.orders.at["a", "energy"] == pytest.approx(1)
+        assert list(m.asks_mm.index) == ["c"]
+        # reject existing order IDs, orders from the future and wrong types
+        with pytest.raises(ValueError):
+            m.accept_orders(orders)
+        with pytest.raises(ValueError):
+            m.accept_orders(pd.DataFrame([Order(-1, 1, 0, None, 1, 1)]))
+        with pytest.raises(ValueError):
+            m.accept_orders(pd.DataFrame([Order(0, 0, 0, None, 1, 1)]))
+
+    def test_empty(self):
+        matches = clear_batch(pd.DataFrame([], columns=Order._fields))
+        assert len(matches) == 0
+        assert "energy" in matches.columns
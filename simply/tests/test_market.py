@@ -289,3 +289,28 @@ class TestPayAsBid:
         matches = m.match_market_maker()
         # unmatched since no market maker order
         assert len(matches) == 0
+
+    def test_same_actor(self):
+        """Tests that orders of the same actor are not matched with each other, while the other
+        orders are matched in the same order."""
+        m = Market(0)
+        m.accept_order(Order(-1, 0, 0, None, 1, 2))
+        m.accept_order(Order(-1, 0, 1, None, 1, 1))
+        m.accept_order(Order(1, 0, 0, None, 2, 1))
+        m.accept_order(Order(1, 0, 2, None, 1, 1))
+        matches = m.match()
+        assert [(match["bid_id"], match["ask_id"], match["energy"]) for match in matches] == [
+            (0, 3, 1), (1, 2, 1)]
+        # matched energy is removed from the orders
+        assert list(m.orders["energy"]) == [0, 0, 1, 0]
+
+    def test_energy_rounding(self):
+        """Tests that energy left over from partial matches is matched, even if it is slightly
+        below the energy unit due to rounding errors."""
+        m = Market(0)
+        m.accept_order(Order(-1, 0, 0, None, 5, 1))
+        m.accept_order(Order(1, 0, 1, None, 2.9, 1))
+        m.accept_order(Order(1, 0, 2, None, 2, 1))
+        m.accept_order(Order(1, 0, 3, None, 0.1, 1))
+        matches = m.match()
+        assert sum(match["energy"] for match in matches) == pytest.approx(5)
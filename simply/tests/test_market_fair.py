@@ -294,3 +294,30 @@ class TestBestMarket:
         assert len(m.matches) == 1
         assert m.matches[0]['energy'] == pytest.approx(1)
         assert m.matches[0]['price'] == pytest.approx(4)
+
+    def test_large_energy(self):
+        """Tests that matching does not depend on the number of energy units of the orders."""
+        m = BestMarket(0, grid_fee_matrix=[[0, 1], [1, 0]])
+        m.energy_unit = 0.125
+        m.accept_order(Order(-1, 0, 2, 0, 10**6, 4))
+        m.accept_order(Order(-1, 0, 3, 1, 10**6, 3))
+        m.accept_order(Order(1, 0, 4, 0, 1.5 * 10**6, 2))
+        matches = m.match()
+        # the ask is worth more in cluster 1, only the rest is matched within cluster 0
+        assert [(match["bid_actor"], match["ask_actor"]) for match in matches] == [(3, 4), (2, 4)]
+        assert matches[0]["energy"] == pytest.approx(10**6)
+        assert matches[1]["energy"] == pytest.approx(.5 * 10**6)
+        assert matches[0]["price"] == pytest.approx(3)
+        assert matches[1]["price"] == pytest.approx(2)
+        assert list(m.orders["energy"]) == [.5 * 10**6, 0, 0]
+
+    def test_equal_bid_prices(self):
+        """Tests that of several bids with the same price, the earliest bid is matched first."""
+        m = BestMarket(0, self.pn)
+        m.accept_order(Order(-1, 0, 1, None, 1, 3))
+        m.accept_order(Order(-1, 0, 2, None, 1, 3))
+        m.accept_order(Order(1, 0, 3, None, 1, 3))
+        matches = m.match()
+        assert len(matches) == 1
+        assert matches[0]["bid_actor"] == 1
+        assert matches[0]["ask_actor"] == 3
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from simply.actor import Order
+from simply.market import Market
+from simply.order_store import INITIAL_CAPACITY, OrderStore
+
+
+class TestOrderStore:
+
+    def test_append(self):
+        """Tests that appending orders grows the arrays beyond their initial capacity and that
+        bids and asks are returned as views of the arrays."""
+        store = OrderStore()
+        n = INITIAL_CAPACITY + 10
+        for i in range(n):
+            assert store.append(Order(1 if i % 2 else -1, 0, i, 0, 1, i)) == i
+        assert len(store) == n
+        assert store.has_consecutive_ids
+        bids, asks = store.get_bids(), store.get_asks()
+        assert list(bids["id"]) == list(range(0, n, 2))
+        assert list(asks["price"]) == list(range(1, n, 2))
+        assert bids["energy"].dtype == np.float64
+        assert np.shares_memory(bids["price"], store.get_bids()["price"])
+        with pytest.raises(ValueError):
+            store.append(Order(0, 0, 0, 0, 1, 1))
+
+    def test_frame(self):
+        """Tests the conversion from and to DataFrames, including changes made to the
+        DataFrame."""
+        store = OrderStore()
+        store.append(Order(1, 0, "a", 0, 1, 2))
+        store.append(Order(-1, 0, "b", 0, 3, 4))
+        frame = store.frame
+        assert isinstance(frame.index, pd.RangeIndex)
+        assert list(frame["actor_id"]) == ["a", "b"]
+        assert (frame.dtypes == object).all()
+        assert store.frame is frame
+        # changes of the DataFrame are kept when appending the next order
+        frame.loc[1, "energy"] = 5
+        store.append(Order(-1, 0, "c", 0, 6, 7), "ID")
+        assert list(store.get_bids()["energy"]) == [5, 6]
+        assert not store.has_consecutive_ids
+        assert list(store.frame.index) == [0, 1, "ID"]
+        assert "ID" in store
+
+    def test_market_orders(self):
+        """Tests that the market orders are kept in order stores and can be replaced by
+        DataFrames."""
+        m = Market(0)
+        m.accept_order(Order(-1, 0, 0, None, 1, 1))
+        assert m._orders_store.has_consecutive_ids
+        m.orders = m.orders[:0]
+        assert len(m._orders_store) == 0
+        m.accept_order(Order(1, 0, 0, None, 1, 1))
+        assert list(m.orders.index) == [0]
+
+    def test_bids_and_asks_frames(self):
+        """Tests that the bid and ask DataFrames match the filtered orders without building the
+        frame of the store, so appending the next order does not reload the store."""
+        store = OrderStore()
+        store.append(Order(1, 0, "a", 0, 1, 2))
+        store.append(Order(-1, 0, "b", 0, 3, 4), "ID")
+        store.append(Order(-1, 0, "c", 0, 5, 6))
+        bids, asks = store.get_bids_frame(), store.get_asks_frame()
+        assert store._frame is None
+        frame = store.frame
+        pd.testing.assert_frame_equal(bids, frame[frame["type"] == -1], check_index_type=False)
+        pd.testing.assert_frame_equal(asks, frame[frame["type"] == 1], check_index_type=False)
+        # with a cached frame, the frame is filtered and kept
+        assert list(store.get_bids_frame().index) == ["ID", 2]
+        assert store._frame is frame
@@ -45,3 +45,29 @@ class TestPowerNetwork:
         assert len(pn.network.nodes) == 2
         assert len(pn.network.edges) == 1
         assert 0 <= pn.network[0][1]["weight"] <= 1
+
+    def test_grid_fee_matrix(self):
+        network = nx.Graph()
+        network.add_edges_from([(0, 1, {"weight": 1}), (1, 2), (1, 3), (0, 4),
+                                (2, 5, {"weight": 2}), (5, 6), (0, 7, {"weight": 4}), (7, 8)])
+        pn = PowerNetwork("", network, weight_factor=0.5)
+        # clusters are numbered in order of their nodes
+        assert pn.clusters == [{0, 4}, {1, 2, 3}, {5, 6}, {7, 8}]
+        assert pn.node_to_cluster[6] == 2
+        assert pn.grid_fee_matrix.tolist() == [[0, .5, 1.5, 2],
+                                               [.5, 0, 1, 2.5],
+                                               [1.5, 1, 0, 3.5],
+                                               [2, 2.5, 3.5, 0]]
+
+    def test_grid_fee_matrix_cache(self, tmp_path):
+        network = nx.path_graph(4)
+        network[1][2]["weight"] = 1
+        pn = PowerNetwork("", network, cache_path=tmp_path)
+        assert len(list(tmp_path.glob("*.npz"))) == 1
+        cached_pn = PowerNetwork("", network.copy(), cache_path=tmp_path)
+        assert cached_pn.node_to_cluster == pn.node_to_cluster
+        assert (cached_pn.grid_fee_matrix == pn.grid_fee_matrix).all()
+        # changed network: not in cache
+        network[1][2]["weight"] = 2
+        PowerNetwork("", network, cache_path=tmp_path)
+        assert len(list(tmp_path.glob("*.npz"))) == 2
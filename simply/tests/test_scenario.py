@@ -1,6 +1,7 @@
 import networkx as nx
+import pandas as pd
 
-from simply.scenario import Scenario, create_random
+from simply.scenario import Scenario, create_random, load
 from simply.power_network import PowerNetwork
 
 
@@ -27,3 +28,15 @@ class TestScenario:
         assert len(s.actors) == 2
         assert len(s.map_actors) == 2
         assert len(s.power_network.network.nodes) == 3 + 2
+
+    def test_save_load_binary(self, tmp_path):
+        s = create_random(3, 2, 1)
+        s.save(tmp_path, "npy")
+        loaded = load(tmp_path, "npy")
+        assert [a.id for a in loaded.actors] == [a.id for a in s.actors]
+        for a, loaded_a in zip(s.actors, loaded.actors):
+            pd.testing.assert_frame_equal(loaded_a.args["df"], a.args["df"], check_freq=False)
+            pd.testing.assert_frame_equal(loaded_a.pred, a.pred, check_freq=False)
+            assert loaded_a.args["pm"] == a.args["pm"]
+        # actor data is memory-mapped (read-only)
+        assert not loaded.actors[0].args["df"].values.flags.writeable
@@ -62,6 +62,51 @@ RUN_IN_REALTIME = False
 CONNECT_TO_PROFILES_DB = False
 SEND_EVENTS_RESPONSES_TO_SDK_VIA_RQ = False
 
+# Controls whether the internal matcher uses the NumPy implementations of the pay as bid and
+# pay as clear matching algorithms instead of the gsy-framework ones.
+VECTORISED_MATCHING_ALGORITHMS = False
+# Number of workers that the internal matcher uses in order to compute the recommendations of
+# different markets in parallel. Parallel matching is disabled for values lower than 2.
+PARALLEL_MATCHING_WORKERS = 0
+# Controls whether the TICK event is only dispatched to the strategies and market agents that have
+# work to do on the tick (see EventMixin.next_tick_wakeup), instead of all of them.
+SKIP_IDLE_TICKS = False
+# Number of ticks that are dispatched per market slot in fast-forward mode, evenly spread over the
+# slot (the first and the last tick of the slot are always dispatched). The clock of the skipped
+# ticks is advanced without dispatching them, and the price updaters catch up with the updates of
+# the skipped ticks on the next dispatched tick (see Simulation._get_ticks_to_dispatch for the
+# effect on the trades). Slots with an external connection or live events always run at full tick
+# resolution. None disables the fast-forward mode.
+FAST_FORWARD_TICKS_PER_SLOT = None
+# Controls whether the profiles that are read from files are kept in a process-wide cache, so that
+# each file is parsed only once and all assets that use it share read-only views of its values.
+SHARED_PROFILE_CACHE = False
+# Controls whether the template strategy updaters compute the rates of their orders for all price
+# updates of a time slot when the price settings are populated (once per market cycle), so that
+# the ticks only look them up. Updaters with identical rates share the same rate trajectories.
+PRECOMPUTED_RATE_TRAJECTORIES = False
+# Controls whether the messages that are published to the external clients during a tick are
+# buffered and sent in one redis pipeline at the end of the tick (serialized with orjson if it is
+# installed), instead of one round-trip to redis per message.
+BATCHED_REDIS_PUBLISHING = False
+# Controls whether the redis communicators of the areas and markets (used when the events are
+# dispatched via redis) share one redis client with its connection pool and one pubsub reader
+# thread, instead of opening their own connections and listener threads.
+SHARED_REDIS_CONNECTIONS = False
+# Controls whether the areas that dispatch the events via redis publish an event to all of their
+# child areas (and the clearing event to all of their markets) at once and then wait for all the
+# responses, instead of waiting for the response of each child area before publishing to the next.
+CONCURRENT_REDIS_EVENT_DISPATCHING = False
+# Controls whether the trades of the aggregator controlled assets only update the branch of the
+# asset in the global statistics that are sent to the aggregators (instead of recreating the stats
+# of the whole grid), and whether the aggregators' views of these statistics are cached.
+INCREMENTAL_EXTERNAL_GLOBAL_STATS = False
+# Controls how the csv-files of the results are written during the simulation: None appends the
+# rows of each slot to the files directly, "csv" and "parquet" pass them to a results sink (see
+# gsy_e.gsy_e_core.sim_results.results_sink) that writes them on a background thread, either to
+# the csv-files or to parquet files that are exported to csv-files at the end of the simulation.
+RESULTS_SINK = None
+
 
 class SettlementTemplateStrategiesConstants:
     """Constants related to the configuration of settlement template strategies"""
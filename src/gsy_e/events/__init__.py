@@ -15,11 +15,15 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
-from typing import Union, List  # noqa
+from time import perf_counter_ns
+from typing import Union, List, Optional  # noqa
 from gsy_e.events.event_structures import MarketEvent, AreaEvent
+from gsy_e.gsy_e_core.trace_profiler import trace_profiler
 
 
 class EventMixin:
+    # Set when a market event was received after the last TICK event
+    _pending_market_events = False
 
     def _event_mapping(self, event):
         if event == AreaEvent.TICK:
@@ -55,8 +59,40 @@ class EventMixin:
 
     def event_listener(self, event_type: Union[AreaEvent, MarketEvent], **kwargs):
         self.log.trace("Dispatching event %s", event_type.name)
+        if isinstance(event_type, MarketEvent):
+            self._pending_market_events = True
+        elif event_type == AreaEvent.TICK:
+            self._pending_market_events = False
+        if trace_profiler.enabled:
+            self._traced_event_listener(event_type, **kwargs)
+            return
         self._event_mapping(event_type)(**kwargs)
 
+    def _traced_event_listener(self, event_type: Union[AreaEvent, MarketEvent], **kwargs):
+        start_ns = perf_counter_ns()
+        try:
+            self._event_mapping(event_type)(**kwargs)
+        finally:
+            owner = getattr(self, "owner", None)
+            trace_profiler.add_event_handler(
+                getattr(owner, "name", "-"), self.__class__.__name__, event_type.name,
+                perf_counter_ns() - start_ns)
+
+    def next_tick_wakeup(self, current_tick: int) -> Optional[int]:
+        """Return the next tick on which the TICK event has work to do, None if there is none.
+
+        Defaults to every tick, listeners that only act on specific ticks (e.g. when the prices
+        of their orders are updated) can override it so that idle ticks are skipped.
+        """
+        return current_tick
+
+    def is_tick_due(self, current_tick: int) -> bool:
+        """Return True if the TICK event should be dispatched to the listener on current_tick."""
+        if self._pending_market_events:
+            return True
+        next_wakeup = self.next_tick_wakeup(current_tick)
+        return next_wakeup is not None and next_wakeup <= current_tick
+
     def event_tick(self):
         pass
 
@@ -102,6 +102,9 @@ _setup_modules = available_simulation_scenarios
               default=today(tz=gsy_e.constants.TIME_ZONE).format(gsy_e.constants.DATE_FORMAT),
               show_default=True,
               help=f"Start date of the Simulation ({gsy_e.constants.DATE_FORMAT})")
+@click.option("--trace-path", type=str, default=None,
+              help=("Record the wall time of the simulation phases and event handlers, and write "
+                    "it as a Chrome trace (JSON, gzip compressed if the path ends with .gz)"))
 @click.option("--enable-dof/--disable-dof",
               is_flag=True, default=True,
               help=(
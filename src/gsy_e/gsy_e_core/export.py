@@ -40,6 +40,7 @@ from sortedcontainers import SortedDict
 import gsy_e.constants
 from gsy_e.gsy_e_core.myco_singleton import bid_offer_matcher
 from gsy_e.gsy_e_core.sim_results.plotly_graph import PlotlyGraph
+from gsy_e.gsy_e_core.sim_results.results_sink import create_results_sink
 from gsy_e.gsy_e_core.util import constsettings_to_dict, round_floats_for_ui
 from gsy_e.data_classes import PlotDescription
 from gsy_e.models.area import Area
@@ -85,6 +86,7 @@ class ExportAndPlot:
         self.endpoint_buffer = endpoint_buffer
         self.file_stats_endpoint = file_stats_endpoint
         self.raw_data_subdir = None
+        self.results_sink = None
         try:
             if path is not None:
                 path = os.path.abspath(path)
@@ -105,6 +107,24 @@ class ExportAndPlot:
             return
 
         self.plot_dir = os.path.join(self.directory, "plot")
+        self.results_sink = create_results_sink(gsy_e.constants.RESULTS_SINK)
+
+    def close_results_sink(self) -> None:
+        """Wait until the results sink has written all rows and close it."""
+        if self.results_sink is not None:
+            self.results_sink.close()
+
+    def _write_csv_rows(self, file_path: str, labels: Tuple, rows: List,
+                        is_first: bool) -> None:
+        """Append the rows (and the labels, if is_first is set) to the csv-file."""
+        if self.results_sink is not None:
+            self.results_sink.write_rows(file_path, labels, rows, is_first)
+            return
+        with open(file_path, "a", encoding="utf-8") as csv_file:
+            writer = csv.writer(csv_file)
+            if is_first:
+                writer.writerow(labels)
+            writer.writerows(rows)
 
     def export_json_data(self, directory: dir) -> None:
         """Write aggregated results into JSON files."""
@@ -322,59 +342,46 @@ class ExportAndPlot:
         """Export clearing rate as in a csv-file."""
         file_path = self._file_path(directory, f"{area.slug}-{file_suffix}")
         labels = ("slot",) + MarketClearingState.csv_fields()
+        rows = []
+        for market in area.past_markets:
+            market_clearing = bid_offer_matcher.matcher.match_algorithm.state.clearing.get(
+                market.id)
+            if market_clearing is None:
+                continue
+            for time, clearing in market_clearing.items():
+                if market.time_slot > time:
+                    rows.append((market.time_slot_str, time, clearing))
         try:
-            with open(file_path, "a", encoding="utf-8") as csv_file:
-                writer = csv.writer(csv_file)
-                if is_first:
-                    writer.writerow(labels)
-                for market in area.past_markets:
-                    market_clearing = bid_offer_matcher.matcher.match_algorithm.state.clearing.get(
-                        market.id)
-                    if market_clearing is None:
-                        continue
-                    for time, clearing in market_clearing.items():
-                        if market.time_slot > time:
-                            row = (market.time_slot_str, time, clearing)
-                            writer.writerow(row)
+            self._write_csv_rows(file_path, labels, rows, is_first)
         except OSError:
             _log.exception("Could not export area market_clearing_rate")
 
-    @staticmethod
     def _export_future_offers_bid_trades_to_csv_files(
-            future_markets: "FutureMarkets", market_member: str, file_path: dir,
+            self, future_markets: "FutureMarkets", market_member: str, file_path: dir,
             labels: Tuple, is_first: bool = False) -> None:
         """
         Export files containing individual future offers, bids (*-bids*/*-offers*.csv files).
         """
+        rows = []
+        if future_markets.market_time_slots:
+            time_slot = future_markets.market_time_slots[0]
+            rows = [(time_slot,) + offer_or_bid.csv_values()
+                    for offer_or_bid in getattr(future_markets, market_member)
+                    if offer_or_bid.time_slot == time_slot]
         try:
-            with open(file_path, "a", encoding="utf-8") as csv_file:
-                writer = csv.writer(csv_file)
-                if is_first:
-                    writer.writerow(labels)
-                if not future_markets.market_time_slots:
-                    return
-                time_slot = future_markets.market_time_slots[0]
-                for offer_or_bid in getattr(future_markets, market_member):
-                    if offer_or_bid.time_slot == time_slot:
-                        row = (time_slot,) + offer_or_bid.csv_values()
-                        writer.writerow(row)
+            self._write_csv_rows(file_path, labels, rows, is_first)
         except OSError:
             _log.exception("Could not export offers, bids, trades")
 
-    @staticmethod
-    def _export_offers_bids_trades_to_csv_files(past_markets: List, market_member: str,
+    def _export_offers_bids_trades_to_csv_files(self, past_markets: List, market_member: str,
                                                 file_path: dir, labels: Tuple,
                                                 is_first: bool = False) -> None:
         """ Export files containing individual offers, bids (*-bids*/*-offers*.csv files)."""
+        rows = [(market.time_slot,) + offer_or_bid.csv_values()
+                for market in past_markets
+                for offer_or_bid in getattr(market, market_member)]
         try:
-            with open(file_path, "a", encoding="utf-8") as csv_file:
-                writer = csv.writer(csv_file)
-                if is_first:
-                    writer.writerow(labels)
-                for market in past_markets:
-                    for offer_or_bid in getattr(market, market_member):
-                        row = (market.time_slot,) + offer_or_bid.csv_values()
-                        writer.writerow(row)
+            self._write_csv_rows(file_path, labels, rows, is_first)
         except OSError:
             _log.exception("Could not export offers, bids, trades")
 
@@ -389,12 +396,8 @@ class ExportAndPlot:
             return
 
         try:
-            with open(self._file_path(directory, file_name), "a", encoding="utf-8") as csv_file:
-                writer = csv.writer(csv_file)
-                if is_first:
-                    writer.writerow(data.labels)
-                for row in rows:
-                    writer.writerow(row)
+            self._write_csv_rows(self._file_path(directory, file_name), data.labels, rows,
+                                 is_first)
         except OSError:
             _log.exception("Could not export area data.")
 
@@ -15,10 +15,15 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
+from typing import TYPE_CHECKING
+
 import gsy_e.constants
 from gsy_e.gsy_e_core.util import (find_object_of_same_weekday_and_time,
                                    get_market_maker_rate_from_config, ExternalTickCounter)
 
+if TYPE_CHECKING:
+    from gsy_e.models.area import Area
+
 
 class ExternalConnectionGlobalStatistics:
     """
@@ -30,6 +35,10 @@ class ExternalConnectionGlobalStatistics:
         self.external_tick_counter = None
         self.current_feed_in_tariff = None
         self.current_market_maker_rate = None
+        # increased whenever area_stats_tree_dict is updated, so that views of it can be cached
+        self.area_stats_tree_version = 0
+        # area uuid -> the dict of area_stats_tree_dict that holds the dict of the area
+        self._area_dict_holders = {}
 
     def __call__(self, root_area, ticks_per_slot):
         self.root_area = root_area
@@ -56,11 +65,23 @@ class ExternalConnectionGlobalStatistics:
             self.current_market_maker_rate = get_market_maker_rate_from_config(
                                                       self.root_area.current_market)
 
-    def update(self, market_cycle: bool = False) -> None:
-        """Update the global statistics"""
+    def update(self, market_cycle: bool = False, area: "Area" = None) -> None:
+        """Update the global statistics.
+
+        If the area (whose statistics have changed, e.g. because of a trade) is given and
+        gsy_e.constants.INCREMENTAL_EXTERNAL_GLOBAL_STATS is set, only the dicts of the area and
+        of its parent areas are recreated, instead of the whole area_stats_tree_dict.
+        """
         if self.root_area.current_market is None:
             return
-        self._create_grid_tree_dict(self.root_area, self.area_stats_tree_dict)
+        if (area is not None and not market_cycle and
+                gsy_e.constants.INCREMENTAL_EXTERNAL_GLOBAL_STATS and
+                area.uuid in self._area_dict_holders):
+            self._update_area_branch(area)
+        else:
+            self._area_dict_holders = {}
+            self._create_grid_tree_dict(self.root_area, self.area_stats_tree_dict)
+        self.area_stats_tree_version += 1
         if market_cycle:
             self._buffer_feed_in_tariff(self.root_area, self.root_area.current_market.time_slot)
             self._buffer_market_maker_rate()
@@ -69,17 +90,32 @@ class ExternalConnectionGlobalStatistics:
         """Returns true if it is time for broadcasting event_tick to external strategies"""
         return self.external_tick_counter.is_it_time_for_external_tick(current_tick_in_slot)
 
+    def _update_area_branch(self, area):
+        # recreate the dict of the area and update the statistics of its parent areas
+        self._create_grid_tree_dict(area, self._area_dict_holders[area.uuid])
+        parent = area.parent
+        while parent is not None and parent.uuid in self._area_dict_holders:
+            if parent.current_market:
+                self._area_dict_holders[parent.uuid][parent.uuid].update(
+                    self._get_market_stats_dict(parent))
+            parent = parent.parent
+
+    @staticmethod
+    def _get_market_stats_dict(area):
+        return {'last_market_bill': area.stats.get_last_market_bills(),
+                'last_market_stats': area.stats.get_price_stats_current_market(),
+                'last_market_fee': area.current_market.fee_class.grid_fee_rate,
+                'current_market_fee': area.get_grid_fee()}
+
     def _create_grid_tree_dict(self, area, outdict):
         # the lazy import is needed in order to avoid circular imports
         # pylint: disable=import-outside-toplevel
         from gsy_e.models.strategy.external_strategies import ExternalMixin
+        self._area_dict_holders[area.uuid] = outdict
         outdict[area.uuid] = {}
         if area.children:
             if area.current_market:
-                area_dict = {'last_market_bill': area.stats.get_last_market_bills(),
-                             'last_market_stats': area.stats.get_price_stats_current_market(),
-                             'last_market_fee': area.current_market.fee_class.grid_fee_rate,
-                             'current_market_fee': area.get_grid_fee(),
+                area_dict = {**self._get_market_stats_dict(area),
                              'area_name': area.name,
                              'children': {}}
             else:
@@ -27,6 +27,9 @@ class AggregatorHandler:
         self.device_aggregator_mapping = {}
         self.lock = Lock()
         self.grid_buffer = {}
+        # aggregator uuid -> ((version of the area_stats_tree_dict, devices of the aggregator),
+        #                     grid tree of the aggregator)
+        self._grid_tree_cache = {}
 
     def set_aggregator_device_mapping(self, aggregator_device):
         """Sets the aggregator_device_mapping derived from the aggregator_device_mapping
@@ -47,29 +50,46 @@ class AggregatorHandler:
         create_subdict_or_update(batch_event_dict, aggregator_uuid, event)
 
     def _delete_not_owned_devices_from_dict(self, area_stats_tree_dict, aggregator_uuid):
-        """Wrapper for _delete_not_owned_devices"""
-        out_dict = deepcopy(area_stats_tree_dict)
-        self._delete_not_owned_devices(area_stats_tree_dict, aggregator_uuid, out_dict)
-        return out_dict
+        """Return a copy of area_stats_tree_dict without the info of the devices that are not
+        connected to the aggregator"""
+        owned_devices = self.aggregator_device_mapping.get(aggregator_uuid, ())
+        return {area_uuid: self._copy_area_dict(area_uuid, area_dict, owned_devices)
+                for area_uuid, area_dict in area_stats_tree_dict.items()}
 
-    def _delete_not_owned_devices(self, indict: dict, aggregator_uuid: str, outdict: dict):
+    def _copy_area_dict(self, area_uuid, area_dict, owned_devices):
         """Only sent area info from areas that are connected to an external client and
         to the same aggregator from the to be sent area_stats_tree_dict"""
-        for area_uuid, area_dict in indict.items():
-            if "children" in area_dict:
-                self._delete_not_owned_devices(indict[area_uuid]["children"],
-                                               aggregator_uuid,
-                                               outdict[area_uuid]["children"])
-            else:
-                if (area_uuid not in self.device_aggregator_mapping or
-                        area_uuid not in self.aggregator_device_mapping[aggregator_uuid]):
-                    outdict[area_uuid] = {"area_name": area_dict["area_name"]}
+        if "children" in area_dict:
+            out_dict = {key: deepcopy(value) for key, value in area_dict.items()
+                        if key != "children"}
+            out_dict["children"] = {
+                child_uuid: self._copy_area_dict(child_uuid, child_dict, owned_devices)
+                for child_uuid, child_dict in area_dict["children"].items()}
+            return out_dict
+        if area_uuid not in self.device_aggregator_mapping or area_uuid not in owned_devices:
+            return {"area_name": area_dict["area_name"]}
+        return deepcopy(area_dict)
+
+    def _get_grid_tree(self, aggregator_uuid: str) -> dict:
+        """Return the aggregator's view of the area_stats_tree_dict, cached until it changes"""
+        stats = global_objects.external_global_stats
+        if not gsy_e.constants.INCREMENTAL_EXTERNAL_GLOBAL_STATS:
+            return self._delete_not_owned_devices_from_dict(
+                stats.area_stats_tree_dict, aggregator_uuid)
+        # the view also changes when devices select or unselect the aggregator
+        cache_key = (stats.area_stats_tree_version,
+                     tuple(self.aggregator_device_mapping.get(aggregator_uuid, ())))
+        cached_key, grid_tree = self._grid_tree_cache.get(aggregator_uuid, (None, None))
+        if cached_key != cache_key:
+            grid_tree = self._delete_not_owned_devices_from_dict(
+                stats.area_stats_tree_dict, aggregator_uuid)
+            self._grid_tree_cache[aggregator_uuid] = (cache_key, grid_tree)
+        return grid_tree
 
     def _create_grid_tree_event_dict(self, aggregator_uuid: str) -> dict:
         """Accumulate area_stats_tree_dict information and initiate a event dictionary
         to be sent to the client"""
-        return {"grid_tree": self._delete_not_owned_devices_from_dict(
-            global_objects.external_global_stats.area_stats_tree_dict, aggregator_uuid),
+        return {"grid_tree": self._get_grid_tree(aggregator_uuid),
                 "feed_in_tariff_rate": global_objects.external_global_stats.current_feed_in_tariff,
                 "market_maker_rate":
                 global_objects.external_global_stats.current_market_maker_rate}
@@ -17,15 +17,22 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
 from threading import Event, Lock, Thread
 from time import time
-from typing import Dict
+from typing import Dict, List, Tuple, Union
 from collections.abc import Callable
 
 from gsy_framework.constants_limits import ConstSettings
 from redis import StrictRedis
 from rq import Queue
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 import gsy_e.constants
 from gsy_e.constants import REDIS_PUBLISH_RESPONSE_TIMEOUT
 from gsy_e.gsy_e_core.redis_connections.aggregator_connection import AggregatorHandler
@@ -36,14 +43,133 @@ REDIS_THREAD_JOIN_TIMEOUT = 2
 REDIS_POLL_TIMEOUT = 0.01
 
 
+def dumps_json(data: Dict) -> Union[str, bytes]:
+    """Serialize the dict to JSON, using orjson if it is installed and supports the data."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        except TypeError:
+            pass
+    return json.dumps(data)
+
+
+class SharedPubSub:
+    """
+    Pubsub connection with a single reader thread that is shared by the communicators of the
+    process. The messages are dispatched to the callbacks that are registered for their channel,
+    in the reader thread, therefore the callbacks must not block.
+    """
+
+    def __init__(self, redis_db: StrictRedis):
+        self._pubsub = redis_db.pubsub()
+        self.thread = None
+        self._lock = Lock()
+        # channel -> {id of the subscriber: callback}, replaced on every change (not mutated) so
+        # that the reader thread can iterate over the callbacks without holding the lock
+        self._callbacks: Dict[str, Dict[int, Callable]] = {}
+
+    def _channel_handler(self, channel: str) -> Callable:
+        def handler(message):
+            for callback in self._callbacks.get(channel, {}).values():
+                callback(message)
+        return handler
+
+    def subscribe(self, subscriber: object, channel_callback_dict: Dict) -> Thread:
+        """Register the callbacks of the subscriber and return the reader thread."""
+        with self._lock:
+            new_channels = {}
+            for channel, callback in channel_callback_dict.items():
+                if channel not in self._callbacks:
+                    new_channels[channel] = self._channel_handler(channel)
+                self._callbacks[channel] = {
+                    **self._callbacks.get(channel, {}), id(subscriber): callback}
+            if new_channels:
+                self._pubsub.subscribe(**new_channels)
+            if self.thread is None:
+                self.thread = self._pubsub.run_in_thread(sleep_time=0.1, daemon=True)
+                log.debug("Started SharedPubSub thread: %s", self.thread)
+            return self.thread
+
+    def unsubscribe(self, subscriber: object) -> None:
+        """Remove all callbacks of the subscriber."""
+        with self._lock:
+            unused_channels = []
+            for channel, callbacks in list(self._callbacks.items()):
+                if id(subscriber) not in callbacks:
+                    continue
+                callbacks = {key: callback for key, callback in callbacks.items()
+                             if key != id(subscriber)}
+                if callbacks:
+                    self._callbacks[channel] = callbacks
+                else:
+                    del self._callbacks[channel]
+                    unused_channels.append(channel)
+            if unused_channels:
+                self._pubsub.unsubscribe(*unused_channels)
+
+    def terminate(self) -> None:
+        """Stop the reader thread and close the pubsub connection."""
+        with self._lock:
+            if self.thread is not None:
+                self.thread.stop()
+                self.thread.join(timeout=REDIS_THREAD_JOIN_TIMEOUT)
+                self.thread = None
+            self._pubsub.close()
+            self._callbacks = {}
+
+
+class SharedRedisConnections:
+    """
+    Redis client (with its connection pool) and SharedPubSub that are shared by the communicators
+    of the process if gsy_e.constants.SHARED_REDIS_CONNECTIONS is set. Both are created on first
+    use.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._redis_db = None
+        self._pubsub = None
+
+    @property
+    def redis_db(self) -> StrictRedis:
+        """Return the shared redis client."""
+        with self._lock:
+            if self._redis_db is None:
+                self._redis_db = StrictRedis.from_url(REDIS_URL, retry_on_timeout=True)
+            return self._redis_db
+
+    @property
+    def pubsub(self) -> SharedPubSub:
+        """Return the shared pubsub connection."""
+        redis_db = self.redis_db
+        with self._lock:
+            if self._pubsub is None:
+                self._pubsub = SharedPubSub(redis_db)
+            return self._pubsub
+
+    def reset(self) -> None:
+        """Terminate the shared pubsub connection and drop the shared client."""
+        with self._lock:
+            if self._pubsub is not None:
+                self._pubsub.terminate()
+            self._pubsub = None
+            self._redis_db = None
+
+
+shared_redis_connections = SharedRedisConnections()
+
+
 class RedisCommunicator:
     """Base class for redis communication using pubsub."""
 
     def __init__(self):
-        self.redis_db = StrictRedis.from_url(REDIS_URL, retry_on_timeout=True)
+        self.is_sharing_connections = gsy_e.constants.SHARED_REDIS_CONNECTIONS
+        self.redis_db = (shared_redis_connections.redis_db if self.is_sharing_connections
+                         else StrictRedis.from_url(REDIS_URL, retry_on_timeout=True))
         self.pubsub = self.redis_db.pubsub()
         self.pubsub_response = self.redis_db.pubsub()
         self.event = Event()
+        self._listener_executor = None
 
     def publish(self, channel: str, data: str):
         """Publish message on redis channel."""
@@ -60,6 +186,8 @@ class RedisCommunicator:
 
     def sub_to_response(self, channel: str, callback: Callable) -> Thread:
         """Subscribe to response channel and return pubsub thread."""
+        if self.is_sharing_connections:
+            return shared_redis_connections.pubsub.subscribe(self, {channel: callback})
         self.pubsub_response.subscribe(**{channel: callback})
         thread = self.pubsub_response.run_in_thread(daemon=True)
         log.trace(f"Started thread for responses: {thread}")
@@ -67,11 +195,31 @@ class RedisCommunicator:
 
     def sub_to_channel(self, channel: str, callback: Callable) -> Thread:
         """Subscribe to channel and return pubsub thread."""
+        if self.is_sharing_connections:
+            # The event listeners block until the events have been handled by the child areas,
+            # whose responses are received by the shared reader thread, therefore they are
+            # called in a worker thread of the communicator.
+            return shared_redis_connections.pubsub.subscribe(
+                self, {channel: self._call_in_listener_thread(callback)})
         self.pubsub.subscribe(**{channel: callback})
         thread = self.pubsub.run_in_thread(daemon=True)
         log.trace(f"Started thread for events: {thread}")
         return thread
 
+    def _call_in_listener_thread(self, callback: Callable) -> Callable:
+        if self._listener_executor is None:
+            self._listener_executor = ThreadPoolExecutor(max_workers=1)
+
+        def call(message):
+            try:
+                callback(message)
+            # pylint: disable=broad-except
+            except Exception:
+                log.exception("Error when handling message on channel %s.",
+                              message.get("channel"))
+
+        return lambda message: self._listener_executor.submit(call, message)
+
 
 class BlockingCommunicator(RedisCommunicator):
     """Communicator for sending blocking messages via redis pubsub."""
@@ -82,6 +230,8 @@ class BlockingCommunicator(RedisCommunicator):
 
     def sub_to_channel(self, channel: str, callback: Callable):
         """Subscribe to channel."""
+        # The responses are polled (and their callbacks called) in the thread that waits for
+        # them, therefore the pubsub is not shared. Its connection is taken from the shared pool.
         self.pubsub.subscribe(**{channel: callback})
 
     def poll_until_response_received(self, response_received_callback: Callable):
@@ -102,9 +252,16 @@ class ResettableCommunicator(RedisCommunicator):
     def __init__(self):
         super().__init__()
         self.thread = None
+        self._publish_buffer: List[Tuple[str, Union[str, bytes]]] = []
+        self._publish_buffer_depth = 0
+        self._publish_buffer_lock = Lock()
 
     def terminate_connection(self):
         """Terminate connection to redis pubsub."""
+        if self.is_sharing_connections:
+            shared_redis_connections.pubsub.unsubscribe(self)
+            self.thread = None
+            return
         try:
             self.thread.stop()
             self.thread.join(timeout=REDIS_THREAD_JOIN_TIMEOUT)
@@ -119,6 +276,11 @@ class ResettableCommunicator(RedisCommunicator):
         assert self.thread is None, \
             f"There has to be only one thread per ResettableCommunicator object, " \
             f" thread {self.thread} already exists."
+        if self.is_sharing_connections:
+            # the callbacks only hand the messages over to executors, so they are called in the
+            # shared reader thread
+            self.thread = shared_redis_connections.pubsub.subscribe(self, channel_callback_dict)
+            return
         self.pubsub.subscribe(**channel_callback_dict)
         thread = self.pubsub.run_in_thread(sleep_time=0.1, daemon=True)
         log.debug("Started ResettableCommunicator thread for multiple channels: %s", thread)
@@ -133,16 +295,75 @@ class ResettableCommunicator(RedisCommunicator):
 
     def publish_json(self, channel: str, data: Dict):
         """Publish json serializable dict to redis channel."""
+        if self._buffer_message(channel, data):
+            return
         self.publish(channel, json.dumps(data))
 
+    @contextmanager
+    def buffered_publishing(self):
+        """
+        Queue the messages that are published with publish_json inside the context and send all
+        of them at once when the (outermost) context is left, instead of one round-trip to redis
+        per message. Does nothing unless gsy_e.constants.BATCHED_REDIS_PUBLISHING is set.
+        """
+        if not gsy_e.constants.BATCHED_REDIS_PUBLISHING:
+            yield
+            return
+        with self._publish_buffer_lock:
+            self._publish_buffer_depth += 1
+        try:
+            yield
+        finally:
+            with self._publish_buffer_lock:
+                self._publish_buffer_depth -= 1
+                messages = []
+                if self._publish_buffer_depth == 0:
+                    messages, self._publish_buffer = self._publish_buffer, []
+            if messages:
+                self._send_messages(messages)
+
+    def _buffer_message(self, channel: str, data: Dict) -> bool:
+        # Queue the message if publishing is buffered, return whether it was queued
+        if not self._publish_buffer_depth:
+            return False
+        message = dumps_json(data)
+        with self._publish_buffer_lock:
+            if not self._publish_buffer_depth:
+                return False
+            self._publish_buffer.append((channel, message))
+        return True
+
+    def _send_messages(self, messages: List[Tuple[str, Union[str, bytes]]]) -> None:
+        """Publish the buffered messages in one pipeline."""
+        pipeline = self.redis_db.pipeline(transaction=False)
+        for channel, message in messages:
+            pipeline.publish(channel, message)
+        pipeline.execute()
+
 
 class RQResettableCommunicator(ResettableCommunicator):
     """Communicator for sending messages using redis queue."""
 
+    def __init__(self):
+        super().__init__()
+        self._queue = Queue(ConstSettings.GeneralSettings.SDK_COM_QUEUE_NAME,
+                            connection=self.redis_db)
+
     def publish_json(self, channel: str, data: Dict) -> None:
         """Publish json serializable dict to redis queue."""
-        queue = Queue(ConstSettings.GeneralSettings.SDK_COM_QUEUE_NAME, connection=self.redis_db)
-        queue.enqueue(channel, json.dumps(data))
+        if self._buffer_message(channel, data):
+            return
+        self._queue.enqueue(channel, json.dumps(data))
+
+    def _send_messages(self, messages: List[Tuple[str, Union[str, bytes]]]) -> None:
+        """Enqueue the buffered messages in one pipeline."""
+        with self.redis_db.pipeline() as pipeline:
+            self._queue.enqueue_many(
+                [Queue.prepare_data(channel, args=(
+                    message.decode() if isinstance(message, bytes) else message,))
+                 for channel, message in messages],
+                pipeline=pipeline)
+            pipeline.execute()
 
 
 class ExternalConnectionCommunicator(ResettableCommunicator):
@@ -194,12 +415,18 @@ class ExternalConnectionCommunicator(ResettableCommunicator):
             return
         self.aggregator.approve_batch_commands()
 
+    def buffered_publishing(self):
+        if not self.is_enabled:
+            return nullcontext()
+        return super().buffered_publishing()
+
     def publish_aggregator_commands_responses_events(self):
         """Wrapper for publishing aggregator command responses and events."""
         if not self.is_enabled:
             return
-        self.aggregator.publish_all_commands_responses(self)
-        self.aggregator.publish_all_events(self)
+        with self.buffered_publishing():
+            self.aggregator.publish_all_commands_responses(self)
+            self.aggregator.publish_all_events(self)
 
 
 class RQExternalConnectionCommunicator(ExternalConnectionCommunicator, RQResettableCommunicator):
@@ -0,0 +1,217 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import csv
+import os
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from logging import getLogger
+from queue import Queue
+from threading import Thread
+from typing import Dict, List, Optional, Sequence
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+log = getLogger(__name__)
+
+# Maximum number of csv files that the CSVResultsSink keeps open at the same time
+MAX_OPEN_FILES = 128
+# Number of rows of a table that the ParquetResultsSink writes per row group (parquet file)
+ROW_GROUP_SIZE = 10000
+
+
+class ResultsSink(ABC):
+    """
+    Writes the rows of the exported tables (one csv file per table) on a background thread, so
+    that the simulation does not wait for the disk.
+
+    write_rows only queues the rows, the background thread passes them to the writer of the table,
+    which is kept open between the calls. close() waits until all rows have been written.
+    """
+
+    def __init__(self):
+        self._queue = Queue()
+        self._is_closed = False
+        self._thread = Thread(target=self._run, name="ResultsSink", daemon=True)
+        self._thread.start()
+
+    def write_rows(self, file_path: str, labels: Sequence, rows: List[Sequence],
+                   is_first: bool) -> None:
+        """Queue the rows of the table of the csv file (and its labels, if is_first is set)."""
+        self._queue.put((file_path, labels, rows, is_first))
+
+    def flush(self) -> None:
+        """Wait until all queued rows have been passed to the writers."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Write all queued rows and close the writers."""
+        if self._is_closed:
+            return
+        self._is_closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    self._close_writers()
+                    return
+                self._write_rows(*item)
+            # pylint: disable=broad-except
+            except Exception:
+                log.exception("Could not export results to %s.", item[0] if item else "files")
+            finally:
+                self._queue.task_done()
+
+    @abstractmethod
+    def _write_rows(self, file_path: str, labels: Sequence, rows: List[Sequence],
+                    is_first: bool) -> None:
+        """Pass the rows to the writer of the table (called in the background thread)."""
+
+    @abstractmethod
+    def _close_writers(self) -> None:
+        """Close all writers (called in the background thread)."""
+
+
+class CSVResultsSink(ResultsSink):
+    """Appends the rows to the csv files, keeping the most recently used files open."""
+
+    def __init__(self):
+        self._files: Dict[str, tuple] = OrderedDict()
+        super().__init__()
+
+    def _get_writer(self, file_path: str):
+        if file_path in self._files:
+            self._files.move_to_end(file_path)
+            return self._files[file_path][1]
+        if len(self._files) >= MAX_OPEN_FILES:
+            _, (oldest_file, _) = self._files.popitem(last=False)
+            oldest_file.close()
+        # pylint: disable=consider-using-with
+        csv_file = open(file_path, "a", encoding="utf-8")
+        writer = csv.writer(csv_file)
+        self._files[file_path] = (csv_file, writer)
+        return writer
+
+    def _write_rows(self, file_path: str, labels: Sequence, rows: List[Sequence],
+                    is_first: bool) -> None:
+        writer = self._get_writer(file_path)
+        if is_first:
+            writer.writerow(labels)
+        writer.writerows(rows)
+
+    def _close_writers(self) -> None:
+        for csv_file, _ in self._files.values():
+            csv_file.close()
+        self._files.clear()
+
+
+class _ParquetTable:
+    """Rows of a table that have not been written yet, and the row groups that have been."""
+
+    def __init__(self, labels: Sequence):
+        self.labels = [str(label) for label in labels]
+        self.rows = []
+        self.number_of_row_groups = 0
+        self.has_labels_row = False
+
+
+class ParquetResultsSink(ResultsSink):
+    """
+    Buffers the rows of each table and writes them in row groups to parquet files, one directory
+    of parquet files per table (<table>.parquet/part-<n>.parquet next to the csv file of the
+    table). The values are stored as strings, exactly as they would be written to the csv file.
+    When the sink is closed, the csv files are exported from the parquet files.
+    """
+
+    def __init__(self, row_group_size: int = ROW_GROUP_SIZE):
+        self._row_group_size = row_group_size
+        self._tables: Dict[str, _ParquetTable] = {}
+        super().__init__()
+
+    @staticmethod
+    def _dataset_path(file_path: str) -> str:
+        return os.path.splitext(file_path)[0] + ".parquet"
+
+    def _write_rows(self, file_path: str, labels: Sequence, rows: List[Sequence],
+                    is_first: bool) -> None:
+        table = self._tables.get(file_path)
+        if table is None:
+            table = self._tables[file_path] = _ParquetTable(labels)
+        table.has_labels_row = table.has_labels_row or is_first
+        table.rows.extend(rows)
+        if len(table.rows) >= self._row_group_size:
+            self._write_row_group(file_path, table)
+
+    def _write_row_group(self, file_path: str, table: _ParquetTable) -> None:
+        dataset_path = self._dataset_path(file_path)
+        os.makedirs(dataset_path, exist_ok=True)
+        # rows that are shorter than the labels are padded with empty values, rows that are longer
+        # get additional unnamed columns
+        number_of_columns = max([len(table.labels)] + [len(row) for row in table.rows])
+        names = table.labels + [f"column_{index}"
+                                for index in range(len(table.labels), number_of_columns)]
+        columns = [[None] * len(table.rows) for _ in names]
+        for row_index, row in enumerate(table.rows):
+            for column_index, value in enumerate(row):
+                columns[column_index][row_index] = None if value is None else str(value)
+        pyarrow.parquet.write_table(
+            pyarrow.Table.from_arrays(
+                [pyarrow.array(column, type=pyarrow.string()) for column in columns],
+                names=names),
+            os.path.join(dataset_path, f"part-{table.number_of_row_groups:05d}.parquet"))
+        table.number_of_row_groups += 1
+        table.rows = []
+
+    def _export_csv_file(self, file_path: str, table: _ParquetTable) -> None:
+        with open(file_path, "a", encoding="utf-8") as csv_file:
+            writer = csv.writer(csv_file)
+            if table.has_labels_row:
+                writer.writerow(table.labels)
+            for row_group in range(table.number_of_row_groups):
+                row_group_table = pyarrow.parquet.read_table(os.path.join(
+                    self._dataset_path(file_path), f"part-{row_group:05d}.parquet"))
+                # the labels are not unique in all tables, so the columns are read by position
+                writer.writerows(zip(*[column.to_pylist() for column in row_group_table.columns]))
+
+    def _close_writers(self) -> None:
+        for file_path, table in self._tables.items():
+            if table.rows:
+                self._write_row_group(file_path, table)
+            self._export_csv_file(file_path, table)
+        self._tables.clear()
+
+
+def create_results_sink(sink_type: Optional[str]) -> Optional[ResultsSink]:
+    """Return the results sink of the type ("csv" or "parquet"), None if the type is None."""
+    if sink_type is None:
+        return None
+    if sink_type == "parquet":
+        if pyarrow is not None:
+            return ParquetResultsSink()
+        log.warning("pyarrow is not installed, the results are exported with the csv sink.")
+        return CSVResultsSink()
+    if sink_type == "csv":
+        return CSVResultsSink()
+    raise ValueError(f"Unknown results sink type {sink_type}.")
@@ -22,6 +22,7 @@ import sys
 from importlib import import_module
 from logging import getLogger
 from time import sleep, time, mktime
+from typing import List
 from numpy import random
 from pendulum import now, duration, DateTime
 import psutil
@@ -40,6 +41,7 @@ from gsy_e.gsy_e_core.myco_singleton import bid_offer_matcher
 from gsy_e.gsy_e_core.redis_connections.redis_communication import RedisSimulationCommunication
 from gsy_e.gsy_e_core.sim_results.endpoint_buffer import SimulationEndpointBuffer
 from gsy_e.gsy_e_core.sim_results.file_export_endpoints import FileExportEndpoints
+from gsy_e.gsy_e_core.trace_profiler import trace_profiler
 from gsy_e.gsy_e_core.util import (
     NonBlockingConsole, validate_const_settings_for_simulation,
     get_market_slot_time_str)
@@ -79,7 +81,7 @@ class Simulation:
                  paused: bool = False, pause_after: duration = None, repl: bool = False,
                  no_export: bool = False, export_path: str = None,
                  export_subdir: str = None, redis_job_id=None, enable_bc=False,
-                 slot_length_realtime=None, incremental: bool = False):
+                 slot_length_realtime=None, incremental: bool = False, trace_path: str = None):
         self.paused = False
         self.pause_after = None
         self.initial_params = dict(
@@ -105,6 +107,7 @@ class Simulation:
         self.setup_module_name = setup_module_name
         self.is_stopped = False
         self._is_incremental = incremental
+        self._trace_path = trace_path
         self.live_events = LiveEvents(self.simulation_config)
         self.kafka_connection = kafka_connection_factory()
         self.redis_connection = RedisSimulationCommunication(self, redis_job_id, self.live_events)
@@ -202,6 +205,8 @@ class Simulation:
         Reset simulation to initial values and restart the run.
         """
         log.info("%s Simulation reset requested %s", "=" * 15, "=" * 15)
+        if self.export_results_on_finish:
+            self.export.close_results_sink()
         self._init(**self.initial_params)
         self.run()
         raise SimulationResetException
@@ -220,23 +225,32 @@ class Simulation:
         """Run the simulation."""
         self.sim_status = "running"
         self.is_stopped = False
-        while True:
-            if initial_slot == 0:
-                self.run_start = now(tz=TIME_ZONE)
-                self.paused_time = 0
-
-            tick_resume = 0
-            try:
-                if self._started_from_cli:
-                    self._run_cli_execute_cycle(initial_slot, tick_resume)
+        if self._trace_path:
+            trace_profiler.start()
+        try:
+            while True:
+                if initial_slot == 0:
+                    self.run_start = now(tz=TIME_ZONE)
+                    self.paused_time = 0
+
+                tick_resume = 0
+                try:
+                    if self._started_from_cli:
+                        self._run_cli_execute_cycle(initial_slot, tick_resume)
+                    else:
+                        self._execute_simulation(initial_slot, tick_resume)
+                except KeyboardInterrupt:
+                    break
+                except SimulationResetException:
+                    break
                 else:
-                    self._execute_simulation(initial_slot, tick_resume)
-            except KeyboardInterrupt:
-                break
-            except SimulationResetException:
-                break
-            else:
-                break
+                    break
+        finally:
+            if self.export_results_on_finish:
+                self.export.close_results_sink()
+            if self._trace_path:
+                trace_profiler.stop()
+                trace_profiler.save(self._trace_path)
 
     def _run_cli_execute_cycle(self, slot_resume, tick_resume):
         with NonBlockingConsole() as console:
@@ -352,30 +366,41 @@ class Simulation:
                         self.progress_info.percentage_completed, self.progress_info.elapsed_time,
                         self.progress_info.eta)
 
-            self.area.cycle_markets()
+            with trace_profiler.phase("cycle_markets"):
+                self.area.cycle_markets()
 
             global_objects.profiles_handler.update_time_and_buffer_profiles(
                 self._get_current_market_time_slot(slot_no))
 
             if self.simulation_config.external_connection_enabled:
-                global_objects.external_global_stats.update(market_cycle=True)
-                self.area.publish_market_cycle_to_external_clients()
+                with trace_profiler.phase("publish_market_cycle"):
+                    global_objects.external_global_stats.update(market_cycle=True)
+                    self.area.publish_market_cycle_to_external_clients()
 
-            bid_offer_matcher.event_market_cycle(
-                slot_completion="0%",
-                market_slot=self.progress_info.current_slot_str)
+            with trace_profiler.phase("bid_offer_matcher.event_market_cycle"):
+                bid_offer_matcher.event_market_cycle(
+                    slot_completion="0%",
+                    market_slot=self.progress_info.current_slot_str)
 
-            self._update_and_send_results()
-            self.live_events.handle_all_events(self.area)
+            with trace_profiler.phase("update_results"):
+                self._update_and_send_results()
+            ticks_to_dispatch = self._get_ticks_to_dispatch(tick_resume)
+            with trace_profiler.phase("handle_live_events"):
+                self.live_events.handle_all_events(self.area)
 
-            gc.collect()
+            with trace_profiler.phase("gc_collect"):
+                gc.collect()
             process = psutil.Process(os.getpid())
             mbs_used = process.memory_info().rss / 1000000.0
             log.debug("Used %s MBs.", mbs_used)
 
             self.tick_time_counter = time()
 
-            for tick_no in range(tick_resume, config.ticks_per_slot):
+            next_tick_no = tick_resume
+            for tick_no in ticks_to_dispatch:
+                if tick_no > next_tick_no:
+                    self.area.skip_ticks(tick_no - next_tick_no)
+                next_tick_no = tick_no + 1
                 self._handle_paused(console)
 
                 # reset tick_resume after possible resume
@@ -383,23 +408,31 @@ class Simulation:
                 log.trace("Tick %s of %s in slot %s (%.1f%)", tick_no + 1, config.ticks_per_slot,
                           slot_no + 1, (tick_no + 1) / config.ticks_per_slot * 100)
 
-                self.simulation_config.external_redis_communicator.\
-                    approve_aggregator_commands()
-
-                current_tick_in_slot = tick_no % config.ticks_per_slot
-                if (self.simulation_config.external_connection_enabled and
-                        global_objects.external_global_stats.is_it_time_for_external_tick(
-                            current_tick_in_slot)):
-                    global_objects.external_global_stats.update()
-
-                self.area.tick_and_dispatch()
-                self.area.execute_actions_after_tick_event()
-                bid_offer_matcher.event_tick(
-                    current_tick_in_slot=current_tick_in_slot,
-                    slot_completion=f"{int((tick_no / config.ticks_per_slot) * 100)}%",
-                    market_slot=self.progress_info.next_slot_str)
-                self.simulation_config.external_redis_communicator.\
-                    publish_aggregator_commands_responses_events()
+                # the messages to the external clients are published at once at the end of the tick
+                with self.simulation_config.external_redis_communicator.buffered_publishing():
+                    with trace_profiler.phase("approve_aggregator_commands"):
+                        self.simulation_config.external_redis_communicator.\
+                            approve_aggregator_commands()
+
+                    current_tick_in_slot = tick_no % config.ticks_per_slot
+                    if (self.simulation_config.external_connection_enabled and
+                            global_objects.external_global_stats.is_it_time_for_external_tick(
+                                current_tick_in_slot)):
+                        with trace_profiler.phase("external_global_stats.update"):
+                            global_objects.external_global_stats.update()
+
+                    with trace_profiler.phase("tick_and_dispatch"):
+                        self.area.tick_and_dispatch()
+                    with trace_profiler.phase("execute_actions_after_tick_event"):
+                        self.area.execute_actions_after_tick_event()
+                    with trace_profiler.phase("bid_offer_matcher.event_tick"):
+                        bid_offer_matcher.event_tick(
+                            current_tick_in_slot=current_tick_in_slot,
+                            slot_completion=f"{int((tick_no / config.ticks_per_slot) * 100)}%",
+                            market_slot=self.progress_info.next_slot_str)
+                    with trace_profiler.phase("publish_aggregator_commands_responses_events"):
+                        self.simulation_config.external_redis_communicator.\
+                            publish_aggregator_commands_responses_events()
 
                 self._handle_slowdown_and_realtime(tick_no)
                 self.tick_time_counter = time()
@@ -412,12 +445,44 @@ class Simulation:
                     return
 
             if self.export_results_on_finish:
-                self.export.data_to_csv(self.area, slot_no == 0)
+                with trace_profiler.phase("export.data_to_csv"):
+                    self.export.data_to_csv(self.area, slot_no == 0)
 
             if self._is_incremental:
                 self.paused = True
         self._simulation_finish_actions(slot_count)
 
+    def _get_ticks_to_dispatch(self, tick_resume: int) -> List[int]:
+        """Return the numbers of the ticks of the upcoming slot that have to be dispatched.
+
+        In fast-forward mode (see gsy_e.constants.FAST_FORWARD_TICKS_PER_SLOT) only an evenly
+        spread subset of the ticks is dispatched, always including the first and the last tick of
+        the slot. The slot runs at full tick resolution if an external connection is enabled, if
+        live events are pending or if the simulation runs in (slowed down) real time.
+
+        The template strategies catch up with the skipped price updates at the start of each
+        dispatched tick, hence the rates that they post on a dispatched tick are the rates of
+        the full resolution run. Orders are only matched on the dispatched ticks though: an order
+        that is traded on a skipped tick is traded on the next dispatched tick instead. For bids
+        and offers whose rates converge towards each other, the energy traded per slot is
+        therefore the same, and the rate of each trade differs by at most
+        ceil(gap * tick_length / update_interval) rate changes per update of the traded orders,
+        where gap is the largest number of ticks between two dispatched ticks,
+        ceil((ticks_per_slot - 1) / (FAST_FORWARD_TICKS_PER_SLOT - 1)). Buyers in one-sided
+        markets read their rate limit before their update counter is incremented, so their limit
+        can lag by one more rate change per update.
+        """
+        ticks_per_slot = self.simulation_config.ticks_per_slot
+        if (gsy_e.constants.FAST_FORWARD_TICKS_PER_SLOT is None or
+                self.simulation_config.external_connection_enabled or
+                self.live_events.event_buffer or
+                gsy_e.constants.RUN_IN_REALTIME or self.slot_length_realtime):
+            return list(range(tick_resume, ticks_per_slot))
+        number_of_ticks = min(max(gsy_e.constants.FAST_FORWARD_TICKS_PER_SLOT, 2), ticks_per_slot)
+        ticks = sorted({round(index * (ticks_per_slot - 1) / (number_of_ticks - 1))
+                        for index in range(number_of_ticks)})
+        return [tick_no for tick_no in ticks if tick_no >= tick_resume]
+
     def _simulation_finish_actions(self, slot_count):
         self.sim_status = "finished"
         self.deactivate_areas(self.area)
@@ -438,6 +503,7 @@ class Simulation:
         if self.export_results_on_finish:
             log.info("Exporting simulation data.")
             self.export.data_to_csv(self.area, False)
+            self.export.close_results_sink()
             self.export.area_tree_summary_to_json(self.endpoint_buffer.area_result_dict)
             self.export.export(power_flow=self.power_flow if GlobalConfig.POWER_FLOW else None)
 
@@ -0,0 +1,217 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from datetime import datetime, timedelta
+from math import ceil
+from numbers import Integral, Real
+from typing import Iterator, Mapping, MutableMapping, Optional
+
+import numpy as np
+from gsy_framework.constants_limits import GlobalConfig
+from pendulum import DateTime
+
+INITIAL_CAPACITY = 16
+
+
+class TimeSlotSeries(MutableMapping):
+    """
+    Mapping of time slots to numeric values, backed by a NumPy ring buffer.
+
+    The time slots are stored as integer slot offsets from the simulation start date, so neither
+    the DateTime keys nor a dict entry per time slot are kept in memory. The ring buffer covers
+    the window between the oldest and the newest time slot, so get / set are O(1) and deleting
+    all time slots before a given one only moves the start of the window (see delete_before).
+    DateTime keys are only recreated when the series is iterated, e.g. when exporting the state.
+
+    Keys that are not on the grid of time slots and values that are not numbers are kept in a
+    plain dict, therefore the series behaves exactly like the dict it replaces.
+    """
+
+    def __init__(self, dtype=float, capacity: int = INITIAL_CAPACITY):
+        self._dtype = np.dtype(dtype)
+        self._value_type = Integral if self._dtype.kind in "iu" else Real
+        self._values = np.zeros(capacity, dtype=self._dtype)
+        self._is_set = np.zeros(capacity, dtype=bool)
+        # the buffer holds the slots first..end-1 (at position slot % capacity)
+        self._first = 0
+        self._end = 0
+        self._size = 0
+        self._origin = None
+        self._origin_timestamp = None
+        self._slot_seconds = None
+        self._other = {}
+
+    def _set_origin(self, time_slot: datetime) -> None:
+        origin = GlobalConfig.start_date
+        if not isinstance(origin, datetime) or (origin.tzinfo is None) != (
+                time_slot.tzinfo is None):
+            origin = time_slot
+        self._origin = origin
+        self._origin_timestamp = origin.timestamp()
+        self._slot_seconds = GlobalConfig.slot_length.total_seconds()
+
+    def _slot(self, time_slot, create: bool = False) -> Optional[int]:
+        # slot offset of the time slot, None if the time slot is not on the grid of the series
+        if not isinstance(time_slot, datetime):
+            return None
+        if self._origin is None:
+            if not create:
+                return None
+            self._set_origin(time_slot)
+        if (time_slot.tzinfo is None) != (self._origin.tzinfo is None):
+            return None
+        slot, remainder = divmod(time_slot.timestamp() - self._origin_timestamp,
+                                 self._slot_seconds)
+        if remainder:
+            return None
+        return int(slot)
+
+    def _time_slot(self, slot: int) -> DateTime:
+        return self._origin + timedelta(seconds=slot * self._slot_seconds)
+
+    def _position(self, slot: Optional[int]) -> Optional[int]:
+        # position of the slot in the buffer, None if no value is set for the slot
+        if slot is None or not self._first <= slot < self._end:
+            return None
+        position = slot % len(self._values)
+        return position if self._is_set[position] else None
+
+    def _reserve(self, number_of_slots: int) -> None:
+        # grow the buffer to hold the given number of consecutive slots
+        capacity = len(self._values)
+        if number_of_slots <= capacity:
+            return
+        new_capacity = 2 * capacity
+        while number_of_slots > new_capacity:
+            new_capacity *= 2
+        slots = np.arange(self._first, self._end)
+        values = np.zeros(new_capacity, dtype=self._dtype)
+        is_set = np.zeros(new_capacity, dtype=bool)
+        values[slots % new_capacity] = self._values[slots % capacity]
+        is_set[slots % new_capacity] = self._is_set[slots % capacity]
+        self._values, self._is_set = values, is_set
+
+    def _set_slot(self, slot: int, value) -> None:
+        if self._size == 0:
+            self._first, self._end = slot, slot + 1
+        elif slot < self._first:
+            self._reserve(self._end - slot)
+            self._first = slot
+        elif slot >= self._end:
+            self._reserve(slot + 1 - self._first)
+            self._end = slot + 1
+        position = slot % len(self._values)
+        if not self._is_set[position]:
+            self._is_set[position] = True
+            self._size += 1
+        self._values[position] = value
+
+    def _set_slots(self):
+        # the set slots, in the order of the time slots
+        slots = np.arange(self._first, self._end)
+        return slots[self._is_set[slots % len(self._values)]]
+
+    def __getitem__(self, time_slot):
+        position = self._position(self._slot(time_slot))
+        if position is not None:
+            return self._values[position].item()
+        return self._other[time_slot]
+
+    def __setitem__(self, time_slot, value) -> None:
+        slot = None
+        if isinstance(value, self._value_type) and not isinstance(value, bool):
+            slot = self._slot(time_slot, create=True)
+        if slot is None:
+            if self._size:
+                self._delete_position(self._position(self._slot(time_slot)))
+            self._other[time_slot] = value
+        else:
+            if self._other:
+                self._other.pop(time_slot, None)
+            self._set_slot(slot, value)
+
+    def _delete_position(self, position: Optional[int]) -> bool:
+        if position is None:
+            return False
+        self._is_set[position] = False
+        self._size -= 1
+        return True
+
+    def __delitem__(self, time_slot) -> None:
+        if not self._delete_position(self._position(self._slot(time_slot))):
+            del self._other[time_slot]
+
+    def __contains__(self, time_slot) -> bool:
+        return (self._position(self._slot(time_slot)) is not None
+                or time_slot in self._other)
+
+    def __iter__(self) -> Iterator[DateTime]:
+        for slot in self._set_slots().tolist():
+            yield self._time_slot(slot)
+        yield from list(self._other)
+
+    def __len__(self) -> int:
+        return self._size + len(self._other)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({dict(self.items())})"
+
+    def _first_slot_from(self, time_slot: DateTime) -> int:
+        # first slot that is not before the time slot
+        return ceil((time_slot.timestamp() - self._origin_timestamp) / self._slot_seconds)
+
+    def delete_before(self, time_slot: DateTime) -> None:
+        """Delete the values of all time slots before the given time slot."""
+        if self._other:
+            for key in [key for key in self._other if key < time_slot]:
+                del self._other[key]
+        if self._size == 0:
+            return
+        first = self._first_slot_from(time_slot)
+        if first <= self._first:
+            return
+        positions = np.arange(self._first, min(first, self._end)) % len(self._values)
+        self._size -= int(np.count_nonzero(self._is_set[positions]))
+        self._is_set[positions] = False
+        self._first, self._end = first, max(first, self._end)
+
+    def sum_from(self, time_slot: DateTime):
+        """Return the sum of the values of the given and all following time slots."""
+        total = 0
+        if self._size:
+            slots = self._set_slots()
+            slots = slots[slots >= self._first_slot_from(time_slot)]
+            total = sum(self._values[slots % len(self._values)].tolist(), total)
+        if self._other:
+            total = sum((value for key, value in self._other.items() if key >= time_slot), total)
+        return total
+
+
+def delete_time_slots_before(series: MutableMapping, time_slot: DateTime) -> None:
+    """Delete the values of all time slots before the given time slot from a series or dict."""
+    if isinstance(series, TimeSlotSeries):
+        series.delete_before(time_slot)
+        return
+    for key in [key for key in series if key < time_slot]:
+        series.pop(key, None)
+
+
+def sum_time_slots_from(series: Mapping, time_slot: DateTime):
+    """Return the sum of the values of the given and all following time slots of a series."""
+    if isinstance(series, TimeSlotSeries):
+        return series.sum_from(time_slot)
+    return sum(value for key, value in series.items() if key >= time_slot)
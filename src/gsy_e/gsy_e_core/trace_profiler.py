@@ -0,0 +1,156 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import gzip
+import json
+import os
+from collections import defaultdict
+from logging import getLogger
+from time import perf_counter_ns
+from typing import Dict, List, Tuple
+
+log = getLogger(__name__)
+
+
+class _Phase:
+    """Context manager that records the wall time of a simulation phase."""
+
+    __slots__ = ("_profiler", "_name", "_start_ns")
+
+    def __init__(self, profiler: "TraceProfiler", name: str):
+        self._profiler = profiler
+        self._name = name
+        self._start_ns = 0
+
+    def __enter__(self):
+        self._start_ns = perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._profiler.add_phase(self._name, self._start_ns, perf_counter_ns())
+        return False
+
+
+class _NoPhase:
+    """Context manager that is used instead of _Phase while the profiler is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NO_PHASE = _NoPhase()
+
+
+class TraceProfiler:
+    """
+    Records the wall time of the phases of the simulation (e.g. dispatching the TICK event or
+    matching) and the cost of the event handlers, per area, strategy class and event type.
+
+    The phases are kept as Chrome trace events ("Complete" events, which can be opened with
+    chrome://tracing or Perfetto), the event handlers are aggregated to the number of events and
+    the total wall time. The handler times are inclusive, i.e. they contain the handlers of the
+    events that are dispatched while handling an event.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._start_ns = 0
+        self._phases: List[Tuple[str, int, int]] = []
+        # (area name, listener class name, event name) -> [number of events, total time in ns]
+        self._event_handlers: Dict[Tuple[str, str, str], List[int]] = defaultdict(
+            lambda: [0, 0])
+
+    def start(self) -> None:
+        """Start recording, drop everything that was recorded before."""
+        self._phases = []
+        self._event_handlers.clear()
+        self._start_ns = perf_counter_ns()
+        self.enabled = True
+
+    def stop(self) -> None:
+        """Stop recording."""
+        self.enabled = False
+
+    def phase(self, name: str):
+        """Return a context manager that records the wall time of the phase with the name."""
+        if not self.enabled:
+            return _NO_PHASE
+        return _Phase(self, name)
+
+    def add_phase(self, name: str, start_ns: int, end_ns: int) -> None:
+        """Record a phase that started and ended at the given perf_counter_ns values."""
+        self._phases.append((name, start_ns, end_ns))
+
+    def add_event_handler(self, area_name: str, listener_name: str, event_name: str,
+                          duration_ns: int) -> None:
+        """Record the wall time of an event handler."""
+        stats = self._event_handlers[(area_name, listener_name, event_name)]
+        stats[0] += 1
+        stats[1] += duration_ns
+
+    @property
+    def number_of_dispatched_events(self) -> int:
+        """Return the number of events that were handled since the recording was started."""
+        return sum(number_of_events for number_of_events, _ in self._event_handlers.values())
+
+    def get_phase_summary(self) -> Dict[str, Dict]:
+        """Return the number of calls and the total wall time (in seconds) of each phase."""
+        summary = {}
+        for name, start_ns, end_ns in self._phases:
+            stats = summary.setdefault(name, {"count": 0, "total_s": 0.})
+            stats["count"] += 1
+            stats["total_s"] += (end_ns - start_ns) / 1e9
+        return summary
+
+    def get_event_handler_summary(self) -> List[Dict]:
+        """Return the event handler statistics, ordered by decreasing total wall time."""
+        return [
+            {"area": area_name, "listener": listener_name, "event": event_name,
+             "count": number_of_events, "total_s": duration_ns / 1e9}
+            for (area_name, listener_name, event_name), (number_of_events, duration_ns) in
+            sorted(self._event_handlers.items(), key=lambda item: -item[1][1])]
+
+    def to_chrome_trace(self) -> Dict:
+        """Return the recorded data in the Chrome trace event format."""
+        pid = os.getpid()
+        return {
+            "traceEvents": [
+                {"name": name, "cat": "simulation", "ph": "X", "pid": pid, "tid": 0,
+                 "ts": (start_ns - self._start_ns) / 1000, "dur": (end_ns - start_ns) / 1000}
+                for name, start_ns, end_ns in self._phases],
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "phases": self.get_phase_summary(),
+                "event_handlers": self.get_event_handler_summary(),
+                "number_of_dispatched_events": self.number_of_dispatched_events,
+            }
+        }
+
+    def save(self, path: str) -> None:
+        """Write the Chrome trace to the path, gzip compressed if the path ends with .gz."""
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "wt") as trace_file:
+            json.dump(self.to_chrome_trace(), trace_file, separators=(",", ":"))
+        log.info("Trace of %s events written to %s.", self.number_of_dispatched_events, path)
+
+
+trace_profiler = TraceProfiler()
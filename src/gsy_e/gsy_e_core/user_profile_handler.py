@@ -16,10 +16,13 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 import os
+import pathlib
 import uuid
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict
+from typing import Dict, Mapping
 
+import numpy as np
 import pytz
 from gsy_framework.constants_limits import GlobalConfig
 from gsy_framework.read_user_profile import read_arbitrary_profile, InputProfileTypes
@@ -227,6 +230,96 @@ class ProfileDBConnectionHandler:
         return self._user_profiles[uuid.UUID(profile_uuid)]
 
 
+class ProfileView(Mapping):
+    """
+    Read-only view of a profile that is stored as an array of values, ordered by time slot.
+
+    The time slots, their positions and the values are shared by all views of the same profile,
+    each view only keeps its own scaling factor.
+    """
+
+    def __init__(self, time_slots: tuple, slot_indices: Dict[DateTime, int],
+                 values: np.ndarray, scaling: float = 1.0):
+        self._time_slots = time_slots
+        self._slot_indices = slot_indices
+        self._values = values
+        self._scaling = scaling
+
+    @classmethod
+    def from_profile(cls, profile: Dict[DateTime, float]) -> "ProfileView":
+        """Create a view of the values of a profile dict."""
+        time_slots = tuple(profile.keys())
+        values = np.array(list(profile.values()), dtype=float)
+        values.flags.writeable = False
+        return cls(time_slots, {time_slot: index for index, time_slot in enumerate(time_slots)},
+                   values)
+
+    def scaled(self, scaling: float) -> "ProfileView":
+        """Return a view of the same values, multiplied by the scaling factor."""
+        return ProfileView(self._time_slots, self._slot_indices, self._values,
+                           self._scaling * scaling)
+
+    def __getitem__(self, time_slot: DateTime) -> float:
+        return float(self._values[self._slot_indices[time_slot]] * self._scaling)
+
+    def __contains__(self, time_slot) -> bool:
+        return time_slot in self._slot_indices
+
+    def __iter__(self):
+        return iter(self._time_slots)
+
+    def __len__(self) -> int:
+        return len(self._time_slots)
+
+
+class SharedProfilesCache:
+    """
+    Process-wide cache of the profiles that are read from files.
+
+    Each file is parsed once per profile type, slot length and start date, all assets that use
+    the file get a (scaled) ProfileView of the same values instead of their own profile dict.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self._max_entries = max_entries
+        self._profiles = OrderedDict()
+
+    @staticmethod
+    def is_cacheable(profile) -> bool:
+        """Check whether the profile input is a path to a profile file."""
+        return isinstance(profile, (str, pathlib.Path)) and os.path.isfile(profile)
+
+    def get_profile(self, profile_type: InputProfileTypes, profile_path,
+                    current_timestamp: DateTime = None, scaling: float = 1.0) -> ProfileView:
+        """
+        Return a view of the profile that is read from the file.
+
+        Args:
+            profile_type (InputProfileTypes): Type of the profile
+            profile_path (str, pathlib.Path): Path of the profile file
+            current_timestamp (DateTime): optional, time stamp the profile is rotated to
+            scaling (float): factor that the values of the profile are multiplied by
+
+        Returns: Read-only view of the profile
+        """
+        key = (os.path.realpath(profile_path), profile_type, GlobalConfig.slot_length,
+               current_timestamp or GlobalConfig.start_date, GlobalConfig.sim_duration)
+        profile = self._profiles.get(key)
+        if profile is None:
+            profile = ProfileView.from_profile(read_arbitrary_profile(
+                profile_type, profile_path, current_timestamp=current_timestamp))
+            self._profiles[key] = profile
+            if len(self._profiles) > self._max_entries:
+                self._profiles.popitem(last=False)
+        else:
+            self._profiles.move_to_end(key)
+        return profile.scaled(scaling) if scaling != 1 else profile
+
+    def clear(self):
+        """Remove all profiles from the cache."""
+        self._profiles.clear()
+
+
 class ProfilesHandler:
     """
     Handles profiles rotation of all profiles (stored in DB and in memory)
@@ -236,6 +329,7 @@ class ProfilesHandler:
         self._current_timestamp = GlobalConfig.start_date
         self._start_date = GlobalConfig.start_date
         self._duration = GlobalConfig.sim_duration
+        self.shared_profiles = SharedProfilesCache()
 
     def activate(self):
         """Connect to DB, update current timestamp and get the first chunk of data from the DB"""
@@ -271,13 +365,19 @@ class ProfilesHandler:
             return read_arbitrary_profile(profile_type,
                                           db_profile,
                                           current_timestamp=self.current_timestamp)
+        return self._read_profile(profile_type, profile)
+
+    def _read_profile(self, profile_type, profile):
+        if gsy_e.constants.SHARED_PROFILE_CACHE and self.shared_profiles.is_cacheable(profile):
+            return self.shared_profiles.get_profile(
+                profile_type, profile, current_timestamp=self.current_timestamp)
         return read_arbitrary_profile(profile_type,
                                       profile,
                                       current_timestamp=self.current_timestamp)
 
     def rotate_profile(self, profile_type: InputProfileTypes,
                        profile,
-                       profile_uuid: str = None) -> Dict[DateTime, float]:
+                       profile_uuid: str = None) -> Mapping[DateTime, float]:
         """ Reads a new chunk of profile if the buffer does not contain the current time stamp
         Profile chunks are either generated from single values, input daily profiles or profiles
         that are read from the DB
@@ -288,12 +388,12 @@ class ProfilesHandler:
                                                (same input as for read_arbitrary_profile)
             profile_uuid (str): optional, if set the profiles is read from the DB
 
-        Returns: Profile chunk as dictionary
+        Returns: Profile chunk as dictionary (or as a read-only ProfileView of the shared
+                 profiles cache if the profile is read from a file)
 
         """
         if self.should_create_profile(profile):
-            return read_arbitrary_profile(profile_type,
-                                          profile, current_timestamp=self.current_timestamp)
+            return self._read_profile(profile_type, profile)
         if self.time_to_rotate_profile(profile):
             return self._read_new_datapoints_from_buffer_or_rotate_profile(
                 profile, profile_uuid, profile_type)
@@ -305,8 +405,8 @@ class ProfilesHandler:
         return profile is None or self.current_timestamp not in profile.keys()
 
     def should_create_profile(self, profile):
-        """ Checks if profile is already a populated Dict[Datetime, float] dict
+        """ Checks if profile is already a populated Dict[Datetime, float] dict (or ProfileView)
          or if it is an input value (str, int, dict)
         """
         return (profile is not None and
-                (not isinstance(profile, dict) or self.current_timestamp not in profile.keys()))
+                (not isinstance(profile, Mapping) or self.current_timestamp not in profile.keys()))
@@ -25,7 +25,7 @@ import termios
 import tty
 from functools import wraps
 from logging import LoggerAdapter, getLogger, getLoggerClass, addLevelName, setLoggerClass, NOTSET
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, List, Sequence, TypeVar
 
 from click.types import ParamType
 from gsy_framework.constants_limits import ConstSettings, GlobalConfig, RangeLimit
@@ -34,6 +34,7 @@ from gsy_framework.exceptions import GSyException
 from gsy_framework.utils import (
     area_name_from_area_or_ma_name, iterate_over_all_modules, str_to_pendulum_datetime,
     format_datetime, find_object_of_same_weekday_and_time)
+from numpy.random import permutation
 from pendulum import duration, from_format, instance, DateTime
 from rex import rex
 
@@ -55,6 +56,8 @@ IMPORT_RE = rex("/^import +[\"'](?P<contract>[^\"']+.sol)[\"'];$/")
 
 TRACE = 5
 
+T = TypeVar("T")
+
 
 class TraceLogger(getLoggerClass()):
     """TraceLogger"""
@@ -448,6 +451,13 @@ def if_not_in_list_append(target_list, obj):
         target_list.append(obj)
 
 
+def shuffled(items: Sequence[T]) -> List[T]:
+    """Return the items in random order, drawing a single permutation for all of them."""
+    if len(items) <= 1:
+        return list(items)
+    return [items[index] for index in permutation(len(items))]
+
+
 def get_market_maker_rate_from_config(next_market, default_value=None, time_slot=None):
     """Get market maker rate from config."""
     if next_market is None:
@@ -522,12 +532,17 @@ class StrategyProfileConfigurationException(Exception):
     """Exception raised when neither a profile nor a profile_uuid are provided for a strategy."""
 
 
+def get_past_markets_threshold(current_time_slot: DateTime) -> DateTime:
+    """Return the first time slot that is not part of the area.past_markets."""
+    if ConstSettings.SettlementMarketSettings.ENABLE_SETTLEMENT_MARKETS:
+        return current_time_slot.subtract(
+            hours=ConstSettings.SettlementMarketSettings.MAX_AGE_SETTLEMENT_MARKET_HOURS)
+    return current_time_slot
+
+
 def is_time_slot_in_past_markets(time_slot: DateTime, current_time_slot: DateTime):
     """Checks if the time_slot should be in the area.past_markets."""
-    if ConstSettings.SettlementMarketSettings.ENABLE_SETTLEMENT_MARKETS:
-        return (time_slot < current_time_slot.subtract(
-            hours=ConstSettings.SettlementMarketSettings.MAX_AGE_SETTLEMENT_MARKET_HOURS))
-    return time_slot < current_time_slot
+    return time_slot < get_past_markets_threshold(current_time_slot)
 
 
 class FutureMarketCounter:
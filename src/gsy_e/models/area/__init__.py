@@ -80,7 +80,11 @@ def check_area_name_exists_in_parent_area(parent_area, name):
 
 
 class AreaChildrenList(list):
-    """Class to define the children of an area."""
+    """Class to define the children of an area.
+
+    Every change of the list invalidates the cached traversal of the parent area (and of its
+    ancestors), see Area.subtree.
+    """
 
     def __init__(self, parent_area, *args, **kwargs):
         self.parent_area = parent_area
@@ -93,10 +97,37 @@ class AreaChildrenList(list):
     def append(self, item: "Area") -> None:
         self._validate_before_insertion(item)
         super().append(item)
+        self.parent_area.invalidate_traversal_cache()
 
     def insert(self, index, item):
         self._validate_before_insertion(item)
         super().insert(index, item)
+        self.parent_area.invalidate_traversal_cache()
+
+    def extend(self, items):
+        for item in items:
+            self.append(item)
+
+    def remove(self, item):
+        super().remove(item)
+        self.parent_area.invalidate_traversal_cache()
+
+    def pop(self, index=-1):
+        item = super().pop(index)
+        self.parent_area.invalidate_traversal_cache()
+        return item
+
+    def clear(self):
+        super().clear()
+        self.parent_area.invalidate_traversal_cache()
+
+    def __setitem__(self, index, item):
+        super().__setitem__(index, item)
+        self.parent_area.invalidate_traversal_cache()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self.parent_area.invalidate_traversal_cache()
 
 
 # pylint: disable=too-many-instance-attributes
@@ -131,8 +162,9 @@ class Area:
         self.uuid = uuid if uuid is not None else str(uuid4())
         self.slug = slugify(name, to_lower=True)
         self.parent = None
-        self.children = AreaChildrenList(self, children) if children is not None\
-            else AreaChildrenList(self)
+        self._subtree: Optional[List["Area"]] = None
+        self._non_leaf_children: Optional[List["Area"]] = None
+        self.children = children if children is not None else []
         for child in self.children:
             child.parent = self
 
@@ -157,6 +189,42 @@ class Area:
             if external_connection_available and self.strategy is None else None
         self.external_connection_available = external_connection_available
 
+    @property
+    def children(self) -> AreaChildrenList:
+        """Return the children of the area."""
+        return self._children
+
+    @children.setter
+    def children(self, children: List["Area"]) -> None:
+        self._children = AreaChildrenList(self, children)
+        self.invalidate_traversal_cache()
+
+    def invalidate_traversal_cache(self) -> None:
+        """Drop the cached traversal of the area and its ancestors, after a change of the tree."""
+        self._subtree = None
+        self._non_leaf_children = None
+        if self.parent is not None:
+            self.parent.invalidate_traversal_cache()
+
+    @property
+    def subtree(self) -> List["Area"]:
+        """Return the area followed by all its descendants, in depth-first order.
+
+        The list is cached until the children of the area or of one of its descendants change.
+        """
+        if self._subtree is None:
+            self._subtree = [self]
+            for child in self.children:
+                self._subtree.extend(child.subtree)
+        return self._subtree
+
+    @property
+    def non_leaf_children(self) -> List["Area"]:
+        """Return the children that have children of their own (and therefore market agents)."""
+        if self._non_leaf_children is None:
+            self._non_leaf_children = [child for child in self.children if child.children]
+        return self._non_leaf_children
+
     @property
     def name(self):
         """Return the name of the area."""
@@ -462,19 +530,33 @@ class Area:
         """
         Execute actions that are needed after the tick event has been processed and dispatched
         to all areas. The actions performed for now is consuming the aggregator commands, and
-        updating the clock on markets with self.now member
+        updating the clock on markets with self.now member. The actions are executed for the
+        area and all its descendants, in depth-first order.
         Returns: None
 
         """
+        for area in self.subtree:
+            area.update_after_tick()
+
+    def update_after_tick(self) -> None:
+        """Increase the tick counter, consume aggregator commands and update the market clocks."""
         self.current_tick += 1
         self._consume_commands_from_aggregator()
+        self._update_market_clocks()
+
+    def _update_market_clocks(self) -> None:
         if self.children:
             self.spot_market.update_clock(self.now)
 
             for market in self._markets.settlement_markets.values():
                 market.update_clock(self.now)
-        for child in self.children:
-            child.execute_actions_after_tick_event()
+
+    def skip_ticks(self, number_of_ticks: int) -> None:
+        """Advance the tick counter and the market clocks of the area and all its descendants,
+        without dispatching the skipped ticks (used by the fast-forward simulation mode)."""
+        for area in self.subtree:
+            area.current_tick += number_of_ticks
+            area._update_market_clocks()  # pylint: disable=protected-access
 
     def tick_and_dispatch(self):
         """Invoke tick handler and broadcast the event to children."""
@@ -20,12 +20,14 @@ from typing import Union, Dict, TYPE_CHECKING, Optional
 
 from gsy_framework.constants_limits import ConstSettings
 from gsy_framework.enums import SpotMarketTypeEnum
-from numpy.random import random
 from pendulum import DateTime
 
+import gsy_e.constants
+from gsy_e.events import EventMixin
 from gsy_e.events.event_structures import MarketEvent, AreaEvent
 from gsy_e.gsy_e_core.exceptions import WrongMarketTypeException
 from gsy_e.gsy_e_core.redis_connections.redis_area_market_communicator import RedisCommunicator
+from gsy_e.gsy_e_core.util import shuffled
 from gsy_e.models.area.redis_dispatcher.area_event_dispatcher import RedisAreaEventDispatcher
 from gsy_e.models.area.redis_dispatcher.area_to_market_publisher import AreaToMarketEventPublisher
 from gsy_e.models.area.redis_dispatcher.market_event_dispatcher import (
@@ -111,11 +113,21 @@ class AreaDispatcher:
         """
         self.broadcast_notification(AreaEvent.BALANCING_MARKET_CYCLE, **kwargs)
 
+    @staticmethod
+    def _is_idle_tick(listener: EventMixin, event_type: Union[MarketEvent, AreaEvent],
+                      current_tick: int) -> bool:
+        """Return True if the event is a TICK that the listener has no work to do on."""
+        return (event_type is AreaEvent.TICK and gsy_e.constants.SKIP_IDLE_TICKS and
+                not listener.is_tick_due(current_tick))
+
     def _broadcast_notification_to_single_agent(
             self, agent_area: "Area", market_type: AvailableMarketTypes,
             event_type: AreaEvent, **kwargs) -> None:
 
         if market_type == AvailableMarketTypes.FUTURE and agent_area.dispatcher.future_agent:
+            if self._is_idle_tick(agent_area.dispatcher.future_agent, event_type,
+                                  agent_area.current_tick):
+                return
             agent_area.dispatcher.future_agent.event_listener(event_type, **kwargs)
         elif market_type != AvailableMarketTypes.FUTURE:
             agent_dict = self._get_agents_for_market_type(agent_area.dispatcher, market_type)
@@ -124,6 +136,8 @@ class AreaDispatcher:
                         market_type):
                     # exclude past MAs
                     continue
+                if self._is_idle_tick(agent, event_type, agent_area.current_tick):
+                    continue
 
                 agent.event_listener(event_type, **kwargs)
 
@@ -134,9 +148,7 @@ class AreaDispatcher:
         if not self.area.events.is_connected:
             return
 
-        for child in sorted(self.area.children, key=lambda _: random()):
-            if not child.children:
-                continue
+        for child in shuffled(self.area.non_leaf_children):
             self._broadcast_notification_to_single_agent(
                 child, market_type, event_type, **kwargs)
 
@@ -169,7 +181,7 @@ class AreaDispatcher:
             return
 
         # Broadcast to children in random order to ensure fairness
-        for child in sorted(self.area.children, key=lambda _: random()):
+        for child in shuffled(self.area.children):
             child.dispatcher.event_listener(event_type, **kwargs)
 
         market_id = kwargs.get("market_id")
@@ -214,7 +226,8 @@ class AreaDispatcher:
         elif event_type is AreaEvent.ACTIVATE:
             self.area.activate(**kwargs)
         if self._should_dispatch_to_strategies(event_type):
-            if self.area.strategy:
+            if self.area.strategy and not self._is_idle_tick(
+                    self.area.strategy, event_type, self.area.current_tick):
                 self.area.strategy.event_listener(event_type, **kwargs)
         elif ((not self.area.events.is_enabled or not self.area.events.is_connected)
               and event_type == AreaEvent.MARKET_CYCLE and self.area.strategy is not None):
@@ -1,7 +1,10 @@
 import json
-from random import random
+from threading import Semaphore
+
+import gsy_e.constants
 from gsy_e.events import AreaEvent
 from gsy_e.gsy_e_core.exceptions import D3ARedisException
+from gsy_e.gsy_e_core.util import shuffled
 from gsy_e.models.area.redis_dispatcher import RedisEventDispatcherBase
 
 
@@ -9,6 +12,8 @@ class RedisAreaEventDispatcher(RedisEventDispatcherBase):
     def __init__(self, area, root_dispatcher, redis):
         super().__init__(area, root_dispatcher, redis)
         self.str_area_events = [event.name.lower() for event in AreaEvent]
+        # released once per response of a child area, if the events are dispatched concurrently
+        self._child_responses = Semaphore(0)
 
     def event_channel_name(self):
         return f"{self.area.uuid}/area_event"
@@ -21,7 +26,10 @@ class RedisAreaEventDispatcher(RedisEventDispatcherBase):
         if "response" in data:
             event_type = data["response"]
             if event_type in self.str_area_events:
-                self.redis.resume()
+                if gsy_e.constants.CONCURRENT_REDIS_EVENT_DISPATCHING:
+                    self._child_responses.release()
+                else:
+                    self.redis.resume()
             else:
                 raise D3ARedisException("RedisAreaDispatcher: Should never reach this point")
 
@@ -31,11 +39,14 @@ class RedisAreaEventDispatcher(RedisEventDispatcherBase):
         self.redis.publish(dispatch_chanel, json.dumps(send_data))
 
     def broadcast_event_redis(self, event_type: AreaEvent, **kwargs):
-        for child in sorted(self.area.children, key=lambda _: random()):
-            self.publish_area_event(child.uuid, event_type, **kwargs)
-            self.redis.wait()
-            self.root_dispatcher.market_event_dispatcher.wait_for_futures()
-            self.root_dispatcher.market_notify_event_dispatcher.wait_for_futures()
+        if gsy_e.constants.CONCURRENT_REDIS_EVENT_DISPATCHING:
+            self._broadcast_to_children_concurrently(event_type, **kwargs)
+        else:
+            for child in shuffled(self.area.children):
+                self.publish_area_event(child.uuid, event_type, **kwargs)
+                self.redis.wait()
+                self.root_dispatcher.market_event_dispatcher.wait_for_futures()
+                self.root_dispatcher.market_notify_event_dispatcher.wait_for_futures()
 
         for time_slot, agents in self.root_dispatcher.spot_agents.items():
             if time_slot not in self.area._markets.markets:
@@ -44,10 +55,21 @@ class RedisAreaEventDispatcher(RedisEventDispatcherBase):
 
             if not self.area.events.is_connected:
                 break
-            for area_name in sorted(agents, key=lambda _: random()):
+            for area_name in shuffled(list(agents)):
                 agents[area_name].event_listener(event_type, **kwargs)
                 self.root_dispatcher.market_notify_event_dispatcher.wait_for_futures()
 
+    def _broadcast_to_children_concurrently(self, event_type: AreaEvent, **kwargs):
+        # The child areas handle the event at the same time, the market agents of the area are
+        # only dispatched after all of them have responded.
+        children = shuffled(self.area.children)
+        for child in children:
+            self.publish_area_event(child.uuid, event_type, **kwargs)
+        for _ in children:
+            self._child_responses.acquire()
+        self.root_dispatcher.market_event_dispatcher.wait_for_futures()
+        self.root_dispatcher.market_notify_event_dispatcher.wait_for_futures()
+
     def event_listener_redis(self, payload):
         data = json.loads(payload["data"])
         kwargs = data["kwargs"]
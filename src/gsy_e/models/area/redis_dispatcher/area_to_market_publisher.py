@@ -1,5 +1,6 @@
 from uuid import uuid4
 import json
+import gsy_e.constants
 from gsy_e.gsy_e_core.exceptions import D3ARedisException
 from gsy_framework.constants_limits import ConstSettings
 from gsy_e.constants import REDIS_PUBLISH_RESPONSE_TIMEOUT
@@ -28,22 +29,44 @@ class AreaToMarketEventPublisher:
     def publish_markets_clearing(self):
         if ConstSettings.MASettings.MARKET_TYPE == SpotMarketTypeEnum.ONE_SIDED.value:
             return
+        if gsy_e.constants.CONCURRENT_REDIS_EVENT_DISPATCHING:
+            self._publish_markets_clearing_concurrently()
+            return
         for market in self.area._markets.markets.values():
-            response_channel = f"{market.id}/CLEAR/RESPONSE"
-            market_channel = f"{market.id}/CLEAR"
-
-            data = {"transaction_uuid": str(uuid4())}
-            self.redis.sub_to_channel(response_channel, self.response_callback)
-            self.redis.publish(market_channel, json.dumps(data))
+            data = self._publish_market_clearing(market)
 
             def event_response_was_received_callback():
                 return data["transaction_uuid"] in self.event_response_uuids
 
             self.redis.poll_until_response_received(event_response_was_received_callback)
+            self._check_market_clearing_response(market, data)
+
+    def _publish_markets_clearing_concurrently(self):
+        # publish the clearing event to all markets, then wait for all the responses
+        market_data = [(market, self._publish_market_clearing(market))
+                       for market in self.area._markets.markets.values()]
+
+        def event_responses_were_received_callback():
+            return all(data["transaction_uuid"] in self.event_response_uuids
+                       for _, data in market_data)
+
+        self.redis.poll_until_response_received(event_responses_were_received_callback)
+        for market, data in market_data:
+            self._check_market_clearing_response(market, data)
+
+    def _publish_market_clearing(self, market):
+        response_channel = f"{market.id}/CLEAR/RESPONSE"
+        market_channel = f"{market.id}/CLEAR"
+
+        data = {"transaction_uuid": str(uuid4())}
+        self.redis.sub_to_channel(response_channel, self.response_callback)
+        self.redis.publish(market_channel, json.dumps(data))
+        return data
 
-            if data["transaction_uuid"] not in self.event_response_uuids:
-                self.area.log.error(
-                    f"Transaction ID not found after {REDIS_PUBLISH_RESPONSE_TIMEOUT} "
-                    f"seconds: Clearing event on {self.area.name}, {market.id}")
-            else:
-                self.event_response_uuids.remove(data["transaction_uuid"])
+    def _check_market_clearing_response(self, market, data):
+        if data["transaction_uuid"] not in self.event_response_uuids:
+            self.area.log.error(
+                f"Transaction ID not found after {REDIS_PUBLISH_RESPONSE_TIMEOUT} "
+                f"seconds: Clearing event on {self.area.name}, {market.id}")
+        else:
+            self.event_response_uuids.remove(data["transaction_uuid"])
@@ -1,10 +1,12 @@
 import json
 import logging
-from random import random
-from threading import Event
+from threading import Event, Semaphore
 from concurrent.futures import TimeoutError, ThreadPoolExecutor
+
+import gsy_e.constants
 from gsy_e.events import MarketEvent
 from gsy_e.gsy_e_core.exceptions import D3ARedisException
+from gsy_e.gsy_e_core.util import shuffled
 from gsy_e.constants import MAX_WORKER_THREADS
 from gsy_e.models.area.redis_dispatcher import RedisEventDispatcherBase
 from gsy_e.models.market.market_structures import parse_event_and_parameters_from_json_string
@@ -18,6 +20,8 @@ class AreaRedisMarketEventDispatcher(RedisEventDispatcherBase):
         self.futures = []
         self.executor = ThreadPoolExecutor(max_workers=MAX_WORKER_THREADS)
         self.child_response_events = {t.value: Event() for t in MarketEvent}
+        # released once per response of a child area, if the events are dispatched concurrently
+        self.child_responses = {t.value: Semaphore(0) for t in MarketEvent}
 
     def wait_for_futures(self):
         for future in self.futures:
@@ -51,6 +55,8 @@ class AreaRedisMarketEventDispatcher(RedisEventDispatcherBase):
             if event_type not in self.str_market_events:
                 raise D3ARedisException(
                     "AreaRedisMarketEventDispatcher: Should never reach this point")
+            elif gsy_e.constants.CONCURRENT_REDIS_EVENT_DISPATCHING:
+                self.child_responses[event_type_id].release()
             else:
                 self.child_response_events[event_type_id].set()
 
@@ -64,10 +70,17 @@ class AreaRedisMarketEventDispatcher(RedisEventDispatcherBase):
         self.redis.publish(dispatch_channel, json.dumps(send_data))
 
     def broadcast_event_redis(self, event_type: MarketEvent, **kwargs):
-        for child in sorted(self.area.children, key=lambda _: random()):
-            self.publish_event(child.uuid, event_type, **kwargs)
-            self.child_response_events[event_type.value].wait()
-            self.child_response_events[event_type.value].clear()
+        if gsy_e.constants.CONCURRENT_REDIS_EVENT_DISPATCHING:
+            children = shuffled(self.area.children)
+            for child in children:
+                self.publish_event(child.uuid, event_type, **kwargs)
+            for _ in children:
+                self.child_responses[event_type.value].acquire()
+        else:
+            for child in shuffled(self.area.children):
+                self.publish_event(child.uuid, event_type, **kwargs)
+                self.child_response_events[event_type.value].wait()
+                self.child_response_events[event_type.value].clear()
 
         for time_slot, agents in self.root_dispatcher.spot_agents.items():
             if time_slot not in self.area._markets.markets:
@@ -76,7 +89,7 @@ class AreaRedisMarketEventDispatcher(RedisEventDispatcherBase):
 
             if not self.area.events.is_connected:
                 break
-            for area_name in sorted(agents, key=lambda _: random()):
+            for area_name in shuffled(list(agents)):
                 agents[area_name].event_listener(event_type, **kwargs)
 
     def publish_response(self, event_type):
@@ -107,7 +107,7 @@ class AreaStats:
         """Extract the cheapest offer from the market"""
         cheapest_offers = []
         for market in self._markets.markets.values():
-            cheapest_offers.extend(market.sorted_offers[0:1])
+            cheapest_offers.extend(market.offers.top(1))
         return cheapest_offers
 
     def _get_current_market_bills(self) -> Dict:
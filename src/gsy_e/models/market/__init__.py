@@ -18,6 +18,7 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import uuid
 from collections import namedtuple
+from dataclasses import dataclass, field
 from functools import wraps
 from logging import getLogger
 from threading import RLock
@@ -37,6 +38,7 @@ from gsy_e.models.market.grid_fees.constant_grid_fees import ConstantGridFees
 from gsy_e.models.market.market_redis_connection import (
     MarketRedisEventSubscriber, MarketRedisEventPublisher,
     TwoSidedMarketRedisEventSubscriber)
+from gsy_e.models.market.order_book import OrderBook
 
 log = getLogger(__name__)
 
@@ -46,6 +48,16 @@ GridFee = namedtuple("GridFee", ("grid_fee_percentage", "grid_fee_const"))
 RLOCK_MEMBER_NAME = "rlock"
 
 
+@dataclass
+class ParticipantTrades:
+    """Trades of one market participant, with the running totals of its purchases and sales."""
+    trades: List[Trade] = field(default_factory=list)
+    bought_energy: float = 0
+    sold_energy: float = 0
+    total_spent: float = 0
+    total_earned: float = 0
+
+
 def lock_market_action(function):
     """Handle the locking behavior of a market."""
 
@@ -80,10 +92,10 @@ class MarketBase:  # pylint: disable=too-many-instance-attributes
         self.time_slot = time_slot
         self.readonly = readonly
         # offer-id -> Offer
-        self.offers: Dict[str, Offer] = {}
+        self.offers = {}
         self.offer_history: List[Offer] = []
         self.notification_listeners: List[Callable] = []
-        self.bids: Dict[str, Bid] = {}
+        self.bids = {}
         self.bid_history: List[Bid] = []
         self.trades: List[Trade] = []
         self.const_fee_rate: Optional[float] = None
@@ -111,6 +123,55 @@ class MarketBase:  # pylint: disable=too-many-instance-attributes
                 else TwoSidedMarketRedisEventSubscriber(self))
         setattr(self, RLOCK_MEMBER_NAME, RLock())
 
+    @property
+    def offers(self) -> OrderBook:
+        """Return the {offer_id: offer} mapping, sorted by energy rate."""
+        return self._offers
+
+    @offers.setter
+    def offers(self, orders: Dict[str, Offer]) -> None:
+        """Wrap the setter of _offers in order to build an OrderBook object."""
+        self._offers = OrderBook(orders)
+
+    @property
+    def bids(self) -> OrderBook:
+        """Return the {bid_id: bid} mapping, sorted by energy rate."""
+        return self._bids
+
+    @bids.setter
+    def bids(self, orders: Dict[str, Bid]) -> None:
+        """Wrap the setter of _bids in order to build an OrderBook object."""
+        self._bids = OrderBook(orders)
+
+    @property
+    def trades(self) -> List[Trade]:
+        """Return the trades of the market, in the order they were concluded."""
+        return self._trades
+
+    @trades.setter
+    def trades(self, trades: List[Trade]) -> None:
+        """Wrap the setter of _trades in order to index the trades per participant."""
+        self._trades = trades
+        self._participant_trades: Dict[str, ParticipantTrades] = {}
+        for trade in trades:
+            self._index_trade(trade)
+
+    def _index_trade(self, trade: Trade) -> None:
+        seller_trades = self._participant_trades.setdefault(trade.seller, ParticipantTrades())
+        seller_trades.trades.append(trade)
+        seller_trades.sold_energy += trade.traded_energy
+        seller_trades.total_earned += trade.trade_price
+        buyer_trades = self._participant_trades.setdefault(trade.buyer, ParticipantTrades())
+        if buyer_trades is not seller_trades:
+            buyer_trades.trades.append(trade)
+        buyer_trades.bought_energy += trade.traded_energy
+        buyer_trades.total_spent += trade.trade_price
+
+    def participant_trades(self, name: str) -> List[Trade]:
+        """Return the trades in which the participant is the seller or the buyer."""
+        participant_trades = self._participant_trades.get(name)
+        return participant_trades.trades if participant_trades else []
+
     @property
     def time_slot_str(self):
         """A string representation of the market slot."""
@@ -142,6 +203,11 @@ class MarketBase:  # pylint: disable=too-many-instance-attributes
         offers = [offer.serializable_dict() for offer in self.offers.values()]
         return {self.time_slot_str: {"bids": bids, "offers": offers}}
 
+    def get_order_time_slot_str(self, order: Union[Offer, Bid]) -> str:
+        """Return the key of the orders_per_slot mapping under which the order is listed."""
+        # pylint: disable=unused-argument
+        return self.time_slot_str
+
     def add_listener(self, listener: Callable):
         """Append a callable function to the notification_listeners list."""
         self.notification_listeners.append(listener)
@@ -162,6 +228,7 @@ class MarketBase:  # pylint: disable=too-many-instance-attributes
 
         if not already_tracked:
             self.trades.append(trade)
+            self._index_trade(trade)
             self.market_fee += trade.fee_price
         self._update_accumulated_trade_price_energy(trade)
         self.traded_energy = add_or_create_key(
@@ -192,6 +259,8 @@ class MarketBase:  # pylint: disable=too-many-instance-attributes
     @staticmethod
     def sorting(offers_bids: Dict, reverse_order=False) -> List[Union[Bid, Offer]]:
         """Sort a list of bids or offers by their energy_rate attribute."""
+        if isinstance(offers_bids, OrderBook):
+            return offers_bids.sorted_orders(reverse=reverse_order)
         if reverse_order:
             # Sorted bids in descending order
             return list(reversed(sorted(
@@ -213,17 +282,20 @@ class MarketBase:  # pylint: disable=too-many-instance-attributes
 
     @property
     def sorted_offers(self):
-        """Sort the offers using the self.sorting method."""
+        """Return the offers sorted by energy rate, as kept by the offers order book."""
+
+        return self.offers.sorted_orders()
+
+    @property
+    def sorted_bids(self):
+        """Return the bids sorted by energy rate in descending order (best bid first)."""
 
-        return self.sorting(self.offers)
+        return self.bids.sorted_orders(reverse=True)
 
     @property
     def most_affordable_offers(self):
         """Return the offers with the least energy_rate value."""
-        cheapest_offer = self.sorted_offers[0]
-        rate = cheapest_offer.energy_rate
-        return [o for o in self.sorted_offers if
-                abs(o.energy_rate - rate) < FLOATING_POINT_TOLERANCE]
+        return self.offers.lowest_rate_orders(tolerance=FLOATING_POINT_TOLERANCE)
 
     def update_clock(self, now: DateTime) -> None:
         """
@@ -239,22 +311,26 @@ class MarketBase:  # pylint: disable=too-many-instance-attributes
     def bought_energy(self, buyer: str) -> float:
         """Return the aggregated bought energy value by the passed-in buyer."""
 
-        return sum(trade.traded_energy for trade in self.trades if trade.buyer == buyer)
+        participant_trades = self._participant_trades.get(buyer)
+        return participant_trades.bought_energy if participant_trades else 0
 
     def sold_energy(self, seller: str) -> float:
         """Return the aggregated sold energy value by the passed-in seller."""
 
-        return sum(trade.traded_energy for trade in self.trades if trade.seller == seller)
+        participant_trades = self._participant_trades.get(seller)
+        return participant_trades.sold_energy if participant_trades else 0
 
     def total_spent(self, buyer: str) -> float:
         """Return the aggregated money spent by the passed-in buyer."""
 
-        return sum(trade.trade_price for trade in self.trades if trade.buyer == buyer)
+        participant_trades = self._participant_trades.get(buyer)
+        return participant_trades.total_spent if participant_trades else 0
 
     def total_earned(self, seller: str) -> float:
         """Return the aggregated money earned by the passed-in seller."""
 
-        return sum(trade.trade_price for trade in self.trades if trade.seller == seller)
+        participant_trades = self._participant_trades.get(seller)
+        return participant_trades.total_earned if participant_trades else 0
 
     @property
     def info(self) -> Dict:
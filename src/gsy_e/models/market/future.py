@@ -16,10 +16,8 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 # pylint: disable=too-many-arguments, too-many-locals, no-member
-from collections import UserDict
-from copy import deepcopy
 from logging import getLogger
-from typing import Dict, List, Optional, TYPE_CHECKING
+from typing import Dict, List, Optional, TYPE_CHECKING, Union
 
 from gsy_framework.constants_limits import ConstSettings, GlobalConfig, DATE_TIME_FORMAT
 from gsy_framework.data_classes import Bid, Offer
@@ -29,6 +27,7 @@ from pendulum import DateTime, duration
 from gsy_e.gsy_e_core.blockchain_interface import NonBlockchainInterface
 from gsy_e.models.market import GridFee
 from gsy_e.models.market import lock_market_action
+from gsy_e.models.market.order_book import OrderBook
 from gsy_e.models.market.two_sided import TwoSidedMarket
 
 if TYPE_CHECKING:
@@ -42,14 +41,14 @@ class FutureMarketException(Exception):
     """Exception specific to the Future markets."""
 
 
-class FutureOrders(UserDict):
-    """Special mapping object to keep track of a future market's orders."""
+class FutureOrders(OrderBook):
+    """Special order book to keep track of a future market's orders per time slot."""
     def __init__(self, *args, **kwargs):
         self.slot_order_mapping = {}
         super().__init__(*args, **kwargs)
 
     def __setitem__(self, order_id, order):
-        self.data[order_id] = order
+        super().__setitem__(order_id, order)
         if order.time_slot not in self.slot_order_mapping:
             self.slot_order_mapping[order.time_slot] = []
         self.slot_order_mapping[order.time_slot].append(order)
@@ -58,7 +57,7 @@ class FutureOrders(UserDict):
         order = self.data.get(order_id, None)
         if order:
             self.slot_order_mapping[order.time_slot].remove(order)
-        del self.data[order_id]
+        super().__delitem__(order_id)
 
 
 class FutureMarkets(TwoSidedMarket):
@@ -144,6 +143,10 @@ class FutureMarkets(TwoSidedMarket):
                 [offer.serializable_dict() for offer in offers_list])
         return orders_dict
 
+    def get_order_time_slot_str(self, order: Union[Offer, Bid]) -> str:
+        """Return the key of the orders_per_slot mapping under which the order is listed."""
+        return order.time_slot.format(DATE_TIME_FORMAT)
+
     @staticmethod
     def _remove_old_orders_from_list(order_list: List, current_market_time_slot: DateTime) -> List:
         return [
@@ -152,13 +155,13 @@ class FutureMarkets(TwoSidedMarket):
 
     def _expire_orders(self, orders: "FutureOrders", current_market_time_slot: DateTime) -> None:
         """Remove old orders (time_slot in the past)."""
-        for order_id, order in deepcopy(list(orders.items())):
+        for order_id, order in list(orders.items()):
             if order.time_slot <= current_market_time_slot:
                 if isinstance(order, Offer):
                     self.delete_offer(order_id)
                 else:
                     self.delete_bid(order_id)
-        for time_slot in deepcopy(list(orders.slot_order_mapping.keys())):
+        for time_slot in list(orders.slot_order_mapping.keys()):
             if time_slot <= current_market_time_slot:
                 del orders.slot_order_mapping[time_slot]
 
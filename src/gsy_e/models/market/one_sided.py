@@ -15,10 +15,9 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
-from copy import deepcopy
 from logging import getLogger
 from math import isclose
-from typing import Union, Dict, List, Optional, Callable, Tuple
+from typing import Union, Dict, List, Mapping, Optional, Callable, Tuple
 
 from gsy_framework.constants_limits import ConstSettings
 from gsy_framework.data_classes import Offer, Trade, TradeBidOfferInfo
@@ -81,16 +80,18 @@ class OneSidedMarket(MarketBase):
             price / energy, original_price / energy) * energy
 
     @lock_market_action
-    def get_offers(self) -> Dict:
+    def get_offers(self) -> Mapping[str, Offer]:
         """
-        Retrieves a copy of all open offers of the market. The copy of the offers guarantees
-        that the return dict will remain unaffected from any mutations of the market offer list
+        Retrieves a snapshot of all open offers of the market. The snapshot guarantees that the
+        returned mapping will remain unaffected from any mutations of the market offer list
         that might happen concurrently (more specifically can be used in for loops without raising
-        the 'dict changed size during iteration' exception)
-        Returns: dict with open offers, offer id as keys, and Offer objects as values
+        the 'dict changed size during iteration' exception). The snapshot is read-only and is only
+        rebuilt when the offers of the market change, therefore the offer objects are shared with
+        the market and should not be modified.
+        Returns: read-only mapping with open offers, offer id as keys, and Offer objects as values
 
         """
-        return deepcopy(self.offers)
+        return self.offers.snapshot()
 
     @lock_market_action
     def offer(  # pylint: disable=too-many-arguments, too-many-locals
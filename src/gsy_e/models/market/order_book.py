@@ -0,0 +1,158 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from collections import UserDict
+from itertools import count
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, List, Mapping, Optional, Tuple, Union
+
+from sortedcontainers import SortedList
+
+if TYPE_CHECKING:
+    from gsy_framework.data_classes import Bid, Offer
+
+# (energy_rate, insertion sequence, order id)
+OrderIndexEntry = Tuple[float, int, str]
+
+# Versions are unique across books, so a replaced book never repeats the version of the old one
+_versions = count()
+
+
+class OrderBook(UserDict):
+    """Mapping of {order_id: order} that keeps the orders sorted by their energy rate.
+
+    The rate index is updated whenever an order is added or removed, so the sorted views and the
+    best-price / depth queries do not need to re-sort all orders of the market. Orders with the
+    same energy rate keep their insertion order, same as a stable sort of a plain dict would.
+    """
+    def __init__(self, *args, **kwargs):
+        self._rate_index = SortedList()
+        self._index_entries: Dict[str, OrderIndexEntry] = {}
+        self._sequence = 0
+        self._snapshot: Optional[Mapping[str, Union["Bid", "Offer"]]] = None
+        self._version = next(_versions)
+        super().__init__(*args, **kwargs)
+
+    def __setitem__(self, order_id: str, order: Union["Bid", "Offer"]) -> None:
+        self._snapshot = None
+        self._version = next(_versions)
+        previous_entry = self._index_entries.pop(order_id, None)
+        if previous_entry is not None:
+            # Replacing an order keeps its position among orders with the same rate
+            self._rate_index.remove(previous_entry)
+            sequence = previous_entry[1]
+        else:
+            sequence = self._sequence
+            self._sequence += 1
+        entry = (order.energy_rate, sequence, order_id)
+        self._rate_index.add(entry)
+        self._index_entries[order_id] = entry
+        self.data[order_id] = order
+
+    def __delitem__(self, order_id: str) -> None:
+        del self.data[order_id]
+        self._snapshot = None
+        self._version = next(_versions)
+        self._rate_index.remove(self._index_entries.pop(order_id))
+
+    def copy(self) -> "OrderBook":
+        """Return a shallow copy of the book, with a rate index of its own."""
+        return self.__class__(self.data)
+
+    __copy__ = copy
+
+    def __getstate__(self) -> Dict:
+        # Read-only snapshots can not be pickled (or deep-copied), they are rebuilt on demand
+        state = self.__dict__.copy()
+        state["_snapshot"] = None
+        return state
+
+    @property
+    def version(self) -> int:
+        """Return a counter that changes whenever an order is added, replaced or removed."""
+        return self._version
+
+    def snapshot(self) -> Mapping[str, Union["Bid", "Offer"]]:
+        """Return a read-only view of the orders that is not affected by later changes.
+
+        The snapshot is a shallow copy that is shared by all callers until the book changes, hence
+        the orders themselves are the ones of the book and should not be modified by the callers.
+        """
+        if self._snapshot is None:
+            self._snapshot = MappingProxyType(dict(self.data))
+        return self._snapshot
+
+    def reindex(self, order_id: str) -> None:
+        """Update the position of an order whose price was changed while in the book."""
+        self[order_id] = self.data[order_id]
+
+    def sorted_orders(self, reverse: bool = False) -> List[Union["Bid", "Offer"]]:
+        """Return all orders sorted by energy rate (ascending unless reverse is set)."""
+        entries = reversed(self._rate_index) if reverse else self._rate_index
+        return [self.data[order_id] for _, _, order_id in entries]
+
+    def top(self, count: int, reverse: bool = False) -> List[Union["Bid", "Offer"]]:
+        """Return the first count orders, the cheapest ones (or most expensive if reverse)."""
+        if count <= 0:
+            return []
+        if reverse:
+            entries = reversed(self._rate_index[-count:])
+        else:
+            entries = self._rate_index[:count]
+        return [self.data[order_id] for _, _, order_id in entries]
+
+    def lowest_rate(self) -> Optional[float]:
+        """Return the lowest energy rate in the book, or None if the book is empty."""
+        return self._rate_index[0][0] if self._rate_index else None
+
+    def highest_rate(self) -> Optional[float]:
+        """Return the highest energy rate in the book, or None if the book is empty."""
+        return self._rate_index[-1][0] if self._rate_index else None
+
+    def lowest_rate_orders(self, tolerance: float = 0.0) -> List[Union["Bid", "Offer"]]:
+        """Return all orders whose rate is less than tolerance away from the lowest rate."""
+        if not self._rate_index:
+            return []
+        lowest_rate = self._rate_index[0][0]
+        entries = self._rate_index.irange(maximum=(lowest_rate + tolerance, float("inf")))
+        return [self.data[order_id] for rate, _, order_id in entries
+                if rate == lowest_rate or rate - lowest_rate < tolerance]
+
+    def highest_rate_orders(self, tolerance: float = 0.0) -> List[Union["Bid", "Offer"]]:
+        """Return all orders whose rate is less than tolerance away from the highest rate."""
+        if not self._rate_index:
+            return []
+        highest_rate = self._rate_index[-1][0]
+        entries = self._rate_index.irange(minimum=(highest_rate - tolerance,), reverse=True)
+        return [self.data[order_id] for rate, _, order_id in entries
+                if rate == highest_rate or highest_rate - rate < tolerance]
+
+    def energy_up_to_rate(self, energy_rate: float) -> float:
+        """Return the accumulated energy of all orders with rate lower or equal to energy_rate.
+
+        For offers this is the energy that a buyer paying energy_rate is able to purchase.
+        """
+        entries = self._rate_index.irange(maximum=(energy_rate, float("inf")))
+        return sum(self.data[order_id].energy for _, _, order_id in entries)
+
+    def energy_from_rate(self, energy_rate: float) -> float:
+        """Return the accumulated energy of all orders with rate higher or equal to energy_rate.
+
+        For bids this is the energy that a seller asking for energy_rate is able to sell.
+        """
+        entries = self._rate_index.irange(minimum=(energy_rate,))
+        return sum(self.data[order_id].energy for _, _, order_id in entries)
@@ -16,10 +16,9 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 import uuid
-from copy import deepcopy
 from logging import getLogger
 from math import isclose
-from typing import Dict, List, Union, Tuple, Optional
+from typing import Dict, List, Mapping, Union, Tuple, Optional
 
 from gsy_framework.constants_limits import ConstSettings
 from gsy_framework.data_classes import Bid, Offer, Trade, TradeBidOfferInfo, BidOfferMatch
@@ -68,16 +67,18 @@ class TwoSidedMarket(OneSidedMarket):
                 f", V: {self.accumulated_trade_price})>")
 
     @lock_market_action
-    def get_bids(self) -> Dict:
+    def get_bids(self) -> Mapping[str, Bid]:
         """
-        Retrieves a copy of all open bids of the market. The copy of the bids guarantees
-        that the return dict will remain unaffected from any mutations of the market bid list
+        Retrieves a snapshot of all open bids of the market. The snapshot guarantees
+        that the returned mapping will remain unaffected from any mutations of the market bid list
         that might happen concurrently (more specifically can be used in for loops without raising
-        the 'dict changed size during iteration' exception)
-        Returns: dict with open bids, bid id as keys, and Bid objects as values
+        the 'dict changed size during iteration' exception). The snapshot is read-only and is only
+        rebuilt when the bids of the market change, therefore the bid objects are shared with
+        the market and should not be modified.
+        Returns: read-only mapping with open bids, bid id as keys, and Bid objects as values
 
         """
-        return deepcopy(self.bids)
+        return self.bids.snapshot()
 
     def _update_requirements_prices(self, bid):
         requirements = []
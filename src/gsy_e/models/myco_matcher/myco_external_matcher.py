@@ -198,10 +198,11 @@ class MycoExternalMatcher(MycoMatcherInterface):
         if not self._tick_counter.is_it_time_for_external_tick(current_tick_in_slot):
             return
         data = {"event": ExternalMatcherEventsEnum.TICK.value, **kwargs}
-        self.myco_ext_conn.publish_json(self._events_channel, data)
-        # Publish the orders of the market at the end of the tick, in order for the external
-        # commands and aggregator commands to have already been processed
-        self._publish_orders()
+        with self.myco_ext_conn.buffered_publishing():
+            self.myco_ext_conn.publish_json(self._events_channel, data)
+            # Publish the orders of the market at the end of the tick, in order for the external
+            # commands and aggregator commands to have already been processed
+            self._publish_orders()
 
     def event_market_cycle(self, **kwargs):
         """Publish the market event to the Myco client and clear finished markets cache."""
@@ -15,15 +15,108 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Type, Union
 
 from gsy_framework.enums import BidOfferMatchAlgoEnum
 from gsy_framework.constants_limits import ConstSettings
 from gsy_framework.matching_algorithms import (
     PayAsBidMatchingAlgorithm, PayAsClearMatchingAlgorithm, BestPayAsBidMatchingAlgorithm, 
     BestPayAsClearMatchingAlgorithm, BestClusterPayAsClearMatchingAlgorithm)
-from gsy_e.gsy_e_core.exceptions import WrongMarketTypeException
+
+import gsy_e.constants
+from gsy_e.gsy_e_core.exceptions import InvalidBidOfferPairException, WrongMarketTypeException
 from gsy_e.gsy_e_core.global_objects_singleton import global_objects
 from gsy_e.models.myco_matcher.myco_matcher_interface import MycoMatcherInterface
+from gsy_e.models.myco_matcher.vectorised_matching_algorithms import (
+    VectorisedPayAsBidMatchingAlgorithm, VectorisedPayAsClearMatchingAlgorithm)
+
+if TYPE_CHECKING:
+    from gsy_framework.data_classes import Bid, Offer
+    from gsy_framework.matching_algorithms import BaseMatchingAlgorithm
+    from pendulum import DateTime
+    from gsy_e.models.market import MarketBase
+
+
+class MarketOrdersCache:
+    """Serialized orders of a market, kept up to date with the deltas of its order books.
+
+    Serializing the bids and offers is the most expensive part of preparing the input of the
+    matching algorithm. Between two matching passes only the orders that took part in a trade
+    change, therefore only the new orders (e.g. residuals of partial trades) are serialized.
+    """
+
+    def __init__(self, market: "MarketBase", area_uuid: Optional[str] = None,
+                 current_time: Optional["DateTime"] = None):
+        self._market = market
+        self._area_uuid = area_uuid
+        self._current_time = current_time
+        # order_id -> (order, time_slot_str, serialized order)
+        self._bids: Dict[str, Tuple[Union["Bid", "Offer"], str, Dict]] = {}
+        self._offers: Dict[str, Tuple[Union["Bid", "Offer"], str, Dict]] = {}
+
+    def _update(self, cache: Dict, orders: Dict) -> None:
+        for order_id in [order_id for order_id in cache if order_id not in orders]:
+            del cache[order_id]
+        for order_id, order in orders.items():
+            cached_order = cache.get(order_id)
+            if cached_order is not None and cached_order[0] is order:
+                continue
+            # An order that was replaced using the same id keeps its position, like in the market
+            cache[order_id] = (order, self._market.get_order_time_slot_str(order),
+                               order.serializable_dict())
+
+    def orders_per_slot(self) -> Dict[str, Dict]:
+        """Return the open orders of the market in the format of market.orders_per_slot."""
+        self._update(self._bids, self._market.bids)
+        self._update(self._offers, self._market.offers)
+        orders = {}
+        for order_type, cache in (("bids", self._bids), ("offers", self._offers)):
+            for _, time_slot, serialized_order in cache.values():
+                if time_slot not in orders:
+                    orders[time_slot] = {"bids": [], "offers": []}
+                # Copy the order dict, the matching algorithms are free to mutate their input
+                orders[time_slot][order_type].append({**serialized_order})
+        return orders
+
+    @property
+    def market(self) -> "MarketBase":
+        """Return the market whose orders are cached."""
+        return self._market
+
+    def matching_data(self) -> Dict:
+        """Return the input of the matching algorithm for the open orders of the market."""
+        # Format should be: {area_uuid: {time_slot: {"bids": [], "offers": [], ...}}}
+        return {
+            self._area_uuid: {
+                time_slot: {**orders_data, "current_time": self._current_time}
+                for time_slot, orders_data in self.orders_per_slot().items()}}
+
+
+# Number of times a market is matched again in parallel after its recommendations became invalid
+# (because of the trades of other markets), before it is matched on the calling thread
+MAX_PARALLEL_MATCHING_RETRIES = 3
+# Attributes of the matching algorithm state (pay as clear) that are filled per market
+CLEARING_STATE_ATTRIBUTES = ("cumulative_bids", "cumulative_offers", "clearing")
+
+
+def _get_recommendations_from_new_algorithm(
+        algorithm_class: Type["BaseMatchingAlgorithm"], data: Dict) -> Tuple[List[Dict], Dict]:
+    """Compute the recommendations with a new algorithm instance, in a worker of the pool.
+
+    Algorithm instances (e.g. pay as clear) keep state between calls, therefore they are not
+    shared between workers. The state that the algorithm filled for the markets of the data is
+    returned with the recommendations, to be merged into the state of the matcher's algorithm.
+    """
+    algorithm = algorithm_class()
+    recommendations = algorithm.get_matches_recommendations(data)
+    state = getattr(algorithm, "state", None)
+    clearing_state = {
+        attribute: {market_id: dict(values)
+                    for market_id, values in getattr(state, attribute).items()}
+        for attribute in CLEARING_STATE_ATTRIBUTES if hasattr(state, attribute)}
+    return recommendations, clearing_state
 
 
 class MycoInternalMatcher(MycoMatcherInterface):
@@ -32,9 +125,24 @@ class MycoInternalMatcher(MycoMatcherInterface):
     def __init__(self):
         super().__init__()
         self.match_algorithm = None
+        self._executor: Optional[Executor] = None
 
     def activate(self):
         self.match_algorithm = self.get_matching_algorithm()
+        self._executor = self._create_executor()
+
+    @staticmethod
+    def _create_executor() -> Optional[Executor]:
+        """Create the pool that computes the recommendations of different markets in parallel.
+
+        The vectorised algorithms spend most of their time in NumPy, hence threads are enough for
+        them. The gsy_framework algorithms are pure Python and need a process pool instead.
+        """
+        if gsy_e.constants.PARALLEL_MATCHING_WORKERS <= 1:
+            return None
+        if gsy_e.constants.VECTORISED_MATCHING_ALGORITHMS:
+            return ThreadPoolExecutor(max_workers=gsy_e.constants.PARALLEL_MATCHING_WORKERS)
+        return ProcessPoolExecutor(max_workers=gsy_e.constants.PARALLEL_MATCHING_WORKERS)
 
     def _get_matches_recommendations(self, data):
         """Wrapper for matching algorithm's matches recommendations."""
@@ -58,41 +166,91 @@ class MycoInternalMatcher(MycoMatcherInterface):
             return BestClusterPayAsClearMatchingAlgorithm()
         if (ConstSettings.MASettings.BID_OFFER_MATCH_TYPE ==
                 BidOfferMatchAlgoEnum.PAY_AS_BID.value):
+            if gsy_e.constants.VECTORISED_MATCHING_ALGORITHMS:
+                return VectorisedPayAsBidMatchingAlgorithm()
             return PayAsBidMatchingAlgorithm()
         if (ConstSettings.MASettings.BID_OFFER_MATCH_TYPE ==
                 BidOfferMatchAlgoEnum.PAY_AS_CLEAR.value):
+            if gsy_e.constants.VECTORISED_MATCHING_ALGORITHMS:
+                return VectorisedPayAsClearMatchingAlgorithm()
             return PayAsClearMatchingAlgorithm()
         raise WrongMarketTypeException("Wrong market type setting flag "
                                        f"{ConstSettings.MASettings.MARKET_TYPE}")
 
-    def match_recommendations(self, **kwargs):
-        """Request trade recommendations and match them in the relevant market."""
+    def _get_markets_orders(self) -> List[MarketOrdersCache]:
+        """Return the orders caches of all markets that have both bids and offers."""
+        markets_orders = []
         for area_uuid, area_data in self.area_uuid_markets_mapping.items():
             markets = [*area_data["markets"], *area_data["settlement_markets"]]
             if global_objects.future_market_counter.is_time_for_clearing(
                     area_data["current_time"]):
                 markets.append(area_data["future_markets"])
             for market in markets:
-                if not market:
+                if not market or not market.bids or not market.offers:
                     continue
-                while True:
-                    # Perform matching until all recommendations and their residuals are handled.
-                    orders = market.orders_per_slot()
-
-                    # Format should be: {area_uuid: {time_slot: {"bids": [], "offers": [], ...}}}
-                    data = {
-                        area_uuid: {
-                            time_slot: {**orders_data, "current_time": area_data["current_time"]}
-                            for time_slot, orders_data in orders.items()}}
-                    bid_offer_pairs = self._get_matches_recommendations(data)
-                    if not bid_offer_pairs:
-                        break
-                    trades_occurred = market.match_recommendations(bid_offer_pairs)
-                    if not trades_occurred:
-                        break
+                markets_orders.append(
+                    MarketOrdersCache(market, area_uuid, area_data["current_time"]))
+        return markets_orders
+
+    def match_recommendations(self, **kwargs):
+        """Request trade recommendations and match them in the relevant market."""
+        markets_orders = self._get_markets_orders()
+        if self._executor is not None and len(markets_orders) > 1:
+            self._match_markets_in_parallel(markets_orders)
+        else:
+            for market_orders in markets_orders:
+                self._match_market(market_orders)
 
         self.area_uuid_markets_mapping = {}
 
+    def _match_market(self, market_orders: MarketOrdersCache) -> None:
+        """Match the market on the calling thread."""
+        while True:
+            # Perform matching until all recommendations and their residuals are handled.
+            bid_offer_pairs = self._get_matches_recommendations(market_orders.matching_data())
+            if not bid_offer_pairs:
+                break
+            trades_occurred = market_orders.market.match_recommendations(bid_offer_pairs)
+            if not trades_occurred:
+                break
+
+    def _merge_clearing_state(self, clearing_state: Dict) -> None:
+        """Merge the state that an algorithm of a worker filled into the matcher's algorithm."""
+        for attribute, markets_state in clearing_state.items():
+            state = getattr(self.match_algorithm.state, attribute)
+            for market_id, values in markets_state.items():
+                state.setdefault(market_id, {}).update(values)
+
+    def _match_markets_in_parallel(self, markets_orders: List[MarketOrdersCache]) -> None:
+        """Match the markets in rounds, computing the recommendations of a round in parallel.
+
+        The recommendations are applied on the calling thread in the order of the markets, so
+        that the resulting trades do not depend on the scheduling of the workers. Markets with
+        trades are matched again in the next round, until all residuals are handled.
+        """
+        retries = {}
+        while markets_orders:
+            results = self._executor.map(
+                _get_recommendations_from_new_algorithm, repeat(type(self.match_algorithm)),
+                [market_orders.matching_data() for market_orders in markets_orders])
+            markets_with_trades = []
+            for market_orders, (bid_offer_pairs, clearing_state) in zip(markets_orders, results):
+                self._merge_clearing_state(clearing_state)
+                if not bid_offer_pairs:
+                    continue
+                try:
+                    if market_orders.market.match_recommendations(bid_offer_pairs):
+                        markets_with_trades.append(market_orders)
+                except InvalidBidOfferPairException:
+                    # Trades of markets applied earlier in this round changed the orders of
+                    # this market, match it again using its current orders.
+                    retries[market_orders] = retries.get(market_orders, 0) + 1
+                    if retries[market_orders] < MAX_PARALLEL_MATCHING_RETRIES:
+                        markets_with_trades.append(market_orders)
+                    else:
+                        self._match_market(market_orders)
+            markets_orders = markets_with_trades
+
     def event_tick(self, **kwargs) -> None:
         pass
 
@@ -100,4 +258,6 @@ class MycoInternalMatcher(MycoMatcherInterface):
         pass
 
     def event_finish(self, **kwargs) -> None:
-        pass
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
@@ -0,0 +1,235 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from gsy_framework.constants_limits import ConstSettings
+from gsy_framework.data_classes import BidOfferMatch, Clearing
+from gsy_framework.matching_algorithms import (
+    PayAsBidMatchingAlgorithm, PayAsClearMatchingAlgorithm)
+
+from gsy_e.constants import FLOATING_POINT_TOLERANCE
+
+
+class PackedOrders:
+    """Orders of one market slot packed into NumPy arrays, sorted by energy rate.
+
+    Orders are deduplicated by id and sorted the same way as the gsy_framework algorithms sort
+    them (stable ascending sort, reversed for descending order), so that the vectorised
+    algorithms pick the same orders in case of equal energy rates.
+    """
+
+    def __init__(self, orders: Optional[List[Dict]], descending: bool):
+        orders = list({order["id"]: order for order in orders or []}.values())
+        rates = np.fromiter((order["energy_rate"] for order in orders), float, len(orders))
+        sort_indices = np.argsort(rates, kind="stable")
+        if descending:
+            sort_indices = sort_indices[::-1]
+        self.orders = [orders[index] for index in sort_indices]
+        self.rates = rates[sort_indices]
+        self.energies = np.fromiter(
+            (order["energy"] for order in self.orders), float, len(self.orders))
+        self.has_requirements = any(order.get("requirements") for order in self.orders)
+
+    def __len__(self):
+        return len(self.orders)
+
+
+def _create_match(market_id: str, time_slot: str, bid: Dict, offer: Dict,
+                  selected_energy: float, trade_rate: float) -> Dict:
+    return BidOfferMatch(
+        market_id=market_id, time_slot=time_slot, bid=bid, offer=offer,
+        selected_energy=selected_energy, trade_rate=trade_rate).serializable_dict()
+
+
+class VectorisedPayAsBidMatchingAlgorithm(PayAsBidMatchingAlgorithm):
+    """Pay as bid matching algorithm operating on NumPy arrays.
+
+    Produces the same recommendations as the gsy_framework PayAsBidMatchingAlgorithm: offers are
+    visited from the most to the least expensive one and each one is matched with the most
+    expensive bid that was not yet selected, at the energy rate of the bid. Slots with order
+    requirements are delegated to the gsy_framework algorithm.
+    """
+
+    def get_matches_recommendations(self, matching_data: Dict) -> List[Dict]:
+        recommendations = []
+        for market_id, time_slot_data in matching_data.items():
+            for time_slot, data in time_slot_data.items():
+                bids = PackedOrders(data.get("bids"), descending=True)
+                offers = PackedOrders(data.get("offers"), descending=True)
+                if not bids or not offers:
+                    continue
+                if bids.has_requirements or offers.has_requirements:
+                    recommendations.extend(super().get_matches_recommendations(
+                        {market_id: {time_slot: data}}))
+                    continue
+                for offer_index, bid_index in self._get_matched_indices(bids, offers):
+                    bid, offer = bids.orders[bid_index], offers.orders[offer_index]
+                    recommendations.append(_create_match(
+                        market_id, time_slot, bid, offer,
+                        min(bid["energy"], offer["energy"]), bid["energy_rate"]))
+        return recommendations
+
+    @classmethod
+    def _get_matched_indices(
+            cls, bids: PackedOrders, offers: PackedOrders) -> List[Tuple[int, int]]:
+        """Return the (offer_index, bid_index) pairs of the matches, in matching order."""
+        sellers = {offer["seller"] for offer in offers.orders}
+        if any(bid["buyer"] in sellers for bid in bids.orders):
+            return cls._get_matched_indices_excluding_own_orders(bids, offers)
+
+        # Offers are visited in descending order and always take the most expensive free bid,
+        # hence bid j is matched with the first offer after the one matched with bid j-1 that
+        # is affordable for bid j. The first affordable offer per bid is found with a binary
+        # search on the (ascending) negated offer rates.
+        first_affordable_offer = np.searchsorted(
+            -offers.rates, -(bids.rates + FLOATING_POINT_TOLERANCE), side="left")
+        bid_indices = np.arange(len(bids))
+        offer_indices = bid_indices + np.maximum.accumulate(first_affordable_offer - bid_indices)
+        matched_count = int(np.count_nonzero(offer_indices < len(offers)))
+        return list(zip(offer_indices[:matched_count].tolist(),
+                        bid_indices[:matched_count].tolist()))
+
+    @staticmethod
+    def _get_matched_indices_excluding_own_orders(
+            bids: PackedOrders, offers: PackedOrders) -> List[Tuple[int, int]]:
+        """Match sequentially, skipping bids that belong to the seller of the offer."""
+        bid_rates = bids.rates.tolist()
+        buyers = [bid["buyer"] for bid in bids.orders]
+        selected_bids = [False] * len(bids)
+        first_free_bid = 0
+        matched_indices = []
+        for offer_index, (offer_rate, offer) in enumerate(zip(offers.rates.tolist(),
+                                                              offers.orders)):
+            while first_free_bid < len(bids) and selected_bids[first_free_bid]:
+                first_free_bid += 1
+            for bid_index in range(first_free_bid, len(bids)):
+                if selected_bids[bid_index] or buyers[bid_index] == offer["seller"]:
+                    continue
+                # Bids are sorted in descending order, if the first candidate can not afford
+                # the offer, none of the remaining bids can either
+                if offer_rate - bid_rates[bid_index] <= FLOATING_POINT_TOLERANCE:
+                    selected_bids[bid_index] = True
+                    matched_indices.append((offer_index, bid_index))
+                break
+        return matched_indices
+
+
+class VectorisedPayAsClearMatchingAlgorithm(PayAsClearMatchingAlgorithm):
+    """Pay as clear matching algorithm operating on NumPy arrays.
+
+    The clearing point is computed from the cumulative supply and demand curves with
+    sorted cumulative sums and binary searches, instead of comparing every bid rate with every
+    offer rate. Bids and offers inside the clearing point are then matched in rate order at the
+    clearing rate. Slots with order requirements, or aggregation algorithms other than the
+    cumulative curves one, are delegated to the gsy_framework algorithm.
+
+    Like the gsy_framework algorithm, the cumulative curves and the clearing point of each market
+    are kept in self.state, for the clearing rate export and the supply / demand curve plots.
+    """
+
+    def get_matches_recommendations(self, matching_data: Dict) -> List[Dict]:
+        recommendations = []
+        for market_id, time_slot_data in matching_data.items():
+            for time_slot, data in time_slot_data.items():
+                bids = PackedOrders(data.get("bids"), descending=True)
+                offers = PackedOrders(data.get("offers"), descending=False)
+                if not bids or not offers:
+                    continue
+                if (bids.has_requirements or offers.has_requirements or
+                        ConstSettings.MASettings.PAY_AS_CLEAR_AGGREGATION_ALGORITHM != 1):
+                    recommendations.extend(super().get_matches_recommendations(
+                        {market_id: {time_slot: data}}))
+                    continue
+                clearing = self.get_vectorised_clearing_point(bids, offers)
+                self._update_state(market_id, data.get("current_time"), bids, offers, clearing)
+                if clearing is None or clearing[1] <= 0:
+                    continue
+                recommendations.extend(
+                    self._create_matches(market_id, time_slot, bids, offers, *clearing))
+        return recommendations
+
+    def _update_state(self, market_id: str, current_time, bids: PackedOrders,
+                      offers: PackedOrders, clearing: Optional[Tuple[float, float]]) -> None:
+        """Store the cumulative curves and the clearing point, as the gsy_framework does."""
+        for cumulative_orders, orders in ((self.state.cumulative_bids, bids),
+                                          (self.state.cumulative_offers, offers)):
+            rates, energies = self._cumulative_energy_per_rate(orders)
+            cumulative_orders.setdefault(market_id, {})[current_time] = dict(
+                zip(rates.tolist(), energies.tolist()))
+        if clearing is not None:
+            self.state.clearing.setdefault(market_id, {})[current_time] = Clearing(
+                rate=clearing[0], energy=clearing[1])
+
+    @staticmethod
+    def _cumulative_energy_per_rate(orders: PackedOrders) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the distinct rates and the cumulative energy up to (and including) each."""
+        cumulative_energy = np.cumsum(orders.energies)
+        last_of_rate = np.append(orders.rates[1:] != orders.rates[:-1], True)
+        return orders.rates[last_of_rate], cumulative_energy[last_of_rate]
+
+    @classmethod
+    def get_vectorised_clearing_point(
+            cls, bids: PackedOrders, offers: PackedOrders) -> Optional[Tuple[float, float]]:
+        """Return the (clearing_rate, clearing_energy) of the packed bids and offers."""
+        bid_rates, bid_energies = cls._cumulative_energy_per_rate(bids)
+        offer_rates, offer_energies = cls._cumulative_energy_per_rate(offers)
+        # Index of the most expensive offer rate that is affordable for each bid rate
+        last_affordable_offer = np.searchsorted(
+            offer_rates, bid_rates + FLOATING_POINT_TOLERANCE, side="right") - 1
+        has_affordable_offer = last_affordable_offer >= 0
+        if not has_affordable_offer.any():
+            return None
+        cleared_energies = np.where(
+            has_affordable_offer,
+            np.minimum(bid_energies, offer_energies[np.maximum(last_affordable_offer, 0)]),
+            -np.inf)
+        clearing_index = int(np.argmax(cleared_energies))
+        return float(bid_rates[clearing_index]), float(cleared_energies[clearing_index])
+
+    @staticmethod
+    def _create_matches(market_id: str, time_slot: str, bids: PackedOrders,
+                        offers: PackedOrders, clearing_rate: float,
+                        clearing_energy: float) -> List[Dict]:
+        """Split the clearing energy between the accepted bids and offers, in rate order."""
+        accepted_bids = np.count_nonzero(
+            bids.rates + FLOATING_POINT_TOLERANCE >= clearing_rate)
+        accepted_offers = np.count_nonzero(
+            offers.rates <= clearing_rate + FLOATING_POINT_TOLERANCE)
+        bid_energy_limits = np.minimum(
+            np.cumsum(bids.energies[:accepted_bids]), clearing_energy)
+        offer_energy_limits = np.minimum(
+            np.cumsum(offers.energies[:accepted_offers]), clearing_energy)
+        # Every breakpoint of the two cumulative curves starts a new bid / offer pair
+        breakpoints = np.union1d(bid_energy_limits, offer_energy_limits)
+        segment_starts = np.concatenate(([0.], breakpoints[:-1]))
+        segment_energies = breakpoints - segment_starts
+        segment_middles = segment_starts + segment_energies / 2
+        bid_indices = np.searchsorted(bid_energy_limits, segment_middles)
+        offer_indices = np.searchsorted(offer_energy_limits, segment_middles)
+
+        matches = []
+        for bid_index, offer_index, energy in zip(
+                bid_indices.tolist(), offer_indices.tolist(), segment_energies.tolist()):
+            if energy <= FLOATING_POINT_TOLERANCE:
+                continue
+            bid, offer = bids.orders[bid_index], offers.orders[offer_index]
+            matches.append(_create_match(market_id, time_slot, bid, offer,
+                                         min(energy, bid["energy"], offer["energy"]),
+                                         clearing_rate))
+        return matches
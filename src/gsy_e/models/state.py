@@ -28,7 +28,9 @@ from gsy_framework.utils import (
 from pendulum import DateTime
 
 from gsy_e.constants import FLOATING_POINT_TOLERANCE
-from gsy_e.gsy_e_core.util import is_time_slot_in_past_markets, write_default_to_dict
+from gsy_e.gsy_e_core.time_slot_series import (
+    TimeSlotSeries, delete_time_slots_before, sum_time_slots_from)
+from gsy_e.gsy_e_core.util import get_past_markets_threshold, write_default_to_dict
 
 StorageSettings = ConstSettings.StorageSettings
 
@@ -72,9 +74,9 @@ class ProsumptionInterface(StateInterface, ABC):
 
     def __init__(self):
         # Actual energy consumed/produced by the device at specific market slots
-        self._energy_measurement_kWh: Dict[DateTime, float] = {}
-        self._unsettled_deviation_kWh: Dict[DateTime, float] = {}
-        self._forecast_measurement_deviation_kWh: Dict[DateTime, float] = {}
+        self._energy_measurement_kWh: Dict[DateTime, float] = TimeSlotSeries()
+        self._unsettled_deviation_kWh: Dict[DateTime, float] = TimeSlotSeries()
+        self._forecast_measurement_deviation_kWh: Dict[DateTime, float] = TimeSlotSeries()
 
     # pylint: disable=unused-argument, no-self-use
     def _calculate_unsettled_energy_kWh(
@@ -206,9 +208,9 @@ class ConsumptionState(ProsumptionInterface):
     def __init__(self):
         super().__init__()
         # Energy that the load wants to consume (given by the profile or live energy requirements)
-        self._desired_energy_Wh: Dict = {}
+        self._desired_energy_Wh: Dict = TimeSlotSeries()
         # Energy that the load needs to consume. It's reduced when new energy is bought
-        self._energy_requirement_Wh: Dict = {}
+        self._energy_requirement_Wh: Dict = TimeSlotSeries()
         self._total_energy_demanded_Wh: int = 0
 
     def get_state(self) -> Dict:
@@ -270,14 +272,9 @@ class ConsumptionState(ProsumptionInterface):
 
     def delete_past_state_values(self, current_time_slot: DateTime):
         """Delete data regarding energy consumption for past market slots."""
-        to_delete = []
-        for market_slot in self._energy_requirement_Wh:
-            if is_time_slot_in_past_markets(market_slot, current_time_slot):
-                to_delete.append(market_slot)
-
-        for market_slot in to_delete:
-            self._energy_requirement_Wh.pop(market_slot, None)
-            self._desired_energy_Wh.pop(market_slot, None)
+        threshold = get_past_markets_threshold(current_time_slot)
+        delete_time_slots_before(self._energy_requirement_Wh, threshold)
+        delete_time_slots_before(self._desired_energy_Wh, threshold)
 
     def get_desired_energy_Wh(self, time_slot, default_value=0.0):
         """Return the expected consumed energy at a specific market slot."""
@@ -289,8 +286,8 @@ class ProductionState(ProsumptionInterface):
 
     def __init__(self):
         super().__init__()
-        self._available_energy_kWh = {}
-        self._energy_production_forecast_kWh = {}
+        self._available_energy_kWh = TimeSlotSeries()
+        self._energy_production_forecast_kWh = TimeSlotSeries()
 
     def get_state(self) -> Dict:
         """Return the current state of the device. Extends super implementation."""
@@ -345,14 +342,9 @@ class ProductionState(ProsumptionInterface):
 
     def delete_past_state_values(self, current_time_slot: DateTime):
         """Delete data regarding energy production for past market slots."""
-        to_delete = []
-        for market_slot in self._available_energy_kWh:
-            if is_time_slot_in_past_markets(market_slot, current_time_slot):
-                to_delete.append(market_slot)
-
-        for market_slot in to_delete:
-            self._available_energy_kWh.pop(market_slot, None)
-            self._energy_production_forecast_kWh.pop(market_slot, None)
+        threshold = get_past_markets_threshold(current_time_slot)
+        delete_time_slots_before(self._available_energy_kWh, threshold)
+        delete_time_slots_before(self._energy_production_forecast_kWh, threshold)
 
     def get_energy_production_forecast_kWh(self, time_slot: DateTime, default_value: float = 0.0):
         """Return the expected produced energy at a specific market slot."""
@@ -419,16 +411,10 @@ class SmartMeterState(ConsumptionState, ProductionState):
 
     def delete_past_state_values(self, current_time_slot: DateTime):
         """Delete data regarding energy requirements and availability for past market slots."""
-        to_delete = []
-        for market_slot in self.market_slots:
-            if is_time_slot_in_past_markets(market_slot, current_time_slot):
-                to_delete.append(market_slot)
-
-        for market_slot in to_delete:
-            self._available_energy_kWh.pop(market_slot, None)
-            self._energy_production_forecast_kWh.pop(market_slot, None)
-            self._energy_requirement_Wh.pop(market_slot, None)
-            self._desired_energy_Wh.pop(market_slot, None)
+        threshold = get_past_markets_threshold(current_time_slot)
+        for time_series in (self._available_energy_kWh, self._energy_production_forecast_kWh,
+                            self._energy_requirement_Wh, self._desired_energy_Wh):
+            delete_time_slots_before(time_series, threshold)
 
     def get_energy_at_market_slot(self, time_slot: DateTime) -> float:
         """Return the energy produced/consumed by the device at a specific market slot (in kWh).
@@ -476,21 +462,22 @@ class StorageState(StateInterface):
         self.max_abs_battery_power_kW = max_abs_battery_power_kW
 
         # storage capacity, that is already sold:
-        self.pledged_sell_kWh = {}
+        self.pledged_sell_kWh = TimeSlotSeries()
         # storage capacity, that has been offered (but not traded yet):
-        self.offered_sell_kWh = {}
+        self.offered_sell_kWh = TimeSlotSeries()
         # energy, that has been bought:
-        self.pledged_buy_kWh = {}
+        self.pledged_buy_kWh = TimeSlotSeries()
         # energy, that the storage wants to buy (but not traded yet):
-        self.offered_buy_kWh = {}
+        self.offered_buy_kWh = TimeSlotSeries()
         self.time_series_ess_share = {}
 
-        self.charge_history = {}
-        self.charge_history_kWh = {}
-        self.offered_history = {}
-        self.used_history = {}  # type: Dict[DateTime, float]
-        self.energy_to_buy_dict = {}
-        self.energy_to_sell_dict = {}
+        self.charge_history = TimeSlotSeries()
+        self.charge_history_kWh = TimeSlotSeries()
+        # the histories contain "-" for the time slots without values
+        self.offered_history = TimeSlotSeries()
+        self.used_history = TimeSlotSeries()  # type: Dict[DateTime, float]
+        self.energy_to_buy_dict = TimeSlotSeries()
+        self.energy_to_sell_dict = TimeSlotSeries()
 
         self._used_storage = self.initial_capacity_kWh
         self._battery_energy_per_slot = 0.0
@@ -589,12 +576,9 @@ class StorageState(StateInterface):
         """
         Determines available energy to sell for each active market and returns a dict[TIME, FLOAT]
         """
-        accumulated_pledged = 0
-        accumulated_offered = 0
-        for time_slot, offered_sell_energy in self.offered_sell_kWh.items():
-            if time_slot >= self._current_market_slot:
-                accumulated_pledged += self.pledged_sell_kWh[time_slot]
-                accumulated_offered += offered_sell_energy
+        # pledged and offered energy are tracked for the same time slots
+        accumulated_pledged = sum_time_slots_from(self.pledged_sell_kWh, self._current_market_slot)
+        accumulated_offered = sum_time_slots_from(self.offered_sell_kWh, self._current_market_slot)
 
         available_energy_for_all_slots = (
                 self.used_storage
@@ -622,13 +606,9 @@ class StorageState(StateInterface):
         self.energy_to_buy_dict
         """
 
-        accumulated_bought = 0
-        accumulated_sought = 0
-
-        for time_slot, offered_buy_energy in self.offered_buy_kWh.items():
-            if time_slot >= self._current_market_slot:
-                accumulated_bought += self.pledged_buy_kWh[time_slot]
-                accumulated_sought += offered_buy_energy
+        # pledged and offered energy are tracked for the same time slots
+        accumulated_bought = sum_time_slots_from(self.pledged_buy_kWh, self._current_market_slot)
+        accumulated_sought = sum_time_slots_from(self.offered_buy_kWh, self._current_market_slot)
         available_energy_for_all_slots = limit_float_precision(
             self.capacity - self.used_storage - accumulated_bought - accumulated_sought)
 
@@ -723,21 +703,12 @@ class StorageState(StateInterface):
         Clean up values from past market slots that are not used anymore. Useful for
         deallocating memory that is not used anymore.
         """
-        to_delete = []
-        for market_slot in self.pledged_sell_kWh:
-            if is_time_slot_in_past_markets(market_slot, current_time_slot):
-                to_delete.append(market_slot)
-        for market_slot in to_delete:
-            self.pledged_sell_kWh.pop(market_slot, None)
-            self.offered_sell_kWh.pop(market_slot, None)
-            self.pledged_buy_kWh.pop(market_slot, None)
-            self.offered_buy_kWh.pop(market_slot, None)
-            self.charge_history.pop(market_slot, None)
-            self.charge_history_kWh.pop(market_slot, None)
-            self.offered_history.pop(market_slot, None)
-            self.used_history.pop(market_slot, None)
-            self.energy_to_buy_dict.pop(market_slot, None)
-            self.energy_to_sell_dict.pop(market_slot, None)
+        threshold = get_past_markets_threshold(current_time_slot)
+        for time_series in (self.pledged_sell_kWh, self.offered_sell_kWh, self.pledged_buy_kWh,
+                            self.offered_buy_kWh, self.charge_history, self.charge_history_kWh,
+                            self.offered_history, self.used_history, self.energy_to_buy_dict,
+                            self.energy_to_sell_dict):
+            delete_time_slots_before(time_series, threshold)
 
     def register_energy_from_posted_bid(self, energy: float, time_slot: DateTime):
         """Register the energy from a posted bid on the market."""
@@ -19,9 +19,11 @@ import json
 import logging
 import sys
 from abc import ABC
-from dataclasses import dataclass
+from collections import UserDict
+from dataclasses import dataclass, field
 from logging import getLogger
-from typing import List, Dict, Union, Optional, Generator, Callable, TYPE_CHECKING
+from typing import (
+    List, Dict, KeysView, Union, Optional, Generator, Callable, TYPE_CHECKING)
 from uuid import uuid4
 
 from gsy_framework.constants_limits import ConstSettings
@@ -38,7 +40,6 @@ from gsy_e.events.event_structures import AreaEvent, MarketEvent
 from gsy_e.gsy_e_core.device_registry import DeviceRegistry
 from gsy_e.gsy_e_core.exceptions import D3ARedisException, SimulationException, MarketException
 from gsy_e.gsy_e_core.redis_connections.redis_area_market_communicator import BlockingCommunicator
-from gsy_e.gsy_e_core.util import append_or_create_key
 from gsy_e.models.base import AreaBehaviorBase
 from gsy_e.models.config import SimulationConfig
 from gsy_e.models.market import MarketBase
@@ -102,10 +103,7 @@ class _TradeLookerUpper:
         self.owner_name = owner_name
 
     def __getitem__(self, market: MarketBase) -> Generator[Trade, None, None]:
-        for trade in market.trades:
-            owner_name = self.owner_name
-            if owner_name in (trade.seller, trade.buyer):
-                yield trade
+        yield from market.participant_trades(self.owner_name)
 
 
 def market_strategy_connection_adapter_factory() -> Union["MarketStrategyConnectionAdapter",
@@ -247,6 +245,164 @@ class MarketStrategyConnectionAdapter:
         return market.offer(**offer_kwargs)
 
 
+@dataclass
+class _OrdersSummary:
+    """Orders of one market (or market time slot) of a strategy, with their energy and price."""
+    orders: List[Union[Offer, Bid]] = field(default_factory=list)
+    energy: float = 0
+    price: float = 0
+
+    def add(self, order: Union[Offer, Bid]) -> None:
+        """Add the order and its energy and price to the totals."""
+        self.orders.append(order)
+        self.energy += order.energy
+        self.price += order.price
+
+
+class MarketOrders(UserDict):
+    """Mapping of {market_id: [orders]} that indexes the orders by time slot and order id.
+
+    The energy and price totals of every market and market time slot are updated whenever an order
+    is added, hence add() should be used instead of appending to the lists of the mapping.
+    Replacing the orders of a market re-indexes the market. The orders are expected not to change
+    their energy or price after they are added.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._summaries: Dict[str, Dict[Optional[DateTime], _OrdersSummary]] = {}
+        self._orders_by_id: Dict[str, Dict[str, List[Union[Offer, Bid]]]] = {}
+        super().__init__(*args, **kwargs)
+
+    def __setitem__(self, market_id: str, orders: List[Union[Offer, Bid]]) -> None:
+        self.data[market_id] = orders
+        self._summaries[market_id] = {}
+        self._orders_by_id[market_id] = {}
+        for order in orders:
+            self._index(market_id, order)
+
+    def __delitem__(self, market_id: str) -> None:
+        del self.data[market_id]
+        del self._summaries[market_id]
+        del self._orders_by_id[market_id]
+
+    def copy(self) -> "MarketOrders":
+        """Return a shallow copy of the mapping, with indexes of its own."""
+        return self.__class__({market_id: list(orders) for market_id, orders in self.data.items()})
+
+    __copy__ = copy
+
+    def _index(self, market_id: str, order: Union[Offer, Bid]) -> None:
+        summaries = self._summaries[market_id]
+        for time_slot in {None, order.time_slot}:
+            if time_slot not in summaries:
+                summaries[time_slot] = _OrdersSummary()
+            summaries[time_slot].add(order)
+        self._orders_by_id[market_id].setdefault(order.id, []).append(order)
+
+    def add(self, market_id: str, order: Union[Offer, Bid]) -> None:
+        """Append the order to the orders of the market."""
+        if market_id not in self.data:
+            self[market_id] = []
+        self.data[market_id].append(order)
+        self._index(market_id, order)
+
+    def in_market(self, market_id: str,
+                  time_slot: Optional[DateTime] = None) -> List[Union[Offer, Bid]]:
+        """Return the orders of the market, optionally only the ones of the time slot."""
+        summary = self._summaries.get(market_id, {}).get(time_slot)
+        return list(summary.orders) if summary else []
+
+    def energy(self, market_id: str, time_slot: Optional[DateTime] = None) -> float:
+        """Return the total energy of the orders of the market (and time slot)."""
+        summary = self._summaries.get(market_id, {}).get(time_slot)
+        return summary.energy if summary else 0.0
+
+    def price(self, market_id: str, time_slot: Optional[DateTime] = None) -> float:
+        """Return the total price of the orders of the market (and time slot)."""
+        summary = self._summaries.get(market_id, {}).get(time_slot)
+        return summary.price if summary else 0.0
+
+    def order_ids(self, market_id: str) -> KeysView[str]:
+        """Return the ids of the orders of the market."""
+        return self._orders_by_id.get(market_id, {}).keys()
+
+    def with_id(self, market_id: str, order_id: str) -> List[Union[Offer, Bid]]:
+        """Return the orders of the market with the given id."""
+        return self._orders_by_id.get(market_id, {}).get(order_id, [])
+
+    def contains(self, market_id: str, order: Union[Offer, Bid]) -> bool:
+        """Check whether the order (or an order equal to it) is one of the market orders."""
+        return order in self.with_id(market_id, order.id)
+
+
+class PostedOffers(UserDict):
+    """Mapping of {offer: market_id} that indexes the offers by market, time slot and offer id.
+
+    The energy total of every market and market time slot is updated whenever an offer is posted,
+    and recalculated on demand after an offer of the market is removed.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._offers_per_market: Dict[str, Dict[Optional[DateTime], Dict[Offer, None]]] = {}
+        self._energy_per_market: Dict[str, Dict[Optional[DateTime], float]] = {}
+        self._offers_by_id: Dict[str, Dict[Offer, None]] = {}
+        super().__init__(*args, **kwargs)
+
+    def __setitem__(self, offer: Offer, market_id: str) -> None:
+        if offer in self.data:
+            self._unindex(offer, self.data[offer])
+        self.data[offer] = market_id
+        offers_per_slot = self._offers_per_market.setdefault(market_id, {})
+        energy_per_slot = self._energy_per_market.setdefault(market_id, {})
+        for time_slot in {None, offer.time_slot}:
+            offers_per_slot.setdefault(time_slot, {})[offer] = None
+            if time_slot in energy_per_slot:
+                energy_per_slot[time_slot] += offer.energy
+        self._offers_by_id.setdefault(offer.id, {})[offer] = None
+
+    def __delitem__(self, offer: Offer) -> None:
+        self._unindex(offer, self.data.pop(offer))
+
+    def copy(self) -> "PostedOffers":
+        """Return a shallow copy of the mapping, with indexes of its own."""
+        return self.__class__(self.data)
+
+    __copy__ = copy
+
+    def _unindex(self, offer: Offer, market_id: str) -> None:
+        offers_per_slot = self._offers_per_market[market_id]
+        for time_slot in {None, offer.time_slot}:
+            offers_per_slot[time_slot].pop(offer, None)
+            if not offers_per_slot[time_slot]:
+                del offers_per_slot[time_slot]
+            self._energy_per_market[market_id].pop(time_slot, None)
+        offers_with_id = self._offers_by_id[offer.id]
+        offers_with_id.pop(offer, None)
+        if not offers_with_id:
+            del self._offers_by_id[offer.id]
+
+    def in_market(self, market_id: str, time_slot: Optional[DateTime] = None) -> List[Offer]:
+        """Return the offers posted in the market, optionally only the ones of the time slot."""
+        return list(self._offers_per_market.get(market_id, {}).get(time_slot, {}))
+
+    def energy(self, market_id: str, time_slot: Optional[DateTime] = None) -> float:
+        """Return the total energy of the offers posted in the market (and time slot)."""
+        energy_per_slot = self._energy_per_market.setdefault(market_id, {})
+        if time_slot not in energy_per_slot:
+            energy_per_slot[time_slot] = sum(
+                offer.energy for offer in self.in_market(market_id, time_slot))
+        return energy_per_slot[time_slot]
+
+    def with_id(self, offer_id: str) -> List[Offer]:
+        """Return the posted offers (of all markets) with the given id."""
+        return list(self._offers_by_id.get(offer_id, {}))
+
+    def is_posted(self, market_id: str, offer_id: str) -> bool:
+        """Check whether an offer with the given id is posted in the market."""
+        return any(self.data[offer] == market_id
+                   for offer in self._offers_by_id.get(offer_id, {}))
+
+
 class Offers:
     """
     Keep track of a strategy's accepted and own offers.
@@ -261,10 +417,28 @@ class Offers:
     def __init__(self, strategy: "BaseStrategy"):
         self.strategy = strategy
         self.bought = {}  # type: Dict[Offer, str]
-        self.posted = {}  # type: Dict[Offer, str]
-        self.sold = {}  # type: Dict[str, List[Offer]]
+        self._posted = PostedOffers()
+        self._sold = MarketOrders()
         self.split = {}  # type: Dict[str, Offer]
 
+    @property
+    def posted(self) -> PostedOffers:
+        """Return the posted offers, as a mapping of {offer: market_id}."""
+        return self._posted
+
+    @posted.setter
+    def posted(self, offers: Dict[Offer, str]) -> None:
+        self._posted = PostedOffers(offers)
+
+    @property
+    def sold(self) -> MarketOrders:
+        """Return the sold offers, as a mapping of {market_id: [offers]}."""
+        return self._sold
+
+    @sold.setter
+    def sold(self, offers: Dict[str, List[Offer]]) -> None:
+        self._sold = MarketOrders(offers)
+
     def _delete_past_offers(self, existing_offers: Dict[Offer, str]) -> Dict[Offer, str]:
         offers = {}
         for offer, market_id in existing_offers.items():
@@ -282,13 +456,8 @@ class Offers:
     @property
     def open(self) -> Dict[Offer, str]:
         """Return all open offers on all markets"""
-        open_offers = {}
-        for offer, market_id in self.posted.items():
-            if market_id not in self.sold:
-                self.sold[market_id] = []
-            if offer not in self.sold[market_id]:
-                open_offers[offer] = market_id
-        return open_offers
+        return {offer: market_id for offer, market_id in self.posted.items()
+                if not self.sold.contains(market_id, offer)}
 
     def bought_offer(self, offer: Offer, market_id: str) -> None:
         """Store bought offer"""
@@ -296,29 +465,17 @@ class Offers:
 
     def sold_offer(self, offer: Offer, market_id: str) -> None:
         """Store sold offer"""
-        self.sold = append_or_create_key(self.sold, market_id, offer)
+        self.sold.add(market_id, offer)
 
     def is_offer_posted(self, market_id: str, offer_id: str) -> bool:
         """Check if offer is posted on the market"""
-        return offer_id in [offer.id for offer, _market in self.posted.items()
-                            if market_id == _market]
-
-    def _get_sold_offer_ids_in_market(self, market_id: str) -> List[str]:
-        sold_offer_ids = []
-        for sold_offer in self.sold.get(market_id, []):
-            sold_offer_ids.append(sold_offer.id)
-        return sold_offer_ids
+        return self.posted.is_posted(market_id, offer_id)
 
     def open_in_market(self, market_id: str, time_slot: DateTime = None) -> List[Offer]:
         """Get all open offers in market"""
-        open_offers = []
-        sold_offer_ids = self._get_sold_offer_ids_in_market(market_id)
-        for offer, _market_id in self.posted.items():
-            if (offer.id not in sold_offer_ids
-                    and market_id == _market_id
-                    and (time_slot is None or offer.time_slot == time_slot)):
-                open_offers.append(offer)
-        return open_offers
+        sold_offer_ids = self.sold.order_ids(market_id)
+        return [offer for offer in self.posted.in_market(market_id, time_slot)
+                if offer.id not in sold_offer_ids]
 
     def open_offer_energy(self, market_id: str, time_slot: DateTime = None) -> float:
         """Get sum of open offers' energy in market"""
@@ -326,27 +483,19 @@ class Offers:
 
     def posted_in_market(self, market_id: str, time_slot: DateTime = None) -> List[Offer]:
         """Get list of posted offers in market"""
-        return [offer
-                for offer, _market in self.posted.items()
-                if market_id == _market and (time_slot is None or offer.time_slot == time_slot)]
+        return self.posted.in_market(market_id, time_slot)
 
     def posted_offer_energy(self, market_id: str, time_slot: DateTime = None) -> float:
         """Get energy of all posted offers"""
-        return sum(o.energy
-                   for o in self.posted_in_market(market_id, time_slot)
-                   if time_slot is None or o.time_slot == time_slot)
+        return self.posted.energy(market_id, time_slot)
 
     def sold_offer_energy(self, market_id: str, time_slot: DateTime = None) -> float:
         """Get energy of all sold offers"""
-        return sum(o.energy
-                   for o in self.sold_in_market(market_id)
-                   if time_slot is None or o.time_slot == time_slot)
+        return self.sold.energy(market_id, time_slot)
 
     def sold_offer_price(self, market_id: str, time_slot: DateTime = None) -> float:
         """Get sum of all sold offers' price"""
-        return sum(o.price
-                   for o in self.sold_in_market(market_id)
-                   if time_slot is None or o.time_slot == time_slot)
+        return self.sold.price(market_id, time_slot)
 
     def sold_in_market(self, market_id: str) -> List[Offer]:
         """Get list of sold offers in a market"""
@@ -395,7 +544,7 @@ class Offers:
         if offer_id is None:
             to_delete_offers = self.open_in_market(market.id)
         else:
-            to_delete_offers = [o for o, m in self.posted.items() if o.id == offer_id]
+            to_delete_offers = self.posted.with_id(offer_id)
         deleted_offer_ids = []
         for offer in to_delete_offers:
             market.delete_offer(offer.id)
@@ -407,7 +556,7 @@ class Offers:
         try:
             market_id = self.posted.pop(offer)
             assert isinstance(market_id, str)
-            if market_id in self.sold and offer in self.sold[market_id]:
+            if self.sold.contains(market_id, offer):
                 self.strategy.log.warning("Offer already sold, cannot remove it.")
                 self.posted[offer] = market_id
                 return False
@@ -715,8 +864,8 @@ class BidEnabledStrategy(BaseStrategy):
     """
     def __init__(self):
         super().__init__()
-        self._bids = {}
-        self._traded_bids = {}
+        self._bids = MarketOrders()
+        self._traded_bids = MarketOrders()
 
     def energy_traded(self, market_id: str, time_slot: Optional[DateTime] = None) -> float:
         # pylint: disable=fixme
@@ -830,7 +979,7 @@ class BidEnabledStrategy(BaseStrategy):
 
     def is_bid_posted(self, market: "TwoSidedMarket", bid_id: str) -> bool:
         """Check if bid is posted to the market"""
-        return bid_id in [bid.id for bid in self.get_posted_bids(market)]
+        return bid_id in self._bids.order_ids(market.id)
 
     def posted_bid_energy(self, market_id: str, time_slot: Optional[DateTime] = None) -> float:
         """
@@ -843,21 +992,13 @@ class BidEnabledStrategy(BaseStrategy):
         Returns: Total energy of all posted bids
 
         """
-        if market_id not in self._bids:
-            return 0.0
-        return sum(b.energy
-                   for b in self._bids[market_id]
-                   if time_slot is None or b.time_slot == time_slot)
+        return self._bids.energy(market_id, time_slot)
 
     def _traded_bid_energy(self, market_id: str, time_slot: Optional[DateTime] = None) -> float:
-        return sum(b.energy
-                   for b in self._get_traded_bids_from_market(market_id)
-                   if time_slot is None or b.time_slot == time_slot)
+        return self._traded_bids.energy(market_id, time_slot)
 
     def _traded_bid_costs(self, market_id: str, time_slot: Optional[DateTime] = None) -> float:
-        return sum(b.price
-                   for b in self._get_traded_bids_from_market(market_id)
-                   if time_slot is None or b.time_slot == time_slot)
+        return self._traded_bids.price(market_id, time_slot)
 
     def remove_bid_from_pending(self, market_id: str, bid_id: str = None) -> List[str]:
         """Remove bid from pending bids dict"""
@@ -878,15 +1019,11 @@ class BidEnabledStrategy(BaseStrategy):
 
     def add_bid_to_posted(self, market_id: str, bid: Bid) -> None:
         """Add bid to posted bids dict"""
-        if market_id not in self._bids.keys():
-            self._bids[market_id] = []
-        self._bids[market_id].append(bid)
+        self._bids.add(market_id, bid)
 
     def add_bid_to_bought(self, bid: Bid, market_id: str, remove_bid: bool = True) -> None:
         """Add bid to traded bids dict"""
-        if market_id not in self._traded_bids:
-            self._traded_bids[market_id] = []
-        self._traded_bids[market_id].append(bid)
+        self._traded_bids.add(market_id, bid)
         if remove_bid:
             self.remove_bid_from_pending(market_id, bid.id)
 
@@ -897,13 +1034,10 @@ class BidEnabledStrategy(BaseStrategy):
 
     def are_bids_posted(self, market_id: str, time_slot: DateTime = None) -> bool:
         """Checks if any bids have been posted in the market slot with the given ID."""
-        if market_id not in self._bids:
-            return False
         # time_slot is empty when called for spot markets, where we can retrieve the bids for a
         # time_slot only by the market_id. For the future markets, the time_slot needs to be
         # defined for the correct bid selection.
-        return len([bid for bid in self._bids[market_id]
-                    if time_slot is None or bid.time_slot == time_slot]) > 0
+        return len(self._bids.in_market(market_id, time_slot)) > 0
 
     def post_first_bid(self, market: "MarketBase", energy_Wh: float,
                        initial_energy_rate: float) -> Optional[Bid]:
@@ -926,9 +1060,7 @@ class BidEnabledStrategy(BaseStrategy):
     def get_posted_bids(
             self, market: "MarketBase", time_slot: Optional[DateTime] = None) -> List[Bid]:
         """Get list of posted bids from a market"""
-        if market.id not in self._bids:
-            return []
-        return [b for b in self._bids[market.id] if time_slot is None or b.time_slot == time_slot]
+        return self._bids.in_market(market.id, time_slot)
 
     def _assert_bid_can_be_posted_on_market(self, market_id):
         assert (ConstSettings.MASettings.MARKET_TYPE == SpotMarketTypeEnum.TWO_SIDED.value or
@@ -966,8 +1098,8 @@ class BidEnabledStrategy(BaseStrategy):
 
     def event_market_cycle(self) -> None:
         if not constants.RETAIN_PAST_MARKET_STRATEGIES_STATE:
-            self._bids = {}
-            self._traded_bids = {}
+            self._bids = MarketOrders()
+            self._traded_bids = MarketOrders()
             super().event_market_cycle()
 
     def assert_if_trade_bid_price_is_too_high(self, market: "MarketBase", trade: "Trade") -> None:
@@ -983,5 +1115,5 @@ class BidEnabledStrategy(BaseStrategy):
 
         """
         if trade.is_bid_trade and trade.offer_bid.buyer == self.owner.name:
-            bid = [bid for bid in self.get_posted_bids(market) if bid.id == trade.offer_bid.id][0]
+            bid = self._bids.with_id(market.id, trade.offer_bid.id)[0]
             assert trade.trade_rate <= bid.energy_rate + FLOATING_POINT_TOLERANCE
@@ -166,6 +166,10 @@ class ExternalMixin:
         """
         return FutureMarketStrategyInterface()
 
+    def next_tick_wakeup(self, current_tick: int) -> Optional[int]:
+        """External strategies serve the requests of their clients on every tick."""
+        return current_tick
+
     def get_state(self) -> Dict:
         """Get the state of the asset/market."""
         strategy_state = super().get_state()
@@ -534,7 +538,7 @@ class ExternalMixin:
                                    if trade.residual is not None and trade.is_offer_trade
                                    else "None"}
 
-            global_objects.external_global_stats.update()
+            global_objects.external_global_stats.update(area=self.device)
             self.redis.aggregator.add_batch_trade_event(self.device.uuid, event_response_dict)
         elif self.connected:
             event_response_dict = {"device_info": self._device_info_dict,
@@ -13,7 +13,7 @@ You should have received a copy of the GNU General Public License along with thi
 see <http://www.gnu.org/licenses/>.
 """
 
-from typing import TYPE_CHECKING, List, Union
+from typing import TYPE_CHECKING, List, Optional, Union
 
 from gsy_framework.constants_limits import GlobalConfig
 from pendulum import duration, DateTime
@@ -50,8 +50,9 @@ class FutureTemplateStrategyBidUpdater(TemplateStrategyBidUpdater):
 
     def update(self, market: "FutureMarkets", strategy: "BaseStrategy") -> None:
         """Update the price of existing bids to reflect the new rates."""
+        elapsed_seconds = self._elapsed_seconds(strategy)
         for time_slot in strategy.area.future_markets.market_time_slots:
-            if self.time_for_price_update(strategy, time_slot):
+            if self.time_for_price_update(strategy, time_slot, elapsed_seconds):
                 if strategy.are_bids_posted(market.id, time_slot):
                     strategy.update_bid_rates(market, self.get_updated_rate(time_slot))
 
@@ -77,8 +78,9 @@ class FutureTemplateStrategyOfferUpdater(TemplateStrategyOfferUpdater):
 
     def update(self, market: "FutureMarkets", strategy: "BaseStrategy") -> None:
         """Update the price of existing offers to reflect the new rates."""
+        elapsed_seconds = self._elapsed_seconds(strategy)
         for time_slot in strategy.area.future_markets.market_time_slots:
-            if self.time_for_price_update(strategy, time_slot):
+            if self.time_for_price_update(strategy, time_slot, elapsed_seconds):
                 if strategy.are_offers_posted(market.id):
                     strategy.update_offer_rates(market, self.get_updated_rate(time_slot))
 
@@ -96,6 +98,10 @@ class FutureMarketStrategyInterface:
     def event_tick(self, strategy: "BaseStrategy") -> None:
         """Base class method for handling the tick"""
 
+    def get_next_update_tick(self, strategy: "BaseStrategy") -> Optional[int]:
+        """Return the next tick on which event_tick updates orders, None if it never does."""
+        return None
+
     def update_and_populate_price_settings(self, strategy: "BaseStrategy") -> None:
         """Base class method for updating/populating price settings"""
 
@@ -235,8 +241,9 @@ class FutureMarketStrategy(FutureMarketStrategyInterface):
         """
         Update posted settlement bids and offers on market tick.
         Order matters here:
-            - FIRST: the bids and offers need to be updated (update())
-            - SECOND: the update counter has to be increased (increment_update_counter_all_markets)
+            - FIRST: the skipped updates have to be caught up (catch_up_with_skipped_updates)
+            - SECOND: the bids and offers need to be updated (update())
+            - THIRD: the update counter has to be increased (increment_update_counter_all_markets)
         Args:
             strategy: Strategy object of the asset
 
@@ -245,12 +252,23 @@ class FutureMarketStrategy(FutureMarketStrategyInterface):
         """
         if not strategy.area.future_markets:
             return
+        self._bid_updater.catch_up_with_skipped_updates(strategy)
+        self._offer_updater.catch_up_with_skipped_updates(strategy)
         self._bid_updater.update(strategy.area.future_markets, strategy)
         self._offer_updater.update(strategy.area.future_markets, strategy)
 
         self._bid_updater.increment_update_counter_all_markets(strategy)
         self._offer_updater.increment_update_counter_all_markets(strategy)
 
+    def get_next_update_tick(self, strategy: "BaseStrategy") -> Optional[int]:
+        """Return the next tick on which the future bids or offers are updated."""
+        if not strategy.area.future_markets:
+            return None
+        next_update_ticks = [
+            updater.get_next_update_tick(strategy)
+            for updater in (self._bid_updater, self._offer_updater)]
+        return min((tick for tick in next_update_ticks if tick is not None), default=None)
+
 
 def future_market_strategy_factory(
         asset_type: AssetType,
@@ -341,6 +341,7 @@ class LoadHoursStrategy(BidEnabledStrategy):
 
     def event_tick(self):
         """Post bids on market tick. This method is triggered by the TICK event."""
+        self.bid_update.catch_up_with_skipped_updates(self)
         for market in self.active_markets:
             if ConstSettings.MASettings.MARKET_TYPE == SpotMarketTypeEnum.ONE_SIDED.value:
                 self._one_sided_market_event_tick(market)
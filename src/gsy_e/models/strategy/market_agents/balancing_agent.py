@@ -44,6 +44,10 @@ class BalancingAgent(OneSidedAgent):
     def __repr__(self):
         return f"<BalancingAgent {self.name} {self.time_slot_str}>"
 
+    def next_tick_wakeup(self, current_tick: int) -> int:
+        """Balancing trades are checked on every tick."""
+        return current_tick
+
     def event_tick(self):
         super().event_tick()
         if self.lower_market.unmatched_energy_downward > 0.0 or \
@@ -57,6 +57,11 @@ class OneSidedAgent(MarketAgent):
         for engine in sorted(self.engines, key=lambda _: random()):
             engine.tick(area=area)
 
+    def next_tick_wakeup(self, current_tick: int) -> Optional[int]:
+        """The TICK event only forwards orders, wake up when the first engine has work to do."""
+        next_engine_ticks = [engine.next_tick_wakeup(current_tick) for engine in self.engines]
+        return min((tick for tick in next_engine_ticks if tick is not None), default=None)
+
     # pylint: disable=unused-argument
     def event_offer_traded(self, *, market_id, trade):
         for engine in sorted(self.engines, key=lambda _: random()):
@@ -64,6 +64,10 @@ class OneSidedAlternativePricingAgent(OneSidedAgent):
             self.log.exception("Alternative pricing scheme: "
                                "An Error occurred while buying an offer")
 
+    def next_tick_wakeup(self, current_tick: int) -> int:
+        """The alternative pricing schemes buy offers on every tick."""
+        return current_tick
+
     def event_tick(self):
         area = self.owner
         if area.current_tick_in_slot >= self.MIN_SLOT_AGE and \
@@ -45,6 +45,9 @@ class MAEngine:
         # Offer.id -> OfferInfo
         self.forwarded_offers: Dict[str, OfferInfo] = {}
         self.trade_residual: Dict[str, Offer] = {}
+        # Tick on which the engine ran last, and the version of the source orders at that time
+        self._last_tick: Optional[int] = None
+        self._source_orders_version = None
 
     def __repr__(self):
         return "<MAEngine [{s.owner.name}] {s.name} {s.markets.source.time_slot:%H:%M}>".format(
@@ -116,8 +119,35 @@ class MAEngine:
 
     def tick(self, *, area):
         """Perform actions that need to be done when TICK event is triggered."""
+        self._last_tick = area.current_tick
+        self._source_orders_version = self._get_source_orders_version()
         self._propagate_offer(area.current_tick)
 
+    def _get_source_orders_version(self):
+        return self.markets.source.offers.version
+
+    @staticmethod
+    def _next_forwarding_tick(order_age: Dict[str, int], forwarded_orders: Dict,
+                              min_order_age: int, last_tick: int) -> Optional[int]:
+        """Return the first tick after last_tick on which a known order reaches min_order_age."""
+        return min((age + min_order_age for order_id, age in order_age.items()
+                    if order_id not in forwarded_orders and age + min_order_age > last_tick),
+                   default=None)
+
+    def next_tick_wakeup(self, current_tick: int) -> Optional[int]:
+        """Return the next tick on which the engine has orders to age or to forward.
+
+        The engine has work to do if the orders of the source market changed since its last tick
+        (new orders need to be aged) or if one of the known orders reaches the minimum age.
+        Orders that could not be forwarded once they were old enough are retried only after
+        the next change of the source market.
+        """
+        if (self._last_tick is None or
+                self._get_source_orders_version() != self._source_orders_version):
+            return current_tick
+        return self._next_forwarding_tick(
+            self.offer_age, self.forwarded_offers, self.min_offer_age, self._last_tick)
+
     def _propagate_offer(self, current_tick):
         # Store age of offer
         for offer in self.markets.source.offers.values():
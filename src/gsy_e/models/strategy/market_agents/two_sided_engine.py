@@ -16,7 +16,7 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 from collections import namedtuple
-from typing import Dict, TYPE_CHECKING
+from typing import Dict, Optional, TYPE_CHECKING
 
 from gsy_framework.data_classes import Bid
 
@@ -116,6 +116,18 @@ class TwoSidedEngine(MAEngine):
 
         return True
 
+    def _get_source_orders_version(self):
+        return self.markets.source.offers.version, self.markets.source.bids.version
+
+    def next_tick_wakeup(self, current_tick: int) -> Optional[int]:
+        next_offer_tick = super().next_tick_wakeup(current_tick)
+        if next_offer_tick == current_tick:
+            return current_tick
+        next_bid_tick = self._next_forwarding_tick(
+            self.bid_age, self.forwarded_bids, self.min_bid_age, self._last_tick)
+        return min((tick for tick in (next_offer_tick, next_bid_tick) if tick is not None),
+                   default=None)
+
     # pylint: disable=unused-argument
     def tick(self, *, area):
         super().tick(area=area)
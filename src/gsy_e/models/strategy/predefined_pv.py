@@ -23,6 +23,7 @@ from gsy_framework.utils import convert_kW_to_kWh
 from gsy_framework.utils import key_in_dict_and_not_none, find_object_of_same_weekday_and_time
 from pendulum import duration
 
+import gsy_e.constants
 from gsy_e.gsy_e_core.exceptions import GSyException
 from gsy_e.gsy_e_core.global_objects_singleton import global_objects
 from gsy_e.gsy_e_core.util import d3a_path
@@ -132,6 +133,13 @@ class PVPredefinedStrategy(PVStrategy):
         else:
             raise ValueError("Energy_profile has to be in [0,1,2,4]")
 
+        if gsy_e.constants.SHARED_PROFILE_CACHE:
+            # all PVs with the same profile share the parsed weights, scaled by their capacity
+            self.energy_profile = global_objects.profiles_handler.shared_profiles.get_profile(
+                InputProfileTypes.IDENTITY, profile_path,
+                scaling=convert_kW_to_kWh(self.capacity_kW, self.simulation_config.slot_length))
+            return
+
         power_weight_profile = read_arbitrary_profile(
             InputProfileTypes.IDENTITY, profile_path)
 
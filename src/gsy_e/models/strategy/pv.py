@@ -18,6 +18,7 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 import math
 import traceback
 from logging import getLogger
+from typing import Optional
 
 import pendulum
 from gsy_framework.constants_limits import ConstSettings, GlobalConfig
@@ -216,12 +217,21 @@ class PVStrategy(BidEnabledStrategy):
 
         This method is triggered by the TICK event.
         """
+        self.offer_update.catch_up_with_skipped_updates(self)
         self.offer_update.update(self.area.spot_market, self)
         self.offer_update.increment_update_counter_all_markets(self)
 
         self._settlement_market_strategy.event_tick(self)
         self._future_market_strategy.event_tick(self)
 
+    def next_tick_wakeup(self, current_tick: int) -> Optional[int]:
+        """The TICK event only updates the prices of the posted offers, when they are due."""
+        next_update_ticks = [
+            self.offer_update.get_next_update_tick(self),
+            self._settlement_market_strategy.get_next_update_tick(self),
+            self._future_market_strategy.get_next_update_tick(self)]
+        return min((tick for tick in next_update_ticks if tick is not None), default=None)
+
     def set_produced_energy_forecast_in_state(self, reconfigure=True):
         # This forecast is based on the real PV system data provided by enphase
         # They can be found in the tools folder
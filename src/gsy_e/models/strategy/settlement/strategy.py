@@ -89,6 +89,10 @@ class SettlementMarketStrategyInterface:
     def event_tick(self, strategy: "BidEnabledStrategy"):
         pass
 
+    def get_next_update_tick(self, strategy: "BidEnabledStrategy") -> Optional[int]:
+        """Return the next tick on which event_tick updates orders, None if it never does."""
+        return None
+
     def event_bid_traded(self, strategy: "BidEnabledStrategy", market_id: str, bid_trade: Trade):
         pass
 
@@ -164,14 +168,17 @@ class SettlementMarketStrategy(SettlementMarketStrategyInterface):
         """
         Update posted settlement bids and offers on market tick.
         Order matters here:
-            - FIRST: the bids and offers need to be updated (update())
-            - SECOND: the update counter has to be increased (increment_update_counter_all_markets)
+            - FIRST: the skipped updates have to be caught up (catch_up_with_skipped_updates)
+            - SECOND: the bids and offers need to be updated (update())
+            - THIRD: the update counter has to be increased (increment_update_counter_all_markets)
         Args:
             strategy: Strategy object of the asset
 
         Returns: None
 
         """
+        self.bid_updater.catch_up_with_skipped_updates(strategy)
+        self.offer_updater.catch_up_with_skipped_updates(strategy)
         for market in strategy.area.settlement_markets.values():
             self.bid_updater.update(market, strategy)
             self.offer_updater.update(market, strategy)
@@ -179,6 +186,13 @@ class SettlementMarketStrategy(SettlementMarketStrategyInterface):
         self.bid_updater.increment_update_counter_all_markets(strategy)
         self.offer_updater.increment_update_counter_all_markets(strategy)
 
+    def get_next_update_tick(self, strategy: "BidEnabledStrategy") -> Optional[int]:
+        """Return the next tick on which the settlement bids or offers are updated."""
+        next_update_ticks = [
+            updater.get_next_update_tick(strategy)
+            for updater in (self.bid_updater, self.offer_updater)]
+        return min((tick for tick in next_update_ticks if tick is not None), default=None)
+
     @staticmethod
     def _get_settlement_market_by_id(strategy: "BidEnabledStrategy",
                                      market_id: str) -> Optional["MarketBase"]:
@@ -240,6 +240,9 @@ class SmartMeterStrategy(BidEnabledStrategy):
     def event_tick(self):
         """Buy or offer energy on market tick. This method is triggered by the TICK event."""
 
+        self.bid_update.catch_up_with_skipped_updates(self)
+        self.offer_update.catch_up_with_skipped_updates(self)
+
         # TODO: the following methods will cycle many times on all markets and should be refactored
         self._event_tick_consumption()
         self._event_tick_production()
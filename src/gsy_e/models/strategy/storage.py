@@ -349,6 +349,8 @@ class StorageStrategy(BidEnabledStrategy):
 
         This method is triggered by the TICK event.
         """
+        self.bid_update.catch_up_with_skipped_updates(self)
+        self.offer_update.catch_up_with_skipped_updates(self)
 
         market = self.area.spot_market
         self._buy_energy_two_sided_spot_market()
@@ -16,8 +16,11 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 import logging
-from typing import TYPE_CHECKING, Callable, List
+from functools import lru_cache
+from math import ceil
+from typing import TYPE_CHECKING, Callable, List, Optional
 
+import numpy as np
 from gsy_framework.constants_limits import ConstSettings, GlobalConfig
 from gsy_framework.read_user_profile import InputProfileTypes
 from gsy_framework.utils import (find_object_of_same_weekday_and_time,
@@ -26,7 +29,8 @@ from pendulum import duration, DateTime, Duration
 
 import gsy_e.constants
 from gsy_e.gsy_e_core.global_objects_singleton import global_objects
-from gsy_e.gsy_e_core.util import write_default_to_dict, is_time_slot_in_past_markets
+from gsy_e.gsy_e_core.time_slot_series import TimeSlotSeries, delete_time_slots_before
+from gsy_e.gsy_e_core.util import write_default_to_dict, get_past_markets_threshold
 
 if TYPE_CHECKING:
     from gsy_e.models.area import Area
@@ -35,16 +39,38 @@ if TYPE_CHECKING:
     from gsy_e.models.strategy import BidEnabledStrategy, BaseStrategy
 
 
+@lru_cache(maxsize=4096)
+def get_rate_trajectory(initial_rate: float, final_rate: float,
+                        energy_rate_change_per_update: float, rate_limit_object: Callable,
+                        number_of_updates: int) -> np.ndarray:
+    """Return the rates of the orders after 0, 1, ..., number_of_updates - 1 price updates.
+
+    The trajectories are cached, therefore all updaters with identical rates share the same
+    (read-only) array.
+    """
+    rates = initial_rate - energy_rate_change_per_update * np.arange(number_of_updates)
+    rates = (np.minimum if rate_limit_object is min else np.maximum)(rates, final_rate)
+    rates.flags.writeable = False
+    return rates
+
+
 class TemplateStrategyUpdaterInterface:
     """Interface for the updater of orders for template strategies"""
 
     def update_and_populate_price_settings(self, area: "Area") -> None:
         """Update the price settings. Usually called during the market cycle event"""
 
+    def catch_up_with_skipped_updates(self, strategy: "BaseStrategy") -> None:
+        """Skip the updates of the ticks that were not dispatched. Called first on each tick"""
+
     def increment_update_counter_all_markets(self, strategy: "BaseStrategy") -> bool:
         """Increment the update counter for all markets. Usually called during the tick event"""
         return False
 
+    def get_next_update_tick(self, strategy: "BaseStrategy") -> Optional[int]:
+        """Return the next tick on which the order prices are updated, None if they never are."""
+        return None
+
     def set_parameters(self, *, initial_rate: float = None, final_rate: float = None,
                        energy_rate_change_per_update: float = None, fit_to_limit: bool = None,
                        update_interval: int = None) -> None:
@@ -77,17 +103,20 @@ class TemplateStrategyUpdaterBase(TemplateStrategyUpdaterInterface):
         self.final_rate_profile_buffer = {}
         self.energy_rate_change_per_update_profile_buffer = {}
 
-        # dicts that are used for price calculations, contain only
+        # time slot series that are used for price calculations, contain only
         # all_markets Dict[DateTime, float]
-        self.initial_rate = {}
-        self.final_rate = {}
-        self.energy_rate_change_per_update = {}
+        self.initial_rate = TimeSlotSeries()
+        self.final_rate = TimeSlotSeries()
+        self.energy_rate_change_per_update = TimeSlotSeries()
 
         self._read_or_rotate_rate_profiles()
 
         self.update_interval = update_interval
-        self.update_counter = {}
+        self.update_counter = TimeSlotSeries(dtype=int)
         self.number_of_available_updates = 0
+        # rates of the orders per time slot and number of price updates, computed when the
+        # price settings are populated (see PRECOMPUTED_RATE_TRAJECTORIES)
+        self._rate_trajectories = {}
         self.rate_limit_object = rate_limit_object
 
     def _read_or_rotate_rate_profiles(self) -> None:
@@ -106,15 +135,11 @@ class TemplateStrategyUpdaterBase(TemplateStrategyUpdaterInterface):
 
     def delete_past_state_values(self, current_market_time_slot: DateTime) -> None:
         """Delete values from buffers before the current_market_time_slot"""
-        to_delete = []
-        for market_slot in self.initial_rate:
-            if is_time_slot_in_past_markets(market_slot, current_market_time_slot):
-                to_delete.append(market_slot)
-        for market_slot in to_delete:
-            self.initial_rate.pop(market_slot, None)
-            self.final_rate.pop(market_slot, None)
-            self.energy_rate_change_per_update.pop(market_slot, None)
-            self.update_counter.pop(market_slot, None)
+        threshold = get_past_markets_threshold(current_market_time_slot)
+        for time_series in (self.initial_rate, self.final_rate,
+                            self.energy_rate_change_per_update, self.update_counter,
+                            self._rate_trajectories):
+            delete_time_slots_before(time_series, threshold)
 
     @staticmethod
     def get_all_markets(area: "Area") -> List["OneSidedMarket"]:
@@ -154,16 +179,34 @@ class TemplateStrategyUpdaterBase(TemplateStrategyUpdaterInterface):
             self.initial_rate[time_slot] = initial_rate
             self.final_rate[time_slot] = final_rate
 
-            self._set_or_update_energy_rate_change_per_update(time_slot)
+            self._set_or_update_energy_rate_change_per_update(
+                time_slot, initial_rate=initial_rate, final_rate=final_rate)
             write_default_to_dict(self.update_counter, time_slot, 0)
-
-    def _set_or_update_energy_rate_change_per_update(self, time_slot: DateTime) -> None:
+            if gsy_e.constants.PRECOMPUTED_RATE_TRAJECTORIES:
+                self._set_rate_trajectory(time_slot)
+
+    def _set_rate_trajectory(self, time_slot: DateTime) -> None:
+        rates = (self.initial_rate[time_slot], self.final_rate[time_slot],
+                 self.energy_rate_change_per_update[time_slot])
+        if any(rate is None for rate in rates):
+            self._rate_trajectories.pop(time_slot, None)
+            return
+        # the update counter can not exceed the number of update intervals in the slot plus one
+        self._rate_trajectories[time_slot] = get_rate_trajectory(
+            *rates, self.rate_limit_object,
+            self._time_slot_duration_in_seconds // self.update_interval.seconds + 2)
+
+    def _set_or_update_energy_rate_change_per_update(
+            self, time_slot: DateTime, initial_rate: float = None,
+            final_rate: float = None) -> None:
         energy_rate_change_per_update = {}
         if self.fit_to_limit:
-            initial_rate = find_object_of_same_weekday_and_time(
-                self.initial_rate_profile_buffer, time_slot)
-            final_rate = find_object_of_same_weekday_and_time(
-                self.final_rate_profile_buffer, time_slot)
+            if initial_rate is None:
+                initial_rate = find_object_of_same_weekday_and_time(
+                    self.initial_rate_profile_buffer, time_slot)
+            if final_rate is None:
+                final_rate = find_object_of_same_weekday_and_time(
+                    self.final_rate_profile_buffer, time_slot)
             energy_rate_change_per_update[time_slot] = (
                     (initial_rate - final_rate) / self.number_of_available_updates
             )
@@ -205,6 +248,11 @@ class TemplateStrategyUpdaterBase(TemplateStrategyUpdaterInterface):
 
     def get_updated_rate(self, time_slot: DateTime) -> float:
         """Compute the rate for offers/bids at a specific time slot."""
+        if self._rate_trajectories:
+            trajectory = self._rate_trajectories.get(time_slot)
+            update_counter = self.update_counter[time_slot]
+            if trajectory is not None and update_counter < len(trajectory):
+                return trajectory[update_counter].item()
         calculated_rate = (
             self.initial_rate[time_slot] -
             self.energy_rate_change_per_update[time_slot] * self.update_counter[time_slot])
@@ -216,28 +264,73 @@ class TemplateStrategyUpdaterBase(TemplateStrategyUpdaterInterface):
                 self._time_slot_duration_in_seconds / strategy.area.config.tick_length.seconds)
         return current_tick_number * strategy.area.config.tick_length.seconds
 
+    def catch_up_with_skipped_updates(self, strategy: "BaseStrategy") -> None:
+        """Skip the price updates of the ticks that were not dispatched in fast-forward mode.
+
+        Has to be called on each tick, before the rates are read or the orders are updated. The
+        update counters are set to the last update before the current tick, so that update()
+        posts the rates that the orders have on this tick in the full resolution run.
+        """
+        if gsy_e.constants.FAST_FORWARD_TICKS_PER_SLOT is None:
+            return
+        last_update = int(self._elapsed_seconds(strategy) // self.update_interval.seconds)
+        for time_slot in self._get_all_time_slots(strategy.area):
+            if self.update_counter[time_slot] < last_update:
+                self.update_counter[time_slot] = last_update
+
     def increment_update_counter_all_markets(self, strategy: "BaseStrategy") -> bool:
         """Update method of the class. Should be called on each tick and increments the
         update counter in order to validate whether an update in the posted energy rates
         is required."""
+        # the elapsed seconds are the same for all time slots
+        elapsed_seconds = self._elapsed_seconds(strategy)
         should_update = [
-            self._increment_update_counter(strategy, time_slot)
+            self._increment_update_counter(strategy, time_slot, elapsed_seconds)
             for time_slot in self._get_all_time_slots(strategy.area)
         ]
         return any(should_update)
 
-    def _increment_update_counter(self, strategy: "BaseStrategy", time_slot) -> bool:
+    def _increment_update_counter(self, strategy: "BaseStrategy", time_slot,
+                                  elapsed_seconds: int = None) -> bool:
         """Increment the counter of the number of times in which prices have been updated."""
-        if self.time_for_price_update(strategy, time_slot):
+        if elapsed_seconds is None:
+            elapsed_seconds = self._elapsed_seconds(strategy)
+        if self.time_for_price_update(strategy, time_slot, elapsed_seconds):
             self.update_counter[time_slot] += 1
             return True
         return False
 
-    def time_for_price_update(self, strategy: "BaseStrategy", time_slot: DateTime) -> bool:
+    def time_for_price_update(self, strategy: "BaseStrategy", time_slot: DateTime,
+                              elapsed_seconds: int = None) -> bool:
         """Check if the prices of bids/offers should be updated."""
-        return self._elapsed_seconds(strategy) >= (
+        if elapsed_seconds is None:
+            elapsed_seconds = self._elapsed_seconds(strategy)
+        return elapsed_seconds >= (
             self.update_interval.seconds * self.update_counter[time_slot])
 
+    def get_next_update_tick(self, strategy: "BaseStrategy") -> Optional[int]:
+        """Return the first tick on which time_for_price_update is True for any time slot.
+
+        The update counters only restart on the market cycle, therefore the returned tick does
+        not exceed the end of the current slot.
+        """
+        tick_length_seconds = strategy.area.config.tick_length.seconds
+        ticks_per_slot = int(self._time_slot_duration_in_seconds / tick_length_seconds)
+        if ticks_per_slot <= 0:
+            return None
+        current_tick = strategy.area.current_tick
+        if self._time_slot_duration_in_seconds % tick_length_seconds:
+            # Slots that are not a multiple of the tick length are checked on every tick
+            return current_tick
+        slot_start_tick = current_tick - current_tick % ticks_per_slot
+        next_update_ticks = [
+            slot_start_tick + ceil(self.update_interval.seconds *
+                                   self.update_counter.get(time_slot, 0) / tick_length_seconds)
+            for time_slot in self._get_all_time_slots(strategy.area)]
+        if not next_update_ticks:
+            return None
+        return min(*next_update_ticks, slot_start_tick + ticks_per_slot)
+
     def set_parameters(self, *, initial_rate: float = None, final_rate: float = None,
                        energy_rate_change_per_update: float = None, fit_to_limit: bool = None,
                        update_interval: int = None) -> None:
@@ -254,6 +347,8 @@ class TemplateStrategyUpdaterBase(TemplateStrategyUpdaterInterface):
         if update_interval is not None:
             self.update_interval = update_interval
         self._read_or_rotate_rate_profiles()
+        # the trajectories are recomputed when the price settings are populated again
+        self._rate_trajectories.clear()
 
     def reset(self, strategy: "BaseStrategy") -> None:
         raise NotImplementedError
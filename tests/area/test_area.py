@@ -299,6 +299,20 @@ class TestEventDispatcher:
         area.dispatcher.event_listener(event_type)
         assert area.strategy.event_listener.call_count == 0
 
+    @staticmethod
+    @pytest.mark.parametrize("skip_idle_ticks, is_tick_due, dispatched", [
+        (False, False, True), (True, True, True), (True, False, False)])
+    def test_event_listener_skips_idle_ticks_of_strategy(
+            skip_idle_ticks, is_tick_due, dispatched, strategy_mock):
+        area = strategy_mock
+        area.events.is_enabled = True
+        area.events.is_connected = True
+        area.tick = MagicMock()
+        area.strategy.is_tick_due.return_value = is_tick_due
+        with patch("gsy_e.constants.SKIP_IDLE_TICKS", skip_idle_ticks):
+            area.dispatcher.event_listener(AreaEvent.TICK)
+        assert area.strategy.event_listener.called is dispatched
+
     @staticmethod
     def test_event_on_disabled_area_triggered_for_market_cycle_on_disabled_area(strategy_mock):
         area = strategy_mock
@@ -322,6 +336,53 @@ class TestEventDispatcher:
             child.name = "Street 2"
             assert exception == "Area name should be unique inside the same Parent Area"
 
+    @staticmethod
+    def test_subtree_is_invalidated_when_the_tree_changes():
+        house = Area(name="House", children=[Area(name="Load")])
+        street = Area(name="Street", children=[house, Area(name="PV")])
+        grid = Area(name="Grid", children=[street])
+        for area in [house, street]:
+            for child in area.children:
+                child.parent = area
+        street.parent = grid
+        assert [area.name for area in grid.subtree] == ["Grid", "Street", "House", "Load", "PV"]
+        assert street.non_leaf_children == [house]
+
+        house.children.append(Area(name="Storage"))
+        street.children.remove(street.children[1])
+        assert [area.name for area in grid.subtree] == [
+            "Grid", "Street", "House", "Load", "Storage"]
+
+        house.children = [child for child in house.children if child.name != "Load"]
+        assert [area.name for area in grid.subtree] == ["Grid", "Street", "House", "Storage"]
+        with pytest.raises(Exception):
+            house.children.append(Area(name="Storage"))
+
+    @staticmethod
+    def test_execute_actions_after_tick_event_updates_all_descendants():
+        house = Area(name="House", children=[Area(name="Load")])
+        grid = Area(name="Grid", children=[house])
+        house.parent = grid
+        house.children[0].parent = house
+        with patch.object(Area, "_consume_commands_from_aggregator") as consume_mock, \
+                patch.object(Area, "spot_market"):
+            grid.execute_actions_after_tick_event()
+        assert [area.current_tick for area in grid.subtree] == [1, 1, 1]
+        assert consume_mock.call_count == 3
+
+    @staticmethod
+    def test_skip_ticks_advances_the_clock_of_all_descendants():
+        house = Area(name="House", children=[Area(name="Load")])
+        grid = Area(name="Grid", children=[house])
+        house.parent = grid
+        house.children[0].parent = house
+        with patch.object(Area, "_consume_commands_from_aggregator") as consume_mock, \
+                patch.object(Area, "spot_market") as spot_market_mock:
+            grid.skip_ticks(5)
+        assert [area.current_tick for area in grid.subtree] == [5, 5, 5]
+        consume_mock.assert_not_called()
+        assert spot_market_mock.update_clock.call_count == 2
+
 
 class TestFunctions:
     """Test utility functions in the area module."""
@@ -335,6 +335,27 @@ def test_market_acct_multiple(market=OneSidedMarket(bc=NonBlockchainInterface(st
     assert market.bought_energy("C") == offer2.energy == 10
 
 
+def test_market_participant_trades_and_totals(
+        market=OneSidedMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now())):
+    offer1 = market.offer(10, 20, "A", "A")
+    offer2 = market.offer(12, 10, "B", "B")
+    trade1 = market.accept_offer(offer1, "B")
+    trade2 = market.accept_offer(offer2, "C")
+
+    assert market.participant_trades("A") == [trade1]
+    assert market.participant_trades("B") == [trade1, trade2]
+    assert market.participant_trades("D") == []
+    assert market.total_earned("B") == trade2.trade_price
+    assert market.total_spent("B") == trade1.trade_price
+    assert market.total_spent("A") == 0
+
+    # Replacing the trades re-indexes them
+    market.trades = [trade2]
+    assert market.participant_trades("B") == [trade2]
+    assert market.bought_energy("B") == 0
+    assert market.sold_energy("B") == 10
+
+
 @pytest.mark.parametrize("market, offer", [
     (OneSidedMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now()), "offer"),
     (BalancingMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now()), "balancing_offer"),
@@ -0,0 +1,174 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+# pylint: disable=protected-access
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from gsy_framework.data_classes import Bid, Offer
+from pendulum import now
+
+from gsy_e.gsy_e_core.exceptions import InvalidBidOfferPairException
+from gsy_e.models.market.two_sided import TwoSidedMarket
+from gsy_e.models.myco_matcher import MycoInternalMatcher
+from gsy_e.models.myco_matcher.myco_internal_matcher import MarketOrdersCache
+
+
+@pytest.fixture(name="market")
+def market_fixture() -> TwoSidedMarket:
+    """Return a two sided market with one bid and two offers."""
+    market = TwoSidedMarket(time_slot=now())
+    market.bids = {"bid1": Bid("bid1", now(), 10, 10, "buyer", buyer_origin="buyer")}
+    market.offers = {"offer1": Offer("offer1", now(), 5, 10, "seller", seller_origin="seller"),
+                     "offer2": Offer("offer2", now(), 8, 10, "seller", seller_origin="seller")}
+    return market
+
+
+class RecommendOncePerAreaAlgorithm:
+    """Recommend a single (fake) match per area and keep a (fake) clearing state per area."""
+
+    def __init__(self):
+        self.state = SimpleNamespace(cumulative_bids={}, cumulative_offers={}, clearing={})
+
+    def get_matches_recommendations(self, data):
+        for area_uuid in data:
+            self.state.clearing[area_uuid] = {"time": area_uuid}
+        return [{"area": area_uuid} for area_uuid in data]
+
+
+def _create_parallel_matcher(markets):
+    """Return an internal matcher that matches the markets (one per area) on a thread pool."""
+    matcher = MycoInternalMatcher()
+    matcher.match_algorithm = RecommendOncePerAreaAlgorithm()
+    matcher._executor = ThreadPoolExecutor(max_workers=4)
+    matcher.area_uuid_markets_mapping = {
+        f"area{index}": {"markets": [area_market], "settlement_markets": [],
+                         "future_markets": None, "current_time": now()}
+        for index, area_market in enumerate(markets)}
+    return matcher
+
+
+class TestMarketOrdersCache:
+
+    @staticmethod
+    def test_orders_per_slot_matches_the_market_orders(market):
+        assert MarketOrdersCache(market).orders_per_slot() == market.orders_per_slot()
+
+    @staticmethod
+    def test_only_new_orders_are_serialized_again(market):
+        orders_cache = MarketOrdersCache(market)
+        orders_cache.orders_per_slot()
+        market.offers.pop("offer1")
+        market.offers["offer3"] = Offer("offer3", now(), 1, 1, "seller")
+        with patch.object(Offer, "serializable_dict", autospec=True,
+                          side_effect=lambda offer: {"id": offer.id}) as serialize_mock:
+            orders = orders_cache.orders_per_slot()
+        serialize_mock.assert_called_once_with(market.offers["offer3"])
+        assert [offer["id"] for offer in orders[market.time_slot_str]["offers"]] == [
+            "offer2", "offer3"]
+
+    @staticmethod
+    def test_replaced_orders_keep_their_position(market):
+        orders_cache = MarketOrdersCache(market)
+        orders_cache.orders_per_slot()
+        market.offers["offer1"] = Offer("offer1", now(), 4, 10, "seller", seller_origin="seller")
+        orders = orders_cache.orders_per_slot()
+        assert orders == market.orders_per_slot()
+        assert [offer["id"] for offer in orders[market.time_slot_str]["offers"]] == [
+            "offer1", "offer2"]
+
+    @staticmethod
+    def test_returned_orders_do_not_share_the_cached_dicts(market):
+        orders_cache = MarketOrdersCache(market)
+        orders_cache.orders_per_slot()[market.time_slot_str]["bids"][0]["energy"] = 0
+        assert orders_cache.orders_per_slot()[market.time_slot_str]["bids"][0]["energy"] == 10
+
+
+class TestMycoInternalMatcher:
+
+    @staticmethod
+    @patch("gsy_e.models.myco_matcher.myco_internal_matcher.global_objects", MagicMock())
+    def test_match_recommendations_skips_markets_without_bids(market):
+        matcher = MycoInternalMatcher()
+        matcher.match_algorithm = MagicMock()
+        market.bids = {}
+        matcher.area_uuid_markets_mapping = {
+            "area": {"markets": [market], "settlement_markets": [],
+                     "future_markets": None, "current_time": now()}}
+        matcher.match_recommendations()
+        matcher.match_algorithm.get_matches_recommendations.assert_not_called()
+        assert matcher.area_uuid_markets_mapping == {}
+
+    @staticmethod
+    @patch("gsy_e.models.myco_matcher.myco_internal_matcher.global_objects", MagicMock())
+    def test_parallel_matching_applies_recommendations_in_market_order(market):
+        markets = [TwoSidedMarket(time_slot=now()) for _ in range(4)]
+        applied_recommendations = []
+        for index, area_market in enumerate(markets):
+            area_market.bids, area_market.offers = market.bids, market.offers
+            # The second market raises, as if its orders had changed in the meantime
+            area_market.match_recommendations = MagicMock(
+                side_effect=[InvalidBidOfferPairException, False] if index == 1 else
+                (lambda recommendations: applied_recommendations.extend(recommendations)))
+        matcher = _create_parallel_matcher(markets)
+
+        matcher.match_recommendations()
+        matcher.event_finish()
+
+        assert applied_recommendations == [{"area": "area0"}, {"area": "area2"},
+                                           {"area": "area3"}]
+        assert markets[1].match_recommendations.call_count == 2
+        assert matcher._executor is None
+
+    @staticmethod
+    @patch("gsy_e.models.myco_matcher.myco_internal_matcher.global_objects", MagicMock())
+    def test_parallel_matching_merges_the_clearing_state_of_the_workers(market):
+        markets = [TwoSidedMarket(time_slot=now()) for _ in range(4)]
+        for area_market in markets:
+            area_market.bids, area_market.offers = market.bids, market.offers
+            area_market.match_recommendations = MagicMock(return_value=False)
+        matcher = _create_parallel_matcher(markets)
+
+        matcher.match_recommendations()
+        matcher.event_finish()
+
+        assert matcher.match_algorithm.state.clearing == {
+            f"area{index}": {"time": f"area{index}"} for index in range(4)}
+
+    @staticmethod
+    @patch("gsy_e.models.myco_matcher.myco_internal_matcher.global_objects", MagicMock())
+    @patch("gsy_e.models.myco_matcher.myco_internal_matcher.MAX_PARALLEL_MATCHING_RETRIES", 2)
+    def test_parallel_matching_falls_back_to_serial_matching_after_retries(market):
+        markets = [TwoSidedMarket(time_slot=now()) for _ in range(2)]
+        for area_market in markets:
+            area_market.bids, area_market.offers = market.bids, market.offers
+            area_market.match_recommendations = MagicMock(return_value=False)
+        markets[1].match_recommendations.side_effect = [
+            InvalidBidOfferPairException, InvalidBidOfferPairException, False]
+        matcher = _create_parallel_matcher(markets)
+        matcher.match_algorithm.get_matches_recommendations = MagicMock(
+            return_value=[{"area": "area1"}])
+
+        matcher.match_recommendations()
+        matcher.event_finish()
+
+        assert markets[1].match_recommendations.call_count == 3
+        # the last attempt used the matcher's algorithm on the calling thread
+        matcher.match_algorithm.get_matches_recommendations.assert_called_once()
+        markets[1].match_recommendations.assert_called_with([{"area": "area1"}])
@@ -0,0 +1,101 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from copy import copy, deepcopy
+
+import pytest
+from gsy_framework.data_classes import Bid, Offer
+from pendulum import now
+
+from gsy_e.models.market.order_book import OrderBook
+from gsy_e.models.market.two_sided import TwoSidedMarket
+
+
+@pytest.fixture(name="offer_book")
+def offer_book_fixture() -> OrderBook:
+    """Return an order book with offers of rates 5, 1, 3 and 1 (in insertion order)."""
+    return OrderBook({
+        "o1": Offer("o1", now(), 10, 2, "seller"),
+        "o2": Offer("o2", now(), 1, 1, "seller"),
+        "o3": Offer("o3", now(), 9, 3, "seller"),
+        "o4": Offer("o4", now(), 4, 4, "seller"),
+    })
+
+
+def test_order_book_keeps_orders_sorted_by_rate(offer_book):
+    assert [o.id for o in offer_book.sorted_orders()] == ["o2", "o4", "o3", "o1"]
+    assert [o.id for o in offer_book.sorted_orders(reverse=True)] == ["o1", "o3", "o4", "o2"]
+
+    offer_book["o5"] = Offer("o5", now(), 2, 1, "seller")
+    offer_book.pop("o4")
+    del offer_book["o1"]
+    assert [o.id for o in offer_book.sorted_orders()] == ["o2", "o5", "o3"]
+    assert set(offer_book.keys()) == {"o2", "o3", "o5"}
+
+
+def test_order_book_best_price_queries(offer_book):
+    assert offer_book.lowest_rate() == 1
+    assert offer_book.highest_rate() == 5
+    assert [o.id for o in offer_book.top(2)] == ["o2", "o4"]
+    assert [o.id for o in offer_book.top(1, reverse=True)] == ["o1"]
+    assert [o.id for o in offer_book.lowest_rate_orders(tolerance=0.00001)] == ["o2", "o4"]
+    assert [o.id for o in offer_book.highest_rate_orders()] == ["o1"]
+    assert OrderBook().lowest_rate() is None
+    assert OrderBook().lowest_rate_orders() == []
+
+
+def test_order_book_cumulative_energy_queries(offer_book):
+    assert offer_book.energy_up_to_rate(0.5) == 0
+    assert offer_book.energy_up_to_rate(1) == 5
+    assert offer_book.energy_up_to_rate(3) == 8
+    assert offer_book.energy_from_rate(3) == 5
+    assert offer_book.energy_from_rate(6) == 0
+
+
+def test_order_book_reindex_updates_order_position(offer_book):
+    offer_book["o1"].update_price(0.5)
+    offer_book.reindex("o1")
+    assert [o.id for o in offer_book.sorted_orders()] == ["o1", "o2", "o4", "o3"]
+
+
+def test_order_book_copies_do_not_share_the_rate_index(offer_book):
+    for book_copy in [copy(offer_book), deepcopy(offer_book), offer_book.copy()]:
+        book_copy["o6"] = Offer("o6", now(), 0.1, 1, "seller")
+        assert "o6" not in [o.id for o in offer_book.sorted_orders()]
+        assert book_copy.sorted_orders()[0].id == "o6"
+
+
+def test_order_book_snapshot_is_rebuilt_only_when_the_book_changes(offer_book):
+    snapshot = offer_book.snapshot()
+    assert offer_book.snapshot() is snapshot
+    assert dict(snapshot) == offer_book.data
+    with pytest.raises(TypeError):
+        snapshot["o5"] = Offer("o5", now(), 2, 1, "seller")
+
+    offer_book.pop("o1")
+    assert "o1" in snapshot
+    assert offer_book.snapshot() is not snapshot
+    assert set(offer_book.snapshot()) == {"o2", "o3", "o4"}
+    assert set(deepcopy(offer_book).snapshot()) == {"o2", "o3", "o4"}
+
+
+def test_market_orders_are_wrapped_in_order_books():
+    market = TwoSidedMarket(time_slot=now())
+    market.bids = {"b1": Bid("b1", now(), 1, 1, "buyer"), "b2": Bid("b2", now(), 4, 2, "buyer")}
+    assert isinstance(market.bids, OrderBook)
+    assert isinstance(market.offers, OrderBook)
+    assert [b.id for b in market.sorted_bids] == ["b2", "b1"]
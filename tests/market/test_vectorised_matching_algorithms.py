@@ -0,0 +1,175 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+# pylint: disable=protected-access
+import random
+from unittest.mock import patch
+
+import pytest
+from gsy_framework.constants_limits import ConstSettings
+from gsy_framework.data_classes import Bid, Offer
+from gsy_framework.enums import BidOfferMatchAlgoEnum
+from gsy_framework.matching_algorithms import (
+    PayAsBidMatchingAlgorithm, PayAsClearMatchingAlgorithm)
+from pendulum import now
+
+from gsy_e.models.myco_matcher import MycoInternalMatcher
+from gsy_e.models.myco_matcher.vectorised_matching_algorithms import (
+    PackedOrders, VectorisedPayAsBidMatchingAlgorithm, VectorisedPayAsClearMatchingAlgorithm)
+
+TIME_SLOT = "2022-01-17T12:00"
+CURRENT_TIME = now()
+
+
+@pytest.fixture(name="market_settings", autouse=True)
+def market_settings_fixture():
+    """Restore the matching settings that the tests change."""
+    original_aggregation_algorithm = ConstSettings.MASettings.PAY_AS_CLEAR_AGGREGATION_ALGORITHM
+    original_match_type = ConstSettings.MASettings.BID_OFFER_MATCH_TYPE
+    yield
+    ConstSettings.MASettings.PAY_AS_CLEAR_AGGREGATION_ALGORITHM = original_aggregation_algorithm
+    ConstSettings.MASettings.BID_OFFER_MATCH_TYPE = original_match_type
+
+
+def _random_orders(seed: int, same_parties: bool):
+    """Return serialized bids and offers with random (partly equal) rates and energies."""
+    rng = random.Random(seed)
+    parties = ["A", "B", "C", "D"]
+
+    def random_order_parameters():
+        rate = rng.choice([rng.randint(1, 5), round(rng.uniform(1, 10), 2)])
+        energy = rng.randint(1, 5)
+        return rate * energy, energy
+
+    bids = [Bid(f"bid{i}", now(), *random_order_parameters(),
+                buyer=rng.choice(parties) if same_parties else f"buyer{i}").serializable_dict()
+            for i in range(rng.randint(0, 30))]
+    offers = [Offer(f"offer{i}", now(), *random_order_parameters(),
+                    seller=rng.choice(parties) if same_parties else f"seller{i}"
+                    ).serializable_dict()
+              for i in range(rng.randint(0, 30))]
+    return bids, offers
+
+
+def _matching_data(bids, offers):
+    return {"market": {TIME_SLOT: {"bids": bids, "offers": offers,
+                                   "current_time": CURRENT_TIME}}}
+
+
+def _approx_recommendations(recommendations):
+    """Compare the selected energies of the recommendations up to floating point errors."""
+    return [{**recommendation, "selected_energy": pytest.approx(recommendation["selected_energy"])}
+            for recommendation in recommendations]
+
+
+class TestVectorisedPayAsBidMatchingAlgorithm:
+
+    @staticmethod
+    @pytest.mark.parametrize("same_parties", [True, False])
+    @pytest.mark.parametrize("seed", range(50))
+    def test_recommendations_are_the_same_as_gsy_framework(seed, same_parties):
+        bids, offers = _random_orders(seed, same_parties)
+        expected = PayAsBidMatchingAlgorithm().get_matches_recommendations(
+            _matching_data(bids, offers))
+        recommendations = VectorisedPayAsBidMatchingAlgorithm().get_matches_recommendations(
+            _matching_data(bids, offers))
+        assert recommendations == expected
+
+    @staticmethod
+    def test_orders_with_requirements_are_delegated_to_gsy_framework():
+        bids = [Bid("bid", now(), 10, 10, "buyer",
+                    requirements=[{"trading_partners": ["seller"]}]).serializable_dict()]
+        offers = [Offer("offer", now(), 5, 10, "seller").serializable_dict()]
+        with patch.object(PayAsBidMatchingAlgorithm, "get_matches_recommendations",
+                          return_value=[]) as framework_mock:
+            VectorisedPayAsBidMatchingAlgorithm().get_matches_recommendations(
+                _matching_data(bids, offers))
+        framework_mock.assert_called_once_with(_matching_data(bids, offers))
+
+
+class TestVectorisedPayAsClearMatchingAlgorithm:
+
+    @staticmethod
+    @pytest.mark.parametrize("offer, bid, mcp_rate, mcp_energy", [
+        ([1, 2, 3, 4, 5, 6, 7], [1, 2, 3, 4, 5, 6, 7], 4, 4),
+        ([1, 2, 3, 4, 5, 6, 7], [7, 6, 5, 4, 3, 2, 1], 4, 4),
+        ([8, 9, 10, 11, 12, 13, 14], [8, 9, 10, 11, 12, 13, 14], 11, 4),
+        ([2, 3, 3, 5, 6, 7, 8], [1, 2, 3, 4, 5, 6, 7], 5, 3),
+        ([10, 10, 10, 10, 10, 10, 10], [1, 2, 3, 4, 10, 10, 10], 10, 3),
+        ([1, 2, 5, 5, 5, 6, 7], [5, 5, 5, 5, 5, 5, 5], 5, 5),
+        ([1.1, 2.2, 3.3], [3.3, 2.2, 1.1], 2.2, 2),
+    ])
+    def test_clearing_point(offer, bid, mcp_rate, mcp_energy):
+        bids = [Bid(f"bid{i}", now(), rate, 1, "B").serializable_dict()
+                for i, rate in enumerate(bid)]
+        offers = [Offer(f"offer{i}", now(), rate, 1, "S").serializable_dict()
+                  for i, rate in enumerate(offer)]
+        clearing = VectorisedPayAsClearMatchingAlgorithm.get_vectorised_clearing_point(
+            PackedOrders(bids, descending=True), PackedOrders(offers, descending=False))
+        assert clearing == (mcp_rate, mcp_energy)
+
+    @staticmethod
+    @pytest.mark.parametrize("same_parties", [True, False])
+    @pytest.mark.parametrize("seed", range(50))
+    def test_recommendations_are_the_same_as_gsy_framework(seed, same_parties):
+        ConstSettings.MASettings.PAY_AS_CLEAR_AGGREGATION_ALGORITHM = 1
+        bids, offers = _random_orders(seed, same_parties)
+        framework_algorithm = PayAsClearMatchingAlgorithm()
+        expected = framework_algorithm.get_matches_recommendations(_matching_data(bids, offers))
+        algorithm = VectorisedPayAsClearMatchingAlgorithm()
+        recommendations = algorithm.get_matches_recommendations(_matching_data(bids, offers))
+        assert recommendations == _approx_recommendations(expected)
+        assert algorithm.state.cumulative_bids == framework_algorithm.state.cumulative_bids
+        assert algorithm.state.cumulative_offers == framework_algorithm.state.cumulative_offers
+        assert algorithm.state.clearing == framework_algorithm.state.clearing
+
+    @staticmethod
+    def test_clearing_point_is_stored_in_the_state():
+        ConstSettings.MASettings.PAY_AS_CLEAR_AGGREGATION_ALGORITHM = 1
+        bids = [Bid("bid1", now(), 30, 3, "B").serializable_dict(),
+                Bid("bid2", now(), 8, 1, "B").serializable_dict()]
+        offers = [Offer("offer1", now(), 2, 2, "S").serializable_dict(),
+                  Offer("offer2", now(), 4, 2, "S").serializable_dict()]
+        algorithm = VectorisedPayAsClearMatchingAlgorithm()
+        algorithm.get_matches_recommendations(_matching_data(bids, offers))
+        assert algorithm.state.cumulative_bids["market"][CURRENT_TIME] == {10: 3, 8: 4}
+        assert algorithm.state.cumulative_offers["market"][CURRENT_TIME] == {1: 2, 2: 4}
+        clearing = algorithm.state.clearing["market"][CURRENT_TIME]
+        assert (clearing.rate, clearing.energy) == (8, 4)
+
+    @staticmethod
+    def test_matches_do_not_exceed_the_order_energies():
+        bids = [Bid("bid1", now(), 30, 3, "B").serializable_dict(),
+                Bid("bid2", now(), 8, 1, "B").serializable_dict()]
+        offers = [Offer("offer1", now(), 2, 2, "S").serializable_dict(),
+                  Offer("offer2", now(), 4, 2, "S").serializable_dict()]
+        recommendations = VectorisedPayAsClearMatchingAlgorithm().get_matches_recommendations(
+            _matching_data(bids, offers))
+        assert [(r["bid"]["id"], r["offer"]["id"], r["selected_energy"])
+                for r in recommendations] == [
+            ("bid1", "offer1", 2), ("bid1", "offer2", 1), ("bid2", "offer2", 1)]
+        assert all(r["trade_rate"] == 8 for r in recommendations)
+
+
+@pytest.mark.parametrize("match_type, algorithm_class", [
+    (BidOfferMatchAlgoEnum.PAY_AS_BID.value, VectorisedPayAsBidMatchingAlgorithm),
+    (BidOfferMatchAlgoEnum.PAY_AS_CLEAR.value, VectorisedPayAsClearMatchingAlgorithm),
+])
+@patch("gsy_e.constants.VECTORISED_MATCHING_ALGORITHMS", True)
+def test_internal_matcher_selects_vectorised_algorithms(match_type, algorithm_class):
+    ConstSettings.MASettings.BID_OFFER_MATCH_TYPE = match_type
+    assert isinstance(MycoInternalMatcher.get_matching_algorithm(), algorithm_class)
@@ -0,0 +1,58 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from unittest.mock import MagicMock
+
+import pytest
+from gsy_framework.data_classes import Bid, Offer
+from pendulum import now
+
+from gsy_e.models.market.two_sided import TwoSidedMarket
+from gsy_e.models.strategy.market_agents.two_sided_agent import TwoSidedAgent
+from gsy_e.models.strategy.market_agents.two_sided_engine import TwoSidedEngine
+
+
+@pytest.fixture(name="engine")
+def engine_fixture() -> TwoSidedEngine:
+    """Return an engine that forwards orders that are two ticks old."""
+    return TwoSidedEngine("High -> Low", TwoSidedMarket(time_slot=now()),
+                          TwoSidedMarket(time_slot=now()), min_offer_age=2, min_bid_age=3,
+                          owner=MagicMock(autospec=TwoSidedAgent))
+
+
+class TestEngineTickWakeup:
+
+    @staticmethod
+    def test_engine_wakes_up_when_orders_reach_the_minimum_age(engine):
+        engine.markets.source.offers = {"offer": Offer("offer", now(), 1, 1, "seller")}
+        engine.markets.source.bids = {"bid": Bid("bid", now(), 1, 1, "buyer")}
+        assert engine.next_tick_wakeup(10) == 10
+
+        engine.tick(area=MagicMock(current_tick=10))
+        assert engine.next_tick_wakeup(11) == 12
+
+        engine.markets.source.offers.pop("offer")
+        assert engine.next_tick_wakeup(11) == 11
+        engine.tick(area=MagicMock(current_tick=11))
+        assert engine.next_tick_wakeup(12) == 13
+
+    @staticmethod
+    def test_engine_does_not_wake_up_without_orders(engine):
+        engine.tick(area=MagicMock(current_tick=10))
+        assert engine.next_tick_wakeup(11) is None
+        engine.markets.source.bids["bid"] = Bid("bid", now(), 1, 1, "buyer")
+        assert engine.next_tick_wakeup(11) == 11
@@ -90,8 +90,11 @@ class FakeStrategy:
 
 
 class FakeOffer:
-    def __init__(self, id):
+    def __init__(self, id, energy=1, price=1, time_slot=None):
         self.id = id
+        self.energy = energy
+        self.price = price
+        self.time_slot = time_slot
 
 
 class FakeMarket:
@@ -160,6 +163,30 @@ def test_offers_does_not_replace_sold_offer(offers):
     assert old_offer in offers.posted and new_offer not in offers.posted
 
 
+def test_offers_queries_are_indexed_by_market_and_time_slot():
+    offers = Offers(FakeStrategy())
+    time_slot = pendulum.datetime(2022, 1, 1)
+    offers.post(FakeOffer("id1", energy=1, price=10), "market1")
+    offers.post(FakeOffer("id2", energy=2, price=20, time_slot=time_slot), "market1")
+    offers.post(FakeOffer("id3", energy=4, price=40, time_slot=time_slot), "market2")
+    assert [o.id for o in offers.posted_in_market("market1", time_slot)] == ["id2"]
+    assert offers.posted_offer_energy("market1") == 3
+    assert offers.posted_offer_energy("market1", time_slot) == 2
+    assert offers.is_offer_posted("market2", "id3")
+    assert not offers.is_offer_posted("market1", "id3")
+
+    offers.sold_offer(offers.posted_in_market("market1", time_slot)[0], "market1")
+    assert [o.id for o in offers.open_in_market("market1")] == ["id1"]
+    assert offers.sold_offer_energy("market1") == 2
+    assert offers.sold_offer_price("market1", time_slot) == 20
+    assert offers.sold_offer_price("market2") == 0
+
+    offers.replace(offers.posted_in_market("market1")[0], FakeOffer("id4", energy=8), "market1")
+    assert offers.posted_offer_energy("market1") == 10
+    assert offers.posted_offer_energy("market1", time_slot) == 2
+    assert list(offers.open.values()) == ["market2", "market1"]
+
+
 @pytest.fixture(name="offers2")
 def offers2_fixture():
     fixture = Offers(FakeStrategy())
@@ -278,6 +305,29 @@ def test_add_bid_to_bought(base):
     assert base._get_traded_bids_from_market(market.id) == [bid]
 
 
+@patch("gsy_framework.constants_limits.ConstSettings.MASettings.MARKET_TYPE",
+       SpotMarketTypeEnum.TWO_SIDED.value)
+def test_posted_and_traded_bid_totals_are_kept_per_time_slot(base):
+    market = FakeMarket(raises=True)
+    base.area._market = market
+    next_time_slot = market.time_slot.add(minutes=15)
+    bid1 = Bid("bid1", pendulum.now(), 10, 5, base.owner.name, time_slot=market.time_slot)
+    bid2 = Bid("bid2", pendulum.now(), 6, 2, base.owner.name, time_slot=next_time_slot)
+    base.add_bid_to_posted(market.id, bid1)
+    base.add_bid_to_posted(market.id, bid2)
+    assert base.posted_bid_energy(market.id) == 7
+    assert base.posted_bid_energy(market.id, next_time_slot) == 2
+    assert base.get_posted_bids(market, next_time_slot) == [bid2]
+    assert base.is_bid_posted(market, bid1.id)
+
+    base.add_bid_to_bought(bid1, market.id)
+    assert not base.is_bid_posted(market, bid1.id)
+    assert base.posted_bid_energy(market.id) == 2
+    assert base._traded_bid_energy(market.id) == 5
+    assert base._traded_bid_costs(market.id, next_time_slot) == 0
+    assert base._traded_bid_costs(market.id, market.time_slot) == 10
+
+
 def test_bid_events_fail_for_one_sided_market(base):
     ConstSettings.MASettings.MARKET_TYPE = 1
     test_bid = Bid("123", pendulum.now(), 12, 23, "A", "B")
@@ -0,0 +1,218 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+# pylint: disable=protected-access
+from math import ceil
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from pendulum import duration, today
+
+from gsy_e.models.strategy.update_frequency import (
+    TemplateStrategyBidUpdater, TemplateStrategyOfferUpdater)
+
+TIME_SLOT = today()
+
+
+@pytest.mark.parametrize("update_counter", [0, 1, 3, 14])
+@pytest.mark.parametrize("tick_length_seconds", [15, 25, 60])
+def test_next_update_tick_is_the_first_tick_that_is_time_for_price_update(
+        update_counter, tick_length_seconds):
+    updater = TemplateStrategyOfferUpdater(
+        initial_rate=30, final_rate=10, update_interval=duration(minutes=1))
+    updater.update_counter = {TIME_SLOT: update_counter}
+    strategy = MagicMock()
+    strategy.area.config.tick_length = duration(seconds=tick_length_seconds)
+    ticks_per_slot = int(updater._time_slot_duration_in_seconds / tick_length_seconds)
+
+    def is_time_for_price_update(tick):
+        strategy.area.current_tick = tick
+        return updater.time_for_price_update(strategy, TIME_SLOT)
+
+    with patch.object(TemplateStrategyOfferUpdater, "_get_all_time_slots",
+                      return_value=[TIME_SLOT]):
+        for current_tick in range(ticks_per_slot, 2 * ticks_per_slot):
+            expected_update_tick = next(
+                (tick for tick in range(current_tick, 2 * ticks_per_slot)
+                 if is_time_for_price_update(tick)), 2 * ticks_per_slot)
+            strategy.area.current_tick = current_tick
+            assert max(updater.get_next_update_tick(strategy),
+                       current_tick) == expected_update_tick
+
+
+def _set_rates(updater, initial_rate, final_rate, energy_rate_change_per_update):
+    updater.initial_rate[TIME_SLOT] = initial_rate
+    updater.final_rate[TIME_SLOT] = final_rate
+    updater.energy_rate_change_per_update[TIME_SLOT] = energy_rate_change_per_update
+    updater.update_counter[TIME_SLOT] = 0
+
+
+def _create_updater(updater_class, initial_rate, final_rate, update_interval_minutes=1):
+    rate_limit_object = max if updater_class is TemplateStrategyOfferUpdater else min
+    updater = updater_class(initial_rate=initial_rate, final_rate=final_rate,
+                            update_interval=duration(minutes=update_interval_minutes),
+                            rate_limit_object=rate_limit_object)
+    _set_rates(updater, initial_rate, final_rate, (initial_rate - final_rate) /
+               updater._calculate_number_of_available_updates_per_slot)
+    return updater
+
+
+def _create_strategy(order_rates):
+    """Return a strategy on a 15 seconds tick that stores the posted rates in order_rates."""
+    strategy = MagicMock()
+    strategy.area.config.tick_length = duration(seconds=15)
+    strategy.area.spot_market.time_slot = TIME_SLOT
+    strategy.update_offer_rates.side_effect = (
+        lambda market, rate: order_rates.__setitem__("offer", rate))
+    strategy.update_bid_rates.side_effect = (
+        lambda market, rate: order_rates.__setitem__("bid", rate))
+    return strategy
+
+
+def _dispatch_tick(updaters, strategy, tick):
+    """Update the orders on the tick in the same order as the strategies do."""
+    strategy.area.current_tick = tick
+    market = MagicMock(time_slot=TIME_SLOT)
+    for updater in updaters:
+        updater.catch_up_with_skipped_updates(strategy)
+        updater.update(market, strategy)
+        updater.increment_update_counter_all_markets(strategy)
+
+
+def _get_dispatched_ticks(ticks_per_slot, fast_forward_ticks_per_slot):
+    # the ticks that Simulation._get_ticks_to_dispatch returns in fast-forward mode
+    return sorted({
+        round(index * (ticks_per_slot - 1) / (fast_forward_ticks_per_slot - 1))
+        for index in range(fast_forward_ticks_per_slot)})
+
+
+def _get_order_rates(updater, ticks):
+    """Dispatch the ticks to the updater, return the rate of the order after each tick."""
+    order_rates = {}
+    strategy = _create_strategy(order_rates)
+    rates_per_tick = {}
+    for tick in ticks:
+        _dispatch_tick([updater], strategy, tick)
+        # the rate that was posted last
+        rates_per_tick[tick], = order_rates.values()
+    return rates_per_tick
+
+
+@pytest.mark.parametrize("fast_forward_ticks_per_slot, expected_update_counter", [
+    (None, 0), (4, 7)])
+def test_skipped_updates_are_only_caught_up_in_fast_forward_mode(
+        fast_forward_ticks_per_slot, expected_update_counter):
+    updater = _create_updater(TemplateStrategyOfferUpdater, 30, 16)
+    strategy = _create_strategy({})
+    # 7.5 minutes into the slot
+    strategy.area.current_tick = 30
+    with patch("gsy_e.constants.FAST_FORWARD_TICKS_PER_SLOT", fast_forward_ticks_per_slot):
+        assert updater.time_for_price_update(strategy, TIME_SLOT) is True
+        assert updater.update_counter[TIME_SLOT] == 0
+        updater.catch_up_with_skipped_updates(strategy)
+    assert updater.update_counter[TIME_SLOT] == expected_update_counter
+    assert updater.get_updated_rate(TIME_SLOT) == pytest.approx(30 - expected_update_counter)
+
+
+@pytest.mark.parametrize("updater_class, initial_rate, final_rate", [
+    (TemplateStrategyOfferUpdater, 30, 10), (TemplateStrategyBidUpdater, 10, 30)])
+@pytest.mark.parametrize("fast_forward_ticks_per_slot", [2, 4, 7])
+def test_order_rates_on_dispatched_ticks_are_the_same_in_fast_forward_mode(
+        updater_class, initial_rate, final_rate, fast_forward_ticks_per_slot):
+    ticks_per_slot = 60
+    expected_order_rates = _get_order_rates(
+        _create_updater(updater_class, initial_rate, final_rate), range(ticks_per_slot))
+    dispatched_ticks = _get_dispatched_ticks(ticks_per_slot, fast_forward_ticks_per_slot)
+    with patch("gsy_e.constants.FAST_FORWARD_TICKS_PER_SLOT", fast_forward_ticks_per_slot):
+        order_rates = _get_order_rates(
+            _create_updater(updater_class, initial_rate, final_rate), dispatched_ticks)
+    assert order_rates == {tick: expected_order_rates[tick] for tick in dispatched_ticks}
+    assert order_rates[dispatched_ticks[-1]] == pytest.approx(final_rate)
+
+
+def _get_trades(offer_updater, bid_updater, ticks):
+    """Match an offer of 1 kWh and a bid of 0.6 kWh (pay as bid) after each of the ticks."""
+    order_rates = {}
+    strategy = _create_strategy(order_rates)
+    energy = {"offer": 1, "bid": 0.6}
+    trades = []
+    for tick in ticks:
+        _dispatch_tick([offer_updater, bid_updater], strategy, tick)
+        traded_energy = min(energy.values())
+        if traded_energy > 0 and order_rates["bid"] >= order_rates["offer"]:
+            trades.append((traded_energy, order_rates["bid"]))
+            energy = {order: value - traded_energy for order, value in energy.items()}
+    return trades
+
+
+@pytest.mark.parametrize("fast_forward_ticks_per_slot", [2, 3, 4, 7, 20])
+def test_trades_in_fast_forward_mode_are_within_the_documented_bound(
+        fast_forward_ticks_per_slot):
+    """The bound is documented in Simulation._get_ticks_to_dispatch."""
+    ticks_per_slot = 60
+
+    def get_trades():
+        return _get_trades(
+            _create_updater(TemplateStrategyOfferUpdater, 30, 0),
+            _create_updater(TemplateStrategyBidUpdater, 0, 30, update_interval_minutes=2),
+            dispatched_ticks)
+
+    dispatched_ticks = range(ticks_per_slot)
+    expected_trades = get_trades()
+    dispatched_ticks = _get_dispatched_ticks(ticks_per_slot, fast_forward_ticks_per_slot)
+    with patch("gsy_e.constants.FAST_FORWARD_TICKS_PER_SLOT", fast_forward_ticks_per_slot):
+        trades = get_trades()
+    largest_gap_seconds = 15 * max(np.diff(dispatched_ticks))
+    # the bid rate changes by 5 cents every 2 minutes
+    rate_bound = 5 * ceil(largest_gap_seconds / 120)
+    assert [energy for energy, _ in trades] == [energy for energy, _ in expected_trades]
+    for (_, rate), (_, expected_rate) in zip(trades, expected_trades):
+        assert abs(rate - expected_rate) <= rate_bound + 1e-9
+
+
+@pytest.mark.parametrize("updater_class, initial_rate, final_rate, energy_rate_change", [
+    (TemplateStrategyOfferUpdater, 30, 10, 1.5), (TemplateStrategyBidUpdater, 10, 30, -1.5),
+    (TemplateStrategyOfferUpdater, 30, 10, 0.7), (TemplateStrategyBidUpdater, 0, 35.5, -2.3)])
+def test_precomputed_rate_trajectories_match_the_computed_rates(
+        updater_class, initial_rate, final_rate, energy_rate_change):
+    updater = updater_class(
+        initial_rate=initial_rate, final_rate=final_rate, update_interval=duration(minutes=1))
+    _set_rates(updater, initial_rate, final_rate, energy_rate_change)
+    updater._set_rate_trajectory(TIME_SLOT)
+    trajectory = updater._rate_trajectories[TIME_SLOT]
+    # the counter can exceed the trajectory, the rates are computed for these steps
+    for update_counter in range(len(trajectory) + 2):
+        updater.update_counter[TIME_SLOT] = update_counter
+        precomputed_rate = updater.get_updated_rate(TIME_SLOT)
+        updater._rate_trajectories.clear()
+        assert precomputed_rate == updater.get_updated_rate(TIME_SLOT)
+        updater._set_rate_trajectory(TIME_SLOT)
+
+
+def test_updaters_with_the_same_parameters_share_one_read_only_trajectory():
+    updaters = [TemplateStrategyOfferUpdater(
+        initial_rate=30, final_rate=10, update_interval=duration(minutes=1)) for _ in range(3)]
+    for updater, final_rate in zip(updaters, [10, 10, 12]):
+        _set_rates(updater, 30, final_rate, 1.5)
+        updater._set_rate_trajectory(TIME_SLOT)
+    trajectory = updaters[0]._rate_trajectories[TIME_SLOT]
+    assert updaters[1]._rate_trajectories[TIME_SLOT] is trajectory
+    assert updaters[2]._rate_trajectories[TIME_SLOT] is not trajectory
+    assert not trajectory.flags.writeable
+    with pytest.raises(ValueError):
+        trajectory[0] = 0
@@ -1,5 +1,5 @@
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 import json
 from gsy_framework.constants_limits import ConstSettings
 from gsy_e.gsy_e_core.exceptions import D3ARedisException
@@ -64,3 +64,18 @@ class TestAreaToMarketPublisher(unittest.TestCase):
     def test_publish_market_clearing_waits_until_response_received(self):
         self.publisher.publish_markets_clearing()
         assert self.publisher.redis.poll_until_response_received.call_count == 2
+
+    @patch("gsy_e.constants.CONCURRENT_REDIS_EVENT_DISPATCHING", True)
+    def test_publish_market_clearing_concurrently_waits_for_all_responses_at_once(self):
+        self.publisher.publish_markets_clearing()
+        assert self.publisher.redis.publish.call_count == 2
+        assert self.publisher.redis.poll_until_response_received.call_count == 1
+        response_received_callback = \
+            self.publisher.redis.poll_until_response_received.call_args[0][0]
+        transaction_uuids = [json.loads(call[0][1])["transaction_uuid"]
+                             for call in self.publisher.redis.publish.call_args_list]
+        assert not response_received_callback()
+        self.publisher.event_response_uuids.append(transaction_uuids[0])
+        assert not response_received_callback()
+        self.publisher.event_response_uuids.append(transaction_uuids[1])
+        assert response_received_callback()
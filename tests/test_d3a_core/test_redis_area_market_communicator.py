@@ -1,3 +1,5 @@
+import json
+from threading import current_thread
 from unittest.mock import patch, Mock
 
 import pytest
@@ -5,7 +7,8 @@ from redis import StrictRedis
 
 from gsy_e.gsy_e_core.redis_connections.aggregator_connection import AggregatorHandler
 from gsy_e.gsy_e_core.redis_connections.redis_area_market_communicator import (
-    ExternalConnectionCommunicator)
+    ExternalConnectionCommunicator, RedisCommunicator, ResettableCommunicator,
+    shared_redis_connections)
 
 
 @pytest.fixture(scope="function", autouse=True)
@@ -101,3 +104,74 @@ class TestExternalConnectionCommunicator:
         enabled_communicator.publish_aggregator_commands_responses_events()
         enabled_communicator.aggregator.publish_all_commands_responses.assert_called_once()
         enabled_communicator.aggregator.publish_all_events.assert_called_once()
+
+    @patch("gsy_e.constants.BATCHED_REDIS_PUBLISHING", True)
+    def test_buffered_publishing(self, enabled_communicator, disabled_communicator):
+        with disabled_communicator.buffered_publishing():
+            assert not hasattr(disabled_communicator, "redis_db")
+
+        redis_db = enabled_communicator.redis_db
+        with enabled_communicator.buffered_publishing():
+            with enabled_communicator.buffered_publishing():
+                enabled_communicator.publish_json("channel1", {"a": 1})
+            enabled_communicator.publish_json("channel2", {"b": [2]})
+            redis_db.pipeline.assert_not_called()
+        redis_db.publish.assert_not_called()
+        redis_db.pipeline.assert_called_once_with(transaction=False)
+        pipeline = redis_db.pipeline.return_value
+        assert [(call.args[0], json.loads(call.args[1]))
+                for call in pipeline.publish.call_args_list] == [
+            ("channel1", {"a": 1}), ("channel2", {"b": [2]})]
+        pipeline.execute.assert_called_once()
+
+        # messages outside of the context are published immediately
+        enabled_communicator.publish_json("channel3", {})
+        redis_db.publish.assert_called_once_with("channel3", "{}")
+
+
+@pytest.fixture(name="shared_connections")
+def shared_connections_fixture():
+    with patch("gsy_e.constants.SHARED_REDIS_CONNECTIONS", True):
+        yield shared_redis_connections
+    shared_redis_connections.reset()
+
+
+class TestSharedRedisConnections:
+
+    @staticmethod
+    def test_communicators_share_the_client_and_the_pubsub(shared_connections):
+        communicator1 = ResettableCommunicator()
+        communicator2 = ResettableCommunicator()
+        assert communicator1.redis_db is communicator2.redis_db
+        callback1, callback2 = Mock(), Mock()
+        communicator1.sub_to_multiple_channels({"channel": callback1})
+        communicator2.sub_to_multiple_channels({"channel": callback2, "other": callback2})
+
+        pubsub = communicator1.redis_db.pubsub.return_value
+        assert pubsub.subscribe.call_count == 2
+        assert set(pubsub.subscribe.call_args_list[1].kwargs) == {"other"}
+        pubsub.run_in_thread.assert_called_once()
+        assert communicator1.thread is communicator2.thread
+
+        handler = pubsub.subscribe.call_args_list[0].kwargs["channel"]
+        handler({"channel": b"channel", "data": "{}"})
+        callback1.assert_called_once_with({"channel": b"channel", "data": "{}"})
+        callback2.assert_called_once_with({"channel": b"channel", "data": "{}"})
+
+        communicator2.terminate_connection()
+        pubsub.unsubscribe.assert_called_once_with("other")
+        handler({"channel": b"channel", "data": "{}"})
+        assert callback1.call_count == 2
+        assert callback2.call_count == 1
+
+    @staticmethod
+    def test_event_listeners_are_called_in_a_worker_thread(shared_connections):
+        communicator = RedisCommunicator()
+        listener_threads = []
+        communicator.sub_to_channel(
+            "channel", lambda message: listener_threads.append(current_thread()))
+        handler = communicator.redis_db.pubsub.return_value.subscribe.call_args.kwargs["channel"]
+        handler({"channel": b"channel", "data": "{}"})
+        communicator._listener_executor.shutdown(wait=True)
+        assert len(listener_threads) == 1
+        assert listener_threads[0] is not current_thread()
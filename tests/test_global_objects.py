@@ -16,7 +16,7 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 from pendulum import duration, today
 
@@ -124,3 +124,27 @@ class TestGlobalObjects(unittest.TestCase):
                                   }}}}}}
 
         assert expected_area_stats_tree_dict == go.area_stats_tree_dict
+
+    @patch("gsy_e.constants.INCREMENTAL_EXTERNAL_GLOBAL_STATS", True)
+    def test_update_of_an_area_only_recreates_the_dict_of_the_area(self):
+        go = ExternalConnectionGlobalStatistics()
+        go(self.grid_area, self.config.ticks_per_slot)
+        self.grid_area.current_tick += 15
+        self.house_area.current_tick += 15
+        self.grid_area.cycle_markets(_trigger_event=True)
+        go.update()
+        house_dict = go.area_stats_tree_dict[self.grid_area.uuid]["children"][
+            self.house_area.uuid]
+        pv_dict = house_dict["children"][self.pv.uuid]
+        load_dict = house_dict["children"][self.load.uuid]
+        version = go.area_stats_tree_version
+
+        go.update(area=self.load)
+
+        assert go.area_stats_tree_version == version + 1
+        assert house_dict["children"][self.pv.uuid] is pv_dict
+        assert house_dict["children"][self.load.uuid] is not load_dict
+        expected_go = ExternalConnectionGlobalStatistics()
+        expected_go(self.grid_area, self.config.ticks_per_slot)
+        expected_go.update()
+        assert go.area_stats_tree_dict == expected_go.area_stats_tree_dict
@@ -1,10 +1,12 @@
 import pathlib
 import unittest
+from unittest.mock import patch
 
 from gsy_framework.constants_limits import GlobalConfig, PROFILE_EXPANSION_DAYS
 from gsy_framework.read_user_profile import copy_profile_to_multiple_days, \
-    _read_from_different_sources_todict, time_str
+    _read_from_different_sources_todict, time_str, read_arbitrary_profile, InputProfileTypes
 
+from gsy_e.gsy_e_core.user_profile_handler import SharedProfilesCache
 from gsy_e.gsy_e_core.util import d3a_path
 
 
@@ -24,3 +26,22 @@ class TestReadUserProfile(unittest.TestCase):
                 GlobalConfig.FUTURE_MARKET_DURATION_HOURS * 4) == len(out_profile)
         for time, out_value in out_profile.items():
             assert out_value == in_profile[daytime_dict[time_str(time.hour, time.minute)]]
+
+    @patch("gsy_e.gsy_e_core.user_profile_handler.read_arbitrary_profile",
+           wraps=read_arbitrary_profile)
+    def test_shared_profiles_cache_parses_each_file_once(self, read_profile_mock):
+        profile_path = pathlib.Path(d3a_path + "/resources/Solar_Curve_W_cloudy.csv")
+        expected_profile = read_arbitrary_profile(InputProfileTypes.POWER, profile_path)
+        cache = SharedProfilesCache()
+        profile = cache.get_profile(InputProfileTypes.POWER, profile_path)
+        scaled_profile = cache.get_profile(InputProfileTypes.POWER, str(profile_path), scaling=2)
+
+        read_profile_mock.assert_called_once()
+        assert cache.is_cacheable(profile_path)
+        assert not cache.is_cacheable(expected_profile)
+        assert list(profile.keys()) == list(expected_profile.keys())
+        for time_slot, value in expected_profile.items():
+            assert profile[time_slot] == value
+            assert scaled_profile[time_slot] == 2 * value
+        with self.assertRaises(TypeError):
+            profile[time_slot] = 0
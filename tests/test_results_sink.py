@@ -0,0 +1,78 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import csv
+
+import pytest
+
+from gsy_e.gsy_e_core.sim_results import results_sink
+from gsy_e.gsy_e_core.sim_results.results_sink import (
+    CSVResultsSink, ParquetResultsSink, create_results_sink)
+
+LABELS = ("slot", "energy", "rate")
+
+
+def _write_slots(sink, file_path):
+    sink.write_rows(file_path, LABELS, [("2021-01-01T00:00", 1.5, None)], True)
+    sink.write_rows(file_path, LABELS, [], False)
+    sink.write_rows(file_path, LABELS, [("2021-01-01T00:15", 2, 30.1),
+                                        ("2021-01-01T00:15", 3)], False)
+
+
+def _read_csv_file(file_path):
+    with open(file_path, encoding="utf-8") as csv_file:
+        return list(csv.reader(csv_file))
+
+
+EXPECTED_ROWS = [list(LABELS), ["2021-01-01T00:00", "1.5", ""],
+                 ["2021-01-01T00:15", "2", "30.1"], ["2021-01-01T00:15", "3"]]
+
+
+class TestResultsSink:
+
+    @staticmethod
+    def test_csv_sink_appends_rows_to_the_csv_files(tmp_path, monkeypatch):
+        monkeypatch.setattr(results_sink, "MAX_OPEN_FILES", 1)
+        sink = CSVResultsSink()
+        _write_slots(sink, str(tmp_path / "a.csv"))
+        _write_slots(sink, str(tmp_path / "b.csv"))
+        sink.close()
+        sink.close()
+
+        assert _read_csv_file(tmp_path / "a.csv") == EXPECTED_ROWS
+        assert _read_csv_file(tmp_path / "b.csv") == EXPECTED_ROWS
+
+    @staticmethod
+    def test_parquet_sink_exports_the_csv_files_on_close(tmp_path):
+        pytest.importorskip("pyarrow")
+        sink = ParquetResultsSink(row_group_size=2)
+        _write_slots(sink, str(tmp_path / "a.csv"))
+        sink.close()
+
+        assert (tmp_path / "a.parquet" / "part-00000.parquet").exists()
+        # rows that are shorter than the labels are padded in the parquet files
+        assert _read_csv_file(tmp_path / "a.csv") == EXPECTED_ROWS[:3] + [
+            ["2021-01-01T00:15", "3", ""]]
+
+    @staticmethod
+    def test_create_results_sink():
+        assert create_results_sink(None) is None
+        sink = create_results_sink("csv")
+        assert isinstance(sink, CSVResultsSink)
+        sink.close()
+        with pytest.raises(ValueError):
+            create_results_sink("xlsx")
@@ -16,7 +16,7 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 from gsy_framework.constants_limits import TIME_ZONE, GlobalConfig
 from gsy_framework.kafka_communication.kafka_producer import (DisabledKafkaConnection,
@@ -29,6 +29,20 @@ from gsy_e.gsy_e_core.simulation import Simulation
 from gsy_e.models.config import SimulationConfig
 
 
+def _create_simulation() -> Simulation:
+    simulation_config = SimulationConfig(duration(hours=int(12)),
+                                         duration(minutes=int(60)),
+                                         duration(seconds=int(60)),
+                                         cloud_coverage=0,
+                                         market_maker_rate=30,
+                                         start_date=today(tz=TIME_ZONE),
+                                         external_connection_enabled=False)
+    return Simulation(
+        "default_2a", simulation_config, None, 0, False, duration(), False, True, None, None,
+        "1234", False
+    )
+
+
 class SimulationTest(unittest.TestCase):
 
     def tearDown(self) -> None:
@@ -87,3 +101,27 @@ class SimulationTest(unittest.TestCase):
 
         simulation.endpoint_buffer.prepare_results_for_publish.assert_called_once()
         simulation.kafka_connection.publish.assert_called_once()
+
+    @staticmethod
+    def test_all_ticks_are_dispatched_if_fast_forward_is_disabled():
+        simulation = _create_simulation()
+        assert simulation._get_ticks_to_dispatch(0) == list(range(60))
+        assert simulation._get_ticks_to_dispatch(58) == [58, 59]
+
+    @staticmethod
+    @patch("gsy_e.constants.FAST_FORWARD_TICKS_PER_SLOT", 4)
+    def test_fast_forward_dispatches_evenly_spread_ticks():
+        simulation = _create_simulation()
+        assert simulation._get_ticks_to_dispatch(0) == [0, 20, 39, 59]
+        assert simulation._get_ticks_to_dispatch(21) == [39, 59]
+
+    @staticmethod
+    @patch("gsy_e.constants.FAST_FORWARD_TICKS_PER_SLOT", 4)
+    def test_fast_forward_is_disabled_for_interactive_slots():
+        simulation = _create_simulation()
+        simulation.live_events.event_buffer.append(MagicMock())
+        assert simulation._get_ticks_to_dispatch(0) == list(range(60))
+
+        simulation = _create_simulation()
+        simulation.simulation_config.external_connection_enabled = True
+        assert simulation._get_ticks_to_dispatch(0) == list(range(60))
@@ -0,0 +1,82 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+# pylint: disable=protected-access
+import pytest
+from gsy_framework.constants_limits import GlobalConfig
+from pendulum import duration
+
+from gsy_e.gsy_e_core.time_slot_series import (
+    INITIAL_CAPACITY, TimeSlotSeries, delete_time_slots_before, sum_time_slots_from)
+
+SLOT_LENGTH = duration(minutes=15)
+
+
+@pytest.fixture(name="time_slots")
+def time_slots_fixture():
+    original_slot_length = GlobalConfig.slot_length
+    GlobalConfig.slot_length = SLOT_LENGTH
+    yield [GlobalConfig.start_date + SLOT_LENGTH * i for i in range(3 * INITIAL_CAPACITY)]
+    GlobalConfig.slot_length = original_slot_length
+
+
+class TestTimeSlotSeries:
+
+    @staticmethod
+    def test_series_behaves_like_a_dict(time_slots):
+        series = TimeSlotSeries()
+        expected = {}
+        # set the time slots out of order, to grow the buffer in both directions
+        for time_slot in time_slots[10:] + time_slots[:10][::-1]:
+            series[time_slot] = expected[time_slot] = time_slots.index(time_slot) / 2
+        off_grid_time_slot = time_slots[0].add(minutes=1)
+        series[off_grid_time_slot] = expected[off_grid_time_slot] = 1.0
+        series[time_slots[1]] = expected[time_slots[1]] = "-"
+        series[time_slots[2]] += 1
+        expected[time_slots[2]] += 1
+        del series[time_slots[3]]
+        del expected[time_slots[3]]
+
+        assert len(series) == len(expected)
+        assert dict(series.items()) == expected
+        assert series == expected
+        assert time_slots[3] not in series
+        assert series.get(time_slots[3]) is None
+        assert series[time_slots[1]] == "-"
+        assert len(series._values) == 4 * INITIAL_CAPACITY
+
+    @staticmethod
+    def test_delete_before_expires_past_time_slots(time_slots):
+        series = TimeSlotSeries(dtype=int)
+        for time_slot in time_slots:
+            series[time_slot] = 1
+        series[time_slots[0].add(minutes=1)] = 1
+        delete_time_slots_before(series, time_slots[5])
+
+        assert list(series.keys()) == time_slots[5:]
+        assert sum_time_slots_from(series, time_slots[10]) == len(time_slots) - 10
+        assert isinstance(series[time_slots[5]], int)
+        # the buffer is reused for the following time slots
+        series[time_slots[-1] + SLOT_LENGTH] = 1
+        assert len(series._values) == 4 * INITIAL_CAPACITY
+
+    @staticmethod
+    def test_helpers_accept_dicts(time_slots):
+        series = {time_slot: 1.0 for time_slot in time_slots[:4]}
+        delete_time_slots_before(series, time_slots[1])
+        assert list(series.keys()) == time_slots[1:4]
+        assert sum_time_slots_from(series, time_slots[2]) == 2.0
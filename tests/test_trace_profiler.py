@@ -0,0 +1,87 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import gzip
+import json
+import os
+from tempfile import TemporaryDirectory
+from unittest.mock import MagicMock
+
+import pytest
+
+from gsy_e.events import EventMixin
+from gsy_e.events.event_structures import AreaEvent
+from gsy_e.gsy_e_core.trace_profiler import TraceProfiler, trace_profiler
+
+
+class FakeListener(EventMixin):
+    """Event listener that is owned by an area, like the strategies."""
+
+    def __init__(self):
+        self.owner = MagicMock()
+        self.owner.name = "House 1"
+        self.log = MagicMock()
+
+
+class TestTraceProfiler:
+
+    @staticmethod
+    @pytest.fixture(name="profiler")
+    def fixture_profiler():
+        trace_profiler.start()
+        yield trace_profiler
+        trace_profiler.stop()
+
+    @staticmethod
+    def test_phases_are_only_recorded_while_enabled():
+        profiler = TraceProfiler()
+        with profiler.phase("tick_and_dispatch"):
+            pass
+        profiler.start()
+        for _ in range(2):
+            with profiler.phase("tick_and_dispatch"):
+                pass
+        profiler.stop()
+        assert profiler.get_phase_summary()["tick_and_dispatch"]["count"] == 2
+
+    @staticmethod
+    def test_event_handlers_are_aggregated_per_area_and_listener(profiler):
+        listener = FakeListener()
+        for _ in range(3):
+            listener.event_listener(AreaEvent.TICK)
+        listener.event_listener(AreaEvent.MARKET_CYCLE)
+
+        summary = {(stats["area"], stats["listener"], stats["event"]): stats["count"]
+                   for stats in profiler.get_event_handler_summary()}
+        assert summary == {("House 1", "FakeListener", "TICK"): 3,
+                           ("House 1", "FakeListener", "MARKET_CYCLE"): 1}
+        assert profiler.number_of_dispatched_events == 4
+
+    @staticmethod
+    @pytest.mark.parametrize("file_name, opener", [("trace.json", open),
+                                                   ("trace.json.gz", gzip.open)])
+    def test_save_writes_chrome_trace(profiler, file_name, opener):
+        with profiler.phase("export.data_to_csv"):
+            FakeListener().event_listener(AreaEvent.TICK)
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, file_name)
+            profiler.save(path)
+            with opener(path, "rt") as trace_file:
+                trace = json.load(trace_file)
+        assert [event["name"] for event in trace["traceEvents"]] == ["export.data_to_csv"]
+        assert trace["traceEvents"][0]["ph"] == "X"
+        assert trace["otherData"]["number_of_dispatched_events"] == 1